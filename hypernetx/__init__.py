@@ -3,7 +3,7 @@ from hypernetx.exception import (
     HyperNetXError,
     HyperNetXNotImplementedError,
 )
-from hypernetx.read_write import to_pickle, load_from_pickle
+from hypernetx.read_write import to_pickle, load_from_pickle, save, load
 from hypernetx.classes import *
 from hypernetx.reports import *
 from hypernetx.drawing import *
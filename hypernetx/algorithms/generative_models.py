@@ -40,14 +40,11 @@ def erdos_renyi_hypergraph(n, m, p, node_labels=None, edge_labels=None):
 
     """
 
-    if node_labels is not None and edge_labels is not None:
-        get_node_label = lambda index: node_labels[index]
-        get_edge_label = lambda index: edge_labels[index]
-    else:
-        get_node_label = lambda index: index
-        get_edge_label = lambda index: index
+    if node_labels is None or edge_labels is None:
+        node_labels = edge_labels = None
 
-    bipartite_edges = []
+    edge_idx = []
+    node_idx = []
     for u in range(n):
         v = 0
         while v < m:
@@ -56,11 +53,16 @@ def erdos_renyi_hypergraph(n, m, p, node_labels=None, edge_labels=None):
             v = v + math.floor(math.log(r) / math.log(1 - p))
             if v < m:
                 # add vertex hyperedge pair
-                bipartite_edges.append((get_edge_label(v), get_node_label(u)))
+                edge_idx.append(v)
+                node_idx.append(u)
                 v = v + 1
 
-    df = pd.DataFrame(bipartite_edges)
-    return Hypergraph(df, static=True)
+    return Hypergraph.from_coo(
+        np.array(edge_idx, dtype=np.int64),
+        np.array(node_idx, dtype=np.int64),
+        edge_labels=edge_labels,
+        node_labels=node_labels,
+    )
 
 
 def chung_lu_hypergraph(k1, k2):
@@ -39,6 +39,8 @@ from collections import defaultdict
 import itertools as it
 from scipy.sparse import csr_matrix
 
+from hypernetx.classes.disk_cache import _disk_cached
+
 
 def kchainbasis(h, k):
     """
@@ -710,6 +712,7 @@ def betti(bd, k=None):
     return betti
 
 
+@_disk_cached
 def betti_numbers(h, k=None):
     """
     Return the kth betti numbers for the simplicial homology of the ASC
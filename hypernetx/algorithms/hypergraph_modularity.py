@@ -326,9 +326,8 @@ def kumar(HG, delta=0.01, verbose=False):
 
     """
     # weights will be modified -- store initial weights
-    W = {
-        e: HG.edges[e].weight for e in HG.edges
-    }  # uses edge id for reference instead of int
+    edges = list(HG.edges)
+    W = HG.edges.property_array("weight", order=edges)
     # build graph
     G = two_section(HG)
     # apply clustering
@@ -367,8 +366,7 @@ def kumar(HG, delta=0.01, verbose=False):
         if ctr > 50:  # this process sometimes gets stuck -- set limit
             break
     G.vs["part"] = CG.membership
-    for e in HG.edges:
-        HG.edges[e].weight = W[e]
+    HG.edges.set_property_array("weight", W, order=edges)
     return dict2part({v["name"]: v["part"] for v in G.vs})
 
 
@@ -388,8 +386,8 @@ def _last_step_weighted(H, A, wdc, delta=0.01, verbose=False):
     m = np.max([H.size(i) for i in H.edges])
     ctr_sizes = np.repeat(0, 1 + m)
     S = 0
-    for e in H.edges:
-        w = H.edges[e].weight
+    edges = list(H.edges)
+    for e, w in zip(edges, H.edges.property_array("weight", order=edges)):
         ctr_sizes[H.size(e)] += w
         S += w
         for v in H.edges[e]:
@@ -22,6 +22,8 @@ import warnings
 import sys
 from functools import partial
 
+from hypernetx.classes.disk_cache import _disk_cached
+
 try:
     import nwhy
 
@@ -87,6 +89,7 @@ def _s_centrality(func, H, s=1, edges=True, f=None, return_singletons=True, **kw
     return stats
 
 
+@_disk_cached
 def s_betweenness_centrality(
     H, s=1, edges=True, normalized=True, return_singletons=True
 ):
@@ -144,6 +147,7 @@ def s_betweenness_centrality(
         return result
 
 
+@_disk_cached
 def s_closeness_centrality(H, s=1, edges=True, return_singletons=True, source=None):
     r"""
     In a connected component the reciprocal of the sum of the distance between an
@@ -196,6 +200,7 @@ def s_harmonic_closeness_centrality(H, s=1, edge=None):
     return s_harmonic_centrality(H, s=s, edges=True, normalized=True, source=edge)
 
 
+@_disk_cached
 def s_harmonic_centrality(
     H,
     s=1,
@@ -272,6 +277,7 @@ def s_harmonic_centrality(
     #     return result
 
 
+@_disk_cached
 def s_eccentricity(H, s=1, edges=True, source=None, return_singletons=True):
     r"""
     The length of the longest shortest path from a vertex $u$ to every other vertex in
@@ -2,5 +2,14 @@ from .hypergraph import Hypergraph
 from .hyp_view import HypergraphView
 from .incidence_store import IncidenceStore
 from .property_store import PropertyStore
+from .state_cache import StateCache
+from .disk_cache import DiskCache
 
-__all__ = ["Hypergraph", "HypergraphView", "IncidenceStore", "PropertyStore"]
+__all__ = [
+    "Hypergraph",
+    "HypergraphView",
+    "IncidenceStore",
+    "PropertyStore",
+    "StateCache",
+    "DiskCache",
+]
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["DiskCache"]
+
+# bumped when the layout of the cached files changes
+FORMAT_VERSION = 1
+SUFFIX = ".pkl"
+_MISSING = object()
+
+
+class DiskCache:
+    """
+    Results computed from hypergraphs kept as files in a directory, so that
+    later processes computing the same results for the same hypergraphs
+    can load them instead. A result is stored under the
+    :meth:`Hypergraph.fingerprint` of its hypergraph and a key naming the
+    computation and its arguments, so any number of hypergraphs may share
+    a directory. If a size limit is set, the least recently used files are
+    removed until the others fit in it.
+
+    Parameters
+    ----------
+    directory : str | pathlib.Path
+        created if it does not exist
+    max_bytes : int, optional, default=None
+        bytes the files may hold, None for no limit
+    """
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"DiskCache({str(self.directory)!r}, max_bytes={self._max_bytes})"
+
+    @property
+    def max_bytes(self):
+        """
+        Bytes the files may hold, None for no limit. Lowering it removes
+        the least recently used files.
+
+        Returns
+        -------
+        int | None
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    @property
+    def nbytes(self):
+        """
+        Bytes held by the files
+
+        Returns
+        -------
+        int
+        """
+        return sum(size for _, size, _ in self._files())
+
+    def __len__(self):
+        return len(self._files())
+
+    def get(self, fingerprint, key, default=None):
+        """
+        Stored result, marked as recently used, or default
+
+        Parameters
+        ----------
+        fingerprint : str
+            see :meth:`Hypergraph.fingerprint`
+        key : tuple
+            name and arguments of the computation; its repr must identify it
+        default : optional, default=None
+
+        Returns
+        -------
+        object
+        """
+        path = self._path(fingerprint, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            ### missing, removed by another process or partly written
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, fingerprint, key, value):
+        """
+        Stores a result, removing the least recently used files if the size
+        limit is exceeded. A result larger than the limit is not stored.
+        Files are written under a temporary name and renamed, so processes
+        sharing the directory never load a partly written result.
+
+        Parameters
+        ----------
+        fingerprint, key :
+            see :meth:`get`
+        value : object
+            must be picklable
+
+        Returns
+        -------
+        object
+            value
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._max_bytes is not None and len(data) > self._max_bytes:
+            return value
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(fingerprint, key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._evict()
+        return value
+
+    def lookup(self, fingerprint, key, compute):
+        """
+        Stored result, computed and stored if it is missing
+
+        Parameters
+        ----------
+        fingerprint, key :
+            see :meth:`get`
+        compute : callable
+            called without arguments to compute the result
+
+        Returns
+        -------
+        object
+        """
+        value = self.get(fingerprint, key, _MISSING)
+        if value is _MISSING:
+            value = self.put(fingerprint, key, compute())
+        return value
+
+    def clear(self):
+        """Removes every file"""
+        for path, _, _ in self._files():
+            _remove(path)
+
+    def _path(self, fingerprint, key):
+        import hypernetx
+
+        digest = hashlib.blake2b(
+            repr((FORMAT_VERSION, hypernetx.__version__, key)).encode(),
+            digest_size=16,
+        ).hexdigest()
+        return self.directory / f"{fingerprint}-{digest}{SUFFIX}"
+
+    def _files(self):
+        """Paths, sizes and modification times of the stored results"""
+        files = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self):
+        if self._max_bytes is None:
+            return
+        files = sorted(self._files(), key=lambda file: file[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= self._max_bytes:
+                break
+            _remove(path)
+            total -= size
+            self.evictions += 1
+
+
+def _update_digest(digest, values):
+    """
+    Adds an array or index of values to a hashlib digest. Numeric arrays
+    are hashed with their dtype and strings directly; any other values by
+    the repr of their type and value, so that values of different types
+    with the same string form, like 1 and "1", and tuples mixed with
+    scalars are told apart.
+    """
+    values = pd.Index(values, tupleize_cols=False)
+    digest.update(np.int64(len(values)).tobytes())
+    if values.dtype.kind in "biuf":
+        digest.update(values.dtype.str.encode())
+        digest.update(pd.util.hash_array(values.to_numpy()).tobytes())
+        return
+    if values.inferred_type in ["string", "empty"]:
+        digest.update(b"str")
+    else:
+        digest.update(b"repr")
+        tagged = np.empty(len(values), dtype=object)
+        tagged[:] = [
+            f"{type(value).__module__}.{type(value).__qualname__}:{value!r}"
+            for value in values
+        ]
+        values = tagged
+    digest.update(pd.util.hash_array(np.asarray(values, dtype=object)).tobytes())
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _disk_cached(func):
+    """
+    Stores the results of a function of a hypergraph in the
+    :attr:`Hypergraph.disk_cache` of its first argument, if it has one,
+    under the name of the function and its other arguments.
+    """
+    signature = inspect.signature(func)
+    first = next(iter(signature.parameters))
+
+    @functools.wraps(func)
+    def wrapper(H, *args, **kwargs):
+        cache = getattr(H, "disk_cache", None)
+        if cache is None:
+            return func(H, *args, **kwargs)
+        bound = signature.bind(H, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__module__, func.__qualname__) + tuple(
+            (name, value) for name, value in bound.arguments.items() if name != first
+        )
+        return cache.lookup(H.fingerprint(), key, lambda: func(H, *args, **kwargs))
+
+    return wrapper
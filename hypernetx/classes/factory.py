@@ -1,6 +1,10 @@
+from itertools import chain
+
+import numpy as np
 import pandas as pd
 
 from hypernetx import HyperNetXError
+from hypernetx.classes.incidence_store import _pack
 
 
 def mkdict(x):
@@ -23,6 +27,181 @@ def mkdict(x):
             return {}
 
 
+# aggregation methods that give the same result when applied to the
+# results of applying them to consecutive chunks of the rows
+CHUNKABLE_AGGREGATIONS = {"first", "last", "sum", "min", "max", "merge"}
+
+
+def _aggregation_rules(columns, aggregate_by):
+    """
+    Aggregation method per column: aggregate_by for every column if it is
+    a string, otherwise its entry or "first". misc_properties are merged
+    unless a rule is given for them or aggregate_by is "first" or "last";
+    no aggregate_by is "first".
+    """
+    if not aggregate_by:
+        aggregate_by = "first"
+    if isinstance(aggregate_by, str):
+        rules = {col: aggregate_by for col in columns}
+        if "misc_properties" in rules and aggregate_by not in ("first", "last"):
+            rules["misc_properties"] = "merge"
+    else:
+        rules = {col: aggregate_by.get(col, "first") for col in columns}
+        if "misc_properties" in rules:
+            rules["misc_properties"] = aggregate_by.get("misc_properties", "merge")
+    return rules
+
+
+def _merge_groups(values, group, keep):
+    """
+    Merged dictionaries of the rows of each group, later rows overriding
+    the keys of earlier ones. Only groups of more than one row are merged.
+    """
+    values = np.asarray(values, dtype=object)
+    merged = values[keep]
+    sizes = np.bincount(group, minlength=len(keep))
+    rows = np.flatnonzero(sizes[group] > 1)
+    dicts = {}
+    for row, g in zip(rows.tolist(), group[rows].tolist()):
+        dicts.setdefault(g, {}).update(mkdict(values[row]))
+    for g, d in dicts.items():
+        merged[g] = d
+    return merged
+
+
+def _dedupe_pairs(edge_codes, node_codes, cells=None, aggregate_by="first"):
+    """
+    Drops repeated pairs from integer coded incidence pairs. Each pair
+    keeps the position of its first row; the properties of its rows are
+    aggregated by one groupby on the pair codes.
+
+    Parameters
+    ----------
+    edge_codes, node_codes : np.ndarray
+    cells : pandas.DataFrame, optional, default=None
+        properties of the pairs in row order
+    aggregate_by : str | dict, optional, default="first"
+        aggregation method for all columns, or methods keyed by column
+        name with "first" for the others; see pandas.DataFrame.agg.
+        "merge" merges dictionaries, later rows overriding earlier keys,
+        and is the method of misc_properties unless one is given for
+        them or aggregate_by is "first" or "last". "first" alone keeps
+        the first row of each pair.
+
+    Returns
+    -------
+    tuple
+        edge codes, node codes and properties of the distinct pairs
+    """
+    _, first, inverse = np.unique(
+        _pack(edge_codes, node_codes), return_index=True, return_inverse=True
+    )
+    if len(first) == len(edge_codes):
+        return edge_codes, node_codes, cells
+    order = np.argsort(first)
+    keep = first[order]
+    if cells is not None:
+        rules = _aggregation_rules(cells.columns, aggregate_by)
+        plain = {col: rule for col, rule in rules.items() if rule != "merge"}
+        # number the pairs by first appearance so groups come out in row order
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        group = rank[inverse.ravel()]
+        if set(plain.values()) <= {"first"}:
+            aggregated = cells[list(plain)].iloc[keep].reset_index(drop=True)
+        else:
+            aggregated = (
+                cells[list(plain)].reset_index(drop=True).groupby(group).agg(plain)
+            )
+            aggregated = aggregated.reset_index(drop=True)
+        for col, rule in rules.items():
+            if rule == "merge":
+                aggregated[col] = _merge_groups(cells[col].to_numpy(), group, keep)
+        cells = aggregated[list(cells.columns)]
+    return edge_codes[keep], node_codes[keep], cells
+
+
+class _ChunkAggregator:
+    """
+    Aggregates the repeated pairs of integer coded incidence pairs that
+    arrive in chunks, keeping one row per distinct pair of each chunk.
+    "count" and "mean" are kept as partial sums and counts until
+    :meth:`result`; if any other method does not combine over chunks all
+    rows are kept and aggregated at the end.
+
+    Parameters
+    ----------
+    aggregate_by : str | dict, optional, default="first"
+        see :func:`_dedupe_pairs`; every chunk has the same columns
+    """
+
+    def __init__(self, aggregate_by="first"):
+        self.aggregate_by = aggregate_by
+        self._rules = None
+        self._counts = {}
+        self._edges, self._nodes, self._cells = [], [], []
+
+    def add(self, edge_codes, node_codes, cells=None):
+        if cells is None:
+            cells = pd.DataFrame(index=pd.RangeIndex(len(edge_codes)))
+        if self._rules is None:
+            self._rules = _aggregation_rules(cells.columns, self.aggregate_by)
+            if set(self._rules.values()) <= CHUNKABLE_AGGREGATIONS | {"count", "mean"}:
+                self._partial_rules = self._partial_columns(cells.columns)
+            else:
+                self._partial_rules = None
+        if self._partial_rules is not None:
+            edge_codes, node_codes, cells = _dedupe_pairs(
+                edge_codes, node_codes, self._partial(cells), self._partial_rules
+            )
+        self._edges.append(edge_codes)
+        self._nodes.append(node_codes)
+        self._cells.append(cells)
+
+    def result(self):
+        """Edge codes, node codes and properties of the distinct pairs"""
+        if not self._edges:
+            return np.array([], dtype=np.int32), np.array([], dtype=np.int32), None
+        edges, nodes, cells = _dedupe_pairs(
+            np.concatenate(self._edges),
+            np.concatenate(self._nodes),
+            pd.concat(self._cells, ignore_index=True),
+            (self.aggregate_by if self._partial_rules is None else self._partial_rules),
+        )
+        if self._partial_rules is not None:
+            cells = cells.copy()
+            for col, count in self._counts.items():
+                if self._rules[col] == "mean":
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        cells[col] = cells[col] / cells[count].where(cells[count] > 0)
+            cells = cells.drop(columns=list(self._counts.values()))
+        return edges, nodes, cells
+
+    def _partial_columns(self, columns):
+        """Rules of the partial columns; names the counts of the means"""
+        rules = {}
+        for col, rule in self._rules.items():
+            rules[col] = "sum" if rule in ("count", "mean") else rule
+            if rule == "mean":
+                count = f"{col} count"
+                while count in columns:
+                    count += "_"
+                self._counts[col] = count
+                rules[count] = "sum"
+        return rules
+
+    def _partial(self, cells):
+        """Columns whose sums over chunks give counts and means"""
+        cells = cells.copy()
+        for col, rule in self._rules.items():
+            if rule == "count":
+                cells[col] = cells[col].notna().astype(np.int64)
+            elif rule == "mean":
+                cells[self._counts[col]] = cells[col].notna().astype(np.int64)
+                cells[col] = cells[col].fillna(0)
+        return cells
+
+
 def create_df(
     dfp,
     uid_cols=None,
@@ -83,8 +262,21 @@ def create_df(
     cols = [c for c in dfp.columns if c not in ["weight", "misc_properties"]]
     dfp = dfp[["weight"] + cols + ["misc_properties"]]
 
-    # remove duplicate indices and aggregate using aggregation methods specified.
-    dfp = dfp[~dfp.index.duplicated(keep="first")]
+    # aggregate the rows of repeated uids with one groupby on their codes
+    if not dfp.index.is_unique:
+        index = dfp.index
+        if isinstance(index, pd.MultiIndex) and index.nlevels == 2:
+            edge_codes, node_codes = (np.asarray(c) for c in index.codes)
+        else:
+            edge_codes = pd.factorize(index)[0]
+            node_codes = np.zeros(len(index), dtype=np.int64)
+        _, _, cells = _dedupe_pairs(
+            edge_codes,
+            node_codes,
+            dfp.reset_index(drop=True),
+            aggregation_methods,
+        )
+        dfp = cells.set_axis(index[~index.duplicated(keep="first")])
 
     # rename index columns if necessary
     if level == 0 or level == 1:
@@ -135,12 +327,14 @@ def dataframe_factory_method(
     default_weight : (optional) int | float, default = 1
         Used when edge weight property is missing or undefined.
 
-    aggregate_by : (optional) dict, default = {}
-        By default duplicate incidences will be dropped unless
-        specified with `aggregation_methods`.
+    aggregate_by : (optional) str | dict, default = {}
+        By default only the first row of duplicate incidences is kept.
+        Otherwise the rows are aggregated with the method given for all
+        columns or keyed by column, "first" for the others.
         See pandas.DataFrame.agg() methods for additional syntax and usage
         information. An example aggregation method is {'weight': 'sum'} to sum
-        the weights of the aggregated duplicate rows.
+        the weights of the aggregated duplicate rows; the misc_properties
+        dictionaries of the rows are then merged.
 
     Returns
     -------
@@ -167,21 +361,60 @@ def dataframe_factory_method(
 
 
 def dict_to_incidence_store_df(D):
-    L0 = []  # list of keys
-    L1 = []  # list of the values
-    for edge in D:
-        nodes = D[edge]
-        for node in nodes:
-            L0.append(edge)
-            L1.append(node)
+    """
+    Incidence pairs of a dictionary of edges to their nodes, in the order
+    of the dictionary. Values are flattened once and the edge column is
+    the keys repeated by the lengths of their values.
+
+    Parameters
+    ----------
+    D : dict
+        edge uids to iterables of node uids, or to dictionaries keyed by
+        node uids
+
+    Returns
+    -------
+    pandas.DataFrame
+        with columns "level_0" (edges) and "level_1" (nodes)
+    """
+    values = [v if hasattr(v, "__len__") else list(v) for v in D.values()]
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
     return pd.DataFrame(
         {
-            "level_0": L0,
-            "level_1": L1,
+            "level_0": pd.Index(list(D), tupleize_cols=False).repeat(lengths),
+            "level_1": list(chain.from_iterable(values)),
         }
     )
 
 
+def _dict_incidence_attributes(D, weight_col, default_weight):
+    """
+    Weights and misc properties of the incidence pairs of a dictionary of
+    edges to dictionaries of node attributes, in the order of
+    dict_to_incidence_store_df. Pairs of edges given by a plain iterable
+    get the default weight and no properties. The dictionaries of D are
+    not changed.
+
+    Returns
+    -------
+    tuple of lists
+        weights and misc_properties dictionaries
+    """
+    weights, misc = [], []
+    for nodes in D.values():
+        if isinstance(nodes, dict):
+            for attributes in nodes.values():
+                if not isinstance(attributes, dict):
+                    attributes = {}
+                weights.append(attributes.get(weight_col, default_weight))
+                misc.append({k: v for k, v in attributes.items() if k != weight_col})
+        else:
+            # float like the weights of setsystems of plain iterables only
+            weights.extend([float(default_weight)] * len(nodes))
+            misc.extend({} for _ in range(len(nodes)))
+    return weights, misc
+
+
 def dict_factory_method(
     D,
     level,
@@ -219,12 +452,14 @@ def dict_factory_method(
     default_weight : (optional) int | float, default = 1
         Used when edge weight property is missing or undefined.
 
-    aggregate_by : (optional) dict, default = {}
-        By default duplicate incidences will be dropped unless
-        specified with `aggregation_methods`.
+    aggregate_by : (optional) str | dict, default = {}
+        By default only the first row of duplicate incidences is kept.
+        Otherwise the rows are aggregated with the method given for all
+        columns or keyed by column, "first" for the others.
         See pandas.DataFrame.agg() methods for additional syntax and usage
         information. An example aggregation method is {'weight': 'sum'} to sum
-        the weights of the aggregated duplicate rows.
+        the weights of the aggregated duplicate rows; the misc_properties
+        dictionaries of the rows are then merged.
 
     """
 
@@ -241,22 +476,22 @@ def dict_factory_method(
     elif level == 2:
         # explode list of lists into incidence pairs as a pandas dataframe using pandas series explode.
         # DF = pd.DataFrame(pd.Series(D).explode()).reset_index()
+        if not all(hasattr(nodes, "__len__") for nodes in D.values()):
+            # iterators are read once by the pairs and once by the attributes
+            D = {
+                edge: nodes if hasattr(nodes, "__len__") else list(nodes)
+                for edge, nodes in D.items()
+            }
         DF = dict_to_incidence_store_df(D)
         # rename columns to correct column names for edges and nodes
         DF = DF.rename(columns=dict(zip(DF.columns, ["edges", "nodes"])))
-        attribute_data = {weight_col: [], misc_properties_col: []}
-        for _, incidence_pair in DF.iterrows():
-            edge, node = incidence_pair
-            if isinstance(D[edge], dict):
-                attributes_of_incidence_pair = D[edge][node]
-                if weight_col in attributes_of_incidence_pair:
-                    weight_val = attributes_of_incidence_pair.pop(weight_col)
-                    attribute_data[weight_col] += [weight_val]
-                else:
-                    attribute_data[weight_col] += [default_weight]
-                attribute_data[misc_properties_col] += [attributes_of_incidence_pair]
-        attribute_df = pd.DataFrame(attribute_data)
-        DF = pd.concat([DF, attribute_df], axis=1)
+        if any(isinstance(nodes, dict) for nodes in D.values()):
+            weights, misc = _dict_incidence_attributes(D, weight_col, default_weight)
+            DF[weight_col] = weights
+            DF[misc_properties_col] = misc
+        else:
+            # plain iterables of nodes carry no attributes
+            DF[weight_col] = np.full(len(DF), default_weight, dtype=float)
 
     # if the dictionary is for edges or nodes.
     elif level == 1 or level == 0:
@@ -327,12 +562,14 @@ def list_factory_method(
     default_weight : (optional) int | float, default = 1
         Used when edge weight property is missing or undefined.
 
-    aggregate_by : (optional) dict, default = {}
-        By default duplicate incidences will be dropped unless
-        specified with `aggregation_methods`.
+    aggregate_by : (optional) str | dict, default = {}
+        By default only the first row of duplicate incidences is kept.
+        Otherwise the rows are aggregated with the method given for all
+        columns or keyed by column, "first" for the others.
         See pandas.DataFrame.agg() methods for additional syntax and usage
         information. An example aggregation method is {'weight': 'sum'} to sum
-        the weights of the aggregated duplicate rows.
+        the weights of the aggregated duplicate rows; the misc_properties
+        dictionaries of the rows are then merged.
 
     """
 
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import warnings
-from copy import deepcopy
 from collections import UserList
 import pandas as pd
 
@@ -37,13 +36,25 @@ class HypergraphView(object):
         self._level = level
         self._property_store = property_store
 
-        ### incidence store needs index or columns
-        if level == 0:
-            self._items = self._incidence_store.edges
-        elif level == 1:
-            self._items = self._incidence_store.nodes
-        elif level == 2:
-            self._items = self._incidence_store
+    @property
+    def _items(self):
+        """
+        Edges or nodes in order of first appearance in the incidence store,
+        or the incidence store itself for level 2. Computed by the
+        incidence store on first access.
+        """
+        if self._level == 2:
+            return self._incidence_store
+        return self._incidence_store._unique(self._level)
+
+    @property
+    def _index(self):
+        """
+        Hashed code map of the incidence store used for membership tests
+        """
+        if self._level == 2:
+            return self._incidence_store
+        return self._incidence_store.index(self._level)
 
     @property
     def items(self):
@@ -113,15 +124,10 @@ class HypergraphView(object):
         pd.DataFrame
         """
 
-        df = self.user_defined_properties.copy(deep=True)
+        ### copy without sharing the dictionaries in the misc_properties column
+        df = self._property_store.to_dataframe()
 
-        ### deep copy dictionaries in the misc_properties column
-        temp = [deepcopy(d) for d in df.misc_properties.values]
-        df.misc_properties = temp
-
-        non_user_defined_items = list(
-            set(self._items).difference(self.user_defined_properties.index)
-        )
+        non_user_defined_items = list(set(self._items).difference(df.index))
 
         # skip combining df and non_user_defined_items if non_user_defined_items is empty
         if not non_user_defined_items:
@@ -245,7 +251,10 @@ class HypergraphView(object):
         -------
         bool
         """
-        return item in self._items
+        try:
+            return item in self._index
+        except TypeError:
+            return False
 
     def __call__(self):
         """
@@ -276,7 +285,7 @@ class HypergraphView(object):
         AttrList
             UserList of incident objects (neighbors in the bipartite graph)
         """
-        if uid in self._items:
+        if uid in self:
             neighbors = self.incidence_store.neighbors(self.level, uid)
             return AttrList(uid, self, initlist=neighbors)
 
@@ -296,6 +305,65 @@ class HypergraphView(object):
         """
         self.property_store.set_defaults(defaults_dict)
 
+    def property_array(self, name, order=None):
+        """
+        Values of a property for all items in the HypergraphView as an array
+
+        Parameters
+        ----------
+        name : str | int
+            name of the property
+        order : str | list, optional, default=None
+            Order of the values. If None, the order of the items in the
+            HypergraphView. If "matrix", the row or column order of the
+            incidence matrix for nodes and edges, and the order of the
+            incidence pairs in the incidence store for incidences.
+            Otherwise a list of uids.
+
+        Returns
+        -------
+        numpy.ndarray
+            Items without a user-defined value have the default value
+            of the property.
+        """
+        if self._level == 2 and isinstance(order, str) and order == "matrix":
+            store = self._incidence_store
+            return self._property_store.get_property_array_codes(
+                store.index(0), store.index(1), *store.codes, name
+            )
+        return self._property_store.get_property_array(self._ordered(order), name)
+
+    def set_property_array(self, name, values, order=None):
+        """
+        Sets a property for all items in the HypergraphView from an array
+
+        Parameters
+        ----------
+        name : str | int
+            name of the property
+        values : array-like
+            values aligned with `order`
+        order : str | list, optional, default=None
+            See :meth:`property_array`
+
+        Returns
+        -------
+        None
+        """
+        self._property_store.set_property_column(
+            name, values, uids=self._ordered(order)
+        )
+
+    def _ordered(self, order):
+        """List of uids in the order requested from property_array"""
+        if order is None:
+            return list(self._items)
+        if isinstance(order, str) and order == "matrix":
+            if self._level == 2:
+                return list(self._incidence_store)
+            return list(self._incidence_store.index(self._level))
+        return list(order)
+
 
 class AttrList(UserList):
     """Custom list wrapper for integrating PropertyStore data with
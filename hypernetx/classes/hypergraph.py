@@ -2,8 +2,12 @@
 # All rights reserved.
 from __future__ import annotations
 
+import hashlib
+import json
 import warnings
-from collections import defaultdict
+from contextlib import contextmanager
+from itertools import groupby
+from pathlib import Path
 from typing import TypeVar, Union
 
 import networkx as nx
@@ -17,11 +21,21 @@ from hypernetx.classes.factory import (
     dataframe_factory_method,
     dict_factory_method,
     list_factory_method,
+    mkdict,
     ndarray_factory_method,
+    _ChunkAggregator,
+    _dedupe_pairs,
+)
+from hypernetx.classes.incidence_store import (
+    IncidenceStore,
+    _Interner,
+    _slice_codes,
 )
-from hypernetx.classes.incidence_store import IncidenceStore
 from hypernetx.classes.property_store import PropertyStore
+from hypernetx.classes.state_cache import StateCache
+from hypernetx.classes.disk_cache import DiskCache, _update_digest
 from hypernetx.classes.hyp_view import HypergraphView
+from hypernetx.classes.instrumentation import Instrumentation, _instrumented
 
 warnings.filterwarnings("default", category=DeprecationWarning)
 
@@ -29,6 +43,9 @@ __all__ = ["Hypergraph"]
 
 T = TypeVar("T", bound=Union[str, int])
 
+# dtypes of the cached matrices, see Hypergraph(dtype_policy=...)
+DTYPE_POLICIES = ("narrow", "wide")
+
 
 class Hypergraph:
     """
@@ -64,6 +81,14 @@ class Hypergraph:
         properties. Useful if objects have diverse property sets.
         Ignored for other setsystem types.
 
+    aggregate_by : str | dict, optional, default="first"
+        Aggregation of the properties of incidence pairs given more than
+        once, with one method for all columns or methods keyed by column
+        name, "first" for the others; e.g. {'weight': 'sum'}, 'count' or
+        'mean'. See pandas.DataFrame.agg(). Unless aggregate_by is "first"
+        or "last" the misc properties of the pairs are merged, later rows
+        overriding earlier keys.
+
     properties : pd.DataFrame | dict, optional, default=None
         Concatenation/union of edge_properties and node_properties.
         By default, the object id is used and should be the first column of the dataframe, or key in the dict.
@@ -107,6 +132,45 @@ class Hypergraph:
     name : str, optional, default=None
         Name assigned to hypergraph
 
+    incidence_backend : str, optional, default="pandas"
+        Storage used by the IncidenceStore. Use "csr" to keep the incidence
+        pairs as int32 codes in compressed edge and node arrays instead of
+        a dataframe and dictionaries of lists. See :class:`IncidenceStore`.
+
+    property_storage : str, optional, default="dict"
+        Storage used by the PropertyStores for misc_properties. Use
+        "columnar" to keep recurring misc properties in typed columns and
+        rare ones in a side table instead of one dictionary per item.
+        See :class:`PropertyStore`.
+
+    dtype_policy : str, optional, default="wide"
+        Dtypes of the incidence codes and of the matrices returned.
+        "wide" uses int64 as in earlier versions. "narrow" keeps int32
+        codes and int8 entries in unweighted incidence and s-adjacency
+        matrices; products of such matrices formed outside HNX also have
+        int8 entries and overflow beyond 127, so cast them first. The
+        overlap counts HNX computes internally are kept in uint16
+        (uint32 if needed) under either policy. Can be changed later
+        with :attr:`dtype_policy`.
+
+    cache_budget : int, optional, default=None
+        Bytes the cached matrices, linegraphs, s-neighbors and statistics
+        may hold; the least recently used are evicted beyond it. None for
+        no limit. See :attr:`state_cache`.
+
+    disk_cache : str | pathlib.Path | DiskCache, optional, default=None
+        Directory, or :class:`DiskCache`, where the s-adjacency matrices
+        and the results of the s-centrality functions and betti_numbers
+        are stored under the :meth:`fingerprint` of the hypergraph, so
+        later processes can load them instead of computing them again.
+        Can be set later with :attr:`disk_cache`.
+
+    lean : bool, optional, default=True
+        Keep only the stores of the incidences, edges and nodes. If False,
+        the constructor arguments, the intermediate tables and a copy of
+        the incidence dataframe are also kept as attributes as in earlier
+        versions, which keeps the input data alive. See
+        :meth:`memory_usage`.
 
     ======================
     Hypergraphs in HNX 2.3
@@ -306,6 +370,12 @@ class Hypergraph:
         node_weight_prop_col="weight",
         default_node_weight=1,
         name=None,
+        incidence_backend="pandas",
+        property_storage="dict",
+        dtype_policy="wide",
+        cache_budget=None,
+        disk_cache=None,
+        lean=True,
         **kwargs,  ## these are ignored but allow for some backwards compatibility
     ):
 
@@ -336,10 +406,16 @@ class Hypergraph:
             ## dataframe_factory_method(edf,uid_cols=[uid_col],weight_col,default_weight,misc_properties)
             ## multi index set by uid_cols = [edge_col,node_col]
             incidence_store = IncidenceStore(
-                pd.DataFrame(list(df.index), columns=["edges", "nodes"])
+                pd.DataFrame(
+                    {
+                        "edges": df.index.get_level_values(0),
+                        "nodes": df.index.get_level_values(1),
+                    }
+                ),
+                backend=incidence_backend,
             )
             incidence_propertystore = PropertyStore(
-                data=df, default_weight=default_cell_weight
+                data=df, default_weight=default_cell_weight, storage=property_storage
             )
             self._E = HypergraphView(incidence_store, 2, incidence_propertystore)
             ## if no properties PropertyStore should store in the most efficient way
@@ -357,7 +433,7 @@ class Hypergraph:
                     misc_properties_col=misc_properties_col,
                 )
                 all_propertystore = PropertyStore(
-                    data=dfp, default_weight=default_weight
+                    data=dfp, default_weight=default_weight, storage=property_storage
                 )
                 self._edges = HypergraphView(incidence_store, 0, all_propertystore)
                 self._nodes = HypergraphView(incidence_store, 1, all_propertystore)
@@ -373,12 +449,18 @@ class Hypergraph:
                         misc_properties_col=misc_edge_properties_col,
                     )
                     edge_propertystore = PropertyStore(
-                        edfp, default_weight=default_edge_weight
+                        edfp,
+                        default_weight=default_edge_weight,
+                        storage=property_storage,
                     )
                 else:
-                    edge_properties = PropertyStore(default_weight=default_edge_weight)
+                    edge_properties = PropertyStore(
+                        default_weight=default_edge_weight, storage=property_storage
+                    )
             else:
-                edge_propertystore = PropertyStore(default_weight=default_edge_weight)
+                edge_propertystore = PropertyStore(
+                    default_weight=default_edge_weight, storage=property_storage
+                )
             self._edges = HypergraphView(incidence_store, 0, edge_propertystore)
 
             if node_properties is not None:
@@ -392,20 +474,33 @@ class Hypergraph:
                         misc_properties_col=misc_node_properties_col,
                     )
                     node_propertystore = PropertyStore(
-                        ndfp, default_weight=default_node_weight
+                        ndfp,
+                        default_weight=default_node_weight,
+                        storage=property_storage,
                     )
                 else:
                     node_propertystore = PropertyStore(
-                        default_weight=default_node_weight
+                        default_weight=default_node_weight, storage=property_storage
                     )
             else:
-                node_propertystore = PropertyStore(default_weight=default_node_weight)
+                node_propertystore = PropertyStore(
+                    default_weight=default_node_weight, storage=property_storage
+                )
             self._nodes = HypergraphView(incidence_store, 1, node_propertystore)
 
-        self._dataframe = self.dataframe
-        self._set_default_state()
+        if dtype_policy not in DTYPE_POLICIES:
+            raise HyperNetXError(
+                f"Unknown dtype policy {dtype_policy}, expected one of {DTYPE_POLICIES}"
+            )
+        self._dtype_policy = dtype_policy
+        self._state_dict = StateCache(cache_budget)
+        self.disk_cache = disk_cache
+        self._instrumentation = None  ### see Hypergraph.instrument
+        self._batch = None  ### buffered edits, see Hypergraph.batch
         self.name = name
-        self.__dict__.update(locals())
+        if not lean:
+            self._dataframe = self.dataframe
+            self.__dict__.update(locals())
 
     @property
     def edges(self):
@@ -461,7 +556,80 @@ class Hypergraph:
         """
         return self._E.properties
 
-    def incidence_matrix(self, index=False, weights=False):
+    @property
+    def dtype_policy(self):
+        """
+        Dtypes of the incidence codes and matrices, "narrow" or "wide".
+        See :class:`Hypergraph`. Setting it drops the cached matrices.
+
+        Returns
+        -------
+        str
+        """
+        return self._dtype_policy
+
+    @dtype_policy.setter
+    def dtype_policy(self, policy):
+        if policy not in DTYPE_POLICIES:
+            raise HyperNetXError(
+                f"Unknown dtype policy {policy}, expected one of {DTYPE_POLICIES}"
+            )
+        if policy != self._dtype_policy:
+            self._dtype_policy = policy
+            self._state_dict.clear()
+
+    def _dtype(self, kind, bound=0):
+        """
+        Dtype of the "codes" and the "binary" entries of the matrices under
+        the dtype policy, or of internal "counts" up to bound, which are
+        never returned and so always compact
+        """
+        if kind == "counts":
+            return np.uint16 if bound <= np.iinfo(np.uint16).max else np.uint32
+        if self._dtype_policy == "wide":
+            return np.int64
+        if kind == "codes":
+            return np.int32
+        return np.int8
+
+    def memory_usage(self, deep=False):
+        """
+        Bytes held by the hypergraph, by store and for the cached state.
+        A property store shared by edges and nodes is counted once.
+
+        Parameters
+        ----------
+        deep : bool, optional, default=False
+            If True, also count the objects of object columns such as uids
+            and misc_properties dictionaries, see
+            pandas.DataFrame.memory_usage
+
+        Returns
+        -------
+        pandas.Series
+            bytes indexed by "incidence_store", "incidences", "edges",
+            "nodes" and "state"
+
+        Examples
+        --------
+            >>> H = Hypergraph({"A": [1, 2], "B": [2, 3]})
+            >>> H.memory_usage(deep=True).sum()  # doctest: +SKIP
+        """
+        stores = {
+            "incidence_store": self._E.incidence_store,
+            "incidences": self._E.property_store,
+            "edges": self._edges.property_store,
+            "nodes": self._nodes.property_store,
+        }
+        usage, seen = {}, set()
+        for key, store in stores.items():
+            usage[key] = 0 if id(store) in seen else store.memory_usage(deep=deep)
+            seen.add(id(store))
+        usage["state"] = self._state_dict.nbytes
+        return pd.Series(usage, name="bytes", dtype=np.int64)
+
+    @_instrumented(lambda a: ("incidence_matrix", bool(a["weights"]), a["format"]))
+    def incidence_matrix(self, index=False, weights=False, format="csr"):
         """
         A sparse matrix indicating the existence of an incidence pair
         in the hypergraph. Each row corresponds to a node v and each column
@@ -479,29 +647,68 @@ class Hypergraph:
         weights : bool, optional, default = False
             If True, use the incidence weights corresponding to
             the row and column of the entry.
+        format : str, optional, default = "csr"
+            "csr" or "csc", the sparse format of the matrix
 
         Returns
         -------
-        incidence matrix: scipy.sparse.csr_matrix
+        incidence matrix: scipy.sparse.csr_matrix | scipy.sparse.csc_matrix
         node indexes: np.ndarray
             an np.ndarray containing the row and column index of node_uids
         edge indexes: np.ndarray
             an np.ndarray containing the row and column index of edge_uids
-        """
-        e, n = self._state_dict["data"].T
 
-        if weights:
-            data = self._E.dataframe["weight"]
-        else:
-            data = np.ones(len(e)).astype(int)
-        mat = csr_matrix((data, (n, e)))
+        Notes
+        -----
+        The matrices are cached until the incidences change, or for
+        weights=True their properties; copy one before modifying it.
+        The row and column positions of uids are given by
+        ``H.nodes._index.get_loc`` and ``H.edges._index.get_loc``.
+
+        In-place additions append new edges and nodes after the existing
+        ones, and in-place removals keep the order of the others. The
+        labels, and the rows and columns of this and the adjacency
+        matrices, can therefore be ordered differently than in an equal
+        hypergraph built with inplace=False or from scratch. Match rows
+        and columns by their labels, never by position alone.
+        """
+        if format not in ("csr", "csc"):
+            raise HyperNetXError(f"Unknown format {format}, expected csr or csc")
+        mat = self._incidence_matrix(bool(weights), format)
 
         if index:
             return (
                 mat,
-                self._state_dict["labels"]["nodes"],
-                self._state_dict["labels"]["edges"],
+                self._labels()["nodes"],
+                self._labels()["edges"],
+            )
+        return mat
+
+    def _incidence_matrix(self, weights, format):
+        """
+        Cached incidence matrix. A weighted matrix is kept together with
+        the version of the incidence property store it was read from and
+        rebuilt once the store has been written to.
+        """
+        key = ("incidence_matrix", weights, format)
+        version = self._E.property_store.version if weights else None
+        cached = self._state_dict.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if format == "csc":
+            mat = self._incidence_matrix(weights, "csr").tocsc()
+        else:
+            e, n = self._codes_array().T
+            if weights:
+                data = self._E.property_array("weight", order="matrix")
+            else:
+                data = np.ones(len(e), dtype=self._dtype("binary"))
+            labels = self._labels()
+            mat = csr_matrix(
+                (data, (n, e)), shape=(len(labels["nodes"]), len(labels["edges"]))
             )
+        self._state_dict.put(key, (version, mat))
         return mat
 
     def incidence_dataframe(self, weights=False):
@@ -654,8 +861,8 @@ class Hypergraph:
         if nodes is not None:
             ndf = ndf.rename(index=nodes)
             df = df.rename(index=nodes, level=1)
-        eps = PropertyStore(edf)
-        nps = PropertyStore(ndf)
+        eps = PropertyStore(edf, storage=self._E.property_store.storage)
+        nps = PropertyStore(ndf, storage=self._E.property_store.storage)
         return self._construct_hyp_from_stores(
             df, edge_ps=eps, node_ps=nps, name=name, inplace=inplace
         )
@@ -713,6 +920,7 @@ class Hypergraph:
             return store.property_store.get_properties(uid)
         return store.property_store.get_property(uid, prop_name)
 
+    @_instrumented(lambda a: ("sedgelg" if a["edges"] else "snodelg", a["s"]))
     def get_linegraph(self, s=1, edges=True):
         """
         Creates an :term:`s-linegraph` for the Hypergraph.
@@ -735,10 +943,10 @@ class Hypergraph:
         nx.Graph
             A NetworkX graph.
         """
-        d = self._state_dict
-        key = "sedgelg" if edges else "snodelg"
-        if s in d[key]:
-            return d[key][s]
+        key = ("sedgelg", s) if edges else ("snodelg", s)
+        g = self._state_dict.get(key)
+        if g is not None:
+            return g
 
         if edges:  ### Amaplist needs a dictionary returned for properties.
             A, Amap = self.edge_adjacency_matrix(s=s, index=True)
@@ -756,50 +964,191 @@ class Hypergraph:
         g = nx.Graph()
         g.add_nodes_from(Amaplst)
         g.add_edges_from(A)
-        d[key][s] = g
-        return g
+        depends = ("incidences", "edges" if edges else "nodes")
+        return self._state_dict.put(key, g, depends=depends)
 
     def set_state(self, **kwargs):
         """
         Allow state_dict updates from outside of class. Use with caution.
+        The values are dropped when the incidences change.
 
         Parameters
         ----------
         **kwargs : dict, optional
             key-value pairs to save in state dictionary
         """
-        self._state_dict.update(kwargs)
+        for key, value in kwargs.items():
+            self._state_dict.put(key, value)
+
+    def instrument(self, enabled=True, logger=None, callback=None):
+        """
+        Starts or stops recording the calls of incidence_matrix,
+        adjacency_matrix, edge_adjacency_matrix and get_linegraph: their
+        number per value of s, state cache hits and misses, wall time and
+        the bytes of the values computed. The records are returned by
+        :meth:`stats`. Recording is off by default.
+
+        Parameters
+        ----------
+        enabled : bool, optional, default=True
+            False stops recording and drops the records
+        logger : logging.Logger | str, optional, default=None
+            logger, or name of a logger made by
+            :func:`hypernetx.utils.log.get_logger`, each call is logged to
+        callback : callable, optional, default=None
+            called after each call with a dictionary of its method, s,
+            hit, seconds and bytes
+
+        Returns
+        -------
+        Hypergraph
+            self
+
+        Examples
+        --------
+            >>> H = Hypergraph({"A": [1, 2], "B": [2, 3]}).instrument()
+            >>> H.adjacency_matrix(s=1) is H.adjacency_matrix(s=1)
+            True
+            >>> H.stats().loc[("adjacency_matrix", 1), ["calls", "hits"]].tolist()
+            [2, 1]
+        """
+        self._instrumentation = (
+            Instrumentation(logger=logger, callback=callback) if enabled else None
+        )
+        return self
+
+    def stats(self, reset=False):
+        """
+        Calls recorded since :meth:`instrument`, see there. The totals of
+        the state cache are in the ``attrs`` of the dataframe.
+
+        Parameters
+        ----------
+        reset : bool, optional, default=False
+            If True, the records are dropped after they are returned
+
+        Returns
+        -------
+        pandas.DataFrame
+            indexed by method and s with columns calls, hits, misses,
+            seconds and bytes; empty if recording is off
+        """
+        if self._instrumentation is None:
+            df = Instrumentation().to_dataframe()
+        else:
+            df = self._instrumentation.to_dataframe()
+            if reset:
+                self._instrumentation.reset()
+        cache = self._state_dict
+        df.attrs["cache"] = {
+            "entries": len(cache),
+            "bytes": cache.nbytes,
+            "budget": cache.budget,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "evictions": cache.evictions,
+            "version": cache.version,
+        }
+        return df
+
+    @property
+    def state_cache(self):
+        """
+        Cache of the matrices, linegraphs, s-neighbors and statistics
+        computed from the hypergraph. Its budget can be changed and its
+        entries and their sizes inspected.
+
+        Returns
+        -------
+        StateCache
+        """
+        return self._state_dict
+
+    @property
+    def disk_cache(self):
+        """
+        Cache of results stored on disk under the :meth:`fingerprint` of
+        the hypergraph, or None. Can be set to a directory, a
+        :class:`DiskCache` shared with other hypergraphs, or None.
+
+        Returns
+        -------
+        DiskCache | None
+        """
+        return self._disk_cache
+
+    @disk_cache.setter
+    def disk_cache(self, cache):
+        if cache is not None and not isinstance(cache, DiskCache):
+            cache = DiskCache(cache)
+        self._disk_cache = cache
+
+    def fingerprint(self):
+        """
+        Hash of the content of the hypergraph: the uids of its edges and
+        nodes, its incidence pairs in code order and their weights. Equal
+        hypergraphs built the same way have the same fingerprint in every
+        process; it changes whenever an incidence or its weight does.
+        Uids other than numbers and strings are hashed by type and repr,
+        so uids whose repr differs between processes, such as objects
+        shown by their address, give a new fingerprint in each process.
+
+        Returns
+        -------
+        str
+            hexadecimal digest
+        """
+        digest = hashlib.blake2b(self._structure_digest(), digest_size=16)
+        weights = self.incidences.property_array("weight", order="matrix")
+        _update_digest(digest, weights)
+        return digest.hexdigest()
+
+    def _structure_digest(self):
+        """Cached hash of the uids and the coded incidence pairs"""
+
+        def compute():
+            digest = hashlib.blake2b(digest_size=16)
+            store = self._E.incidence_store
+            for level in [0, 1]:
+                _update_digest(digest, store.index(level))
+            digest.update(np.ascontiguousarray(self._codes_array(), np.int64).tobytes())
+            return digest.digest()
+
+        return self._state_dict.lookup("fingerprint", compute)
+
+    def _persisted(self, key, compute):
+        """
+        Value of compute, loaded from and stored in the disk cache under
+        key and the fingerprint if there is one
+        """
+        if self._disk_cache is None:
+            return compute()
+        return self._disk_cache.lookup(self.fingerprint(), key, compute)
 
     def _set_default_state(self, empty=False):
         """
-        Populate state_dict with default values
+        Drops all computed state, keeping the budget of the cache
         """
-        self._state_dict = {}
-        df = self._E.incidence_store.data
-        self._state_dict["dataframe"] = df
+        self._state_dict.clear()
 
         if empty:
-            self._state_dict["labels"] = {"edges": np.array([]), "nodes": np.array([])}
-            self._state_dict["data"] = np.array([[], []])
-        else:
-            df.edges = df.edges.astype("category")
-            df.nodes = df.nodes.astype("category")
-            self._state_dict["labels"] = {
-                "edges": np.array(df["edges"].cat.categories),
-                "nodes": np.array(df["nodes"].cat.categories),
-            }
-            self._state_dict["data"] = np.array(
-                [df["edges"].cat.codes, df["nodes"].cat.codes], dtype=int
-            ).T
-
-        self._state_dict["snodelg"] = dict()  ### s: nx.graph
-        self._state_dict["sedgelg"] = dict()
-        self._state_dict["neighbors"] = defaultdict(dict)  ### s: {node: neighbors}
-        self._state_dict["edge_neighbors"] = defaultdict(
-            dict
-        )  ### s: {edge: edge_neighbors}
-        self._state_dict["adjacency_matrix"] = dict()  ### s: scipy.sparse.csr_matrix
-        self._state_dict["edge_adjacency_matrix"] = dict()
+            self._state_dict.put(
+                "labels", {"edges": np.array([]), "nodes": np.array([])}
+            )
+            self._state_dict.put("data", np.empty((0, 2), dtype=self._dtype("codes")))
+
+    def _labels(self):
+        """Cached uids of the edges and nodes in code order"""
+        return self._state_dict.lookup("labels", lambda: self._E.incidence_store.labels)
+
+    def _codes_array(self):
+        """Cached edge and node codes of the incidence pairs as rows"""
+        return self._state_dict.lookup(
+            "data",
+            lambda: np.array(
+                self._E.incidence_store.codes, dtype=self._dtype("codes")
+            ).T,
+        )
 
     def edge_size_dist(self):
         """
@@ -810,10 +1159,10 @@ class Hypergraph:
         list
             a list of sizes of each edge.
         """
-        if "edge_size_dist" not in self._state_dict:
-            dist = np.array(np.sum(self.incidence_matrix(), axis=0))[0].tolist()
-            self.set_state(edge_size_dist=dist)
-        return self._state_dict["edge_size_dist"]
+        return self._state_dict.lookup(
+            "edge_size_dist",
+            lambda: np.array(np.sum(self.incidence_matrix(), axis=0))[0].tolist(),
+        )
 
     def degree(self, node_uid, s=1, max_size=None):
         """
@@ -911,21 +1260,20 @@ class Hypergraph:
         if node not in self.nodes:
             warnings.warn(f"{node} is not in hypergraph {self.name}.")
             return []
-        if node in self._state_dict["neighbors"][s]:
-            return self._state_dict["neighbors"][s][node]
-
-        inc_matrix = self.incidence_matrix()
-        rdx = self._state_dict["labels"]["nodes"]
-        jdx = np.where(rdx == node)
+        key = ("neighbors", s, node)
+        neighbors = self._state_dict.get(key)
+        if neighbors is not None:
+            return neighbors
+
+        inc_matrix = self._count_matrix()
+        rdx = self._labels()["nodes"]
+        jdx = self._nodes._index.get_loc(node)
         idx = (inc_matrix[jdx].dot(inc_matrix.T) >= s) * 1
         idx = np.nonzero(idx)[1]
         neighbors = list(rdx[idx])
         if len(neighbors) > 0:
             neighbors.remove(node)
-            self._state_dict["neighbors"][s][node] = neighbors
-        else:
-            self._state_dict["neighbors"][s][node] = []
-        return self._state_dict["neighbors"][s][node]
+        return self._state_dict.put(key, neighbors, item=("nodes", node))
 
     def edge_neighbors(self, edge, s=1):
         """
@@ -949,22 +1297,56 @@ class Hypergraph:
         if edge not in self.edges:
             warnings.warn(f"Edge is not in hypergraph {self.name}.")
             return []
-        if edge in self._state_dict["edge_neighbors"][s]:
-            return self._state_dict["edge_neighbors"][s][edge]
-
-        inc_matrix = self.incidence_matrix()
-        cdx = self._state_dict["labels"]["edges"]
-        jdx = np.where(cdx == edge)
-        idx = (inc_matrix.T[jdx].dot(inc_matrix) >= s) * 1
+        key = ("edge_neighbors", s, edge)
+        edge_neighbors = self._state_dict.get(key)
+        if edge_neighbors is not None:
+            return edge_neighbors
+
+        inc_matrix = self._count_matrix(edges=True)
+        cdx = self._labels()["edges"]
+        jdx = self._edges._index.get_loc(edge)
+        idx = (inc_matrix[jdx].dot(inc_matrix.T) >= s) * 1
         idx = np.nonzero(idx)[1]
         edge_neighbors = list(cdx[idx])
         if len(edge_neighbors) > 0:
             edge_neighbors.remove(edge)
-            self._state_dict["edge_neighbors"][s][edge] = edge_neighbors
-        else:
-            self._state_dict["edge_neighbors"][s][edge] = []
-        return self._state_dict["edge_neighbors"][s][edge]
+        return self._state_dict.put(key, edge_neighbors, item=("edges", edge))
+
+    def _count_matrix(self, edges=False):
+        """
+        Cached unweighted incidence matrix, node by edge or edge by node
+        in CSR, in the dtype of the counts of its products: two rows share
+        at most as many columns as the longest row has entries.
+        """
+
+        def compute():
+            if edges:
+                matrix = self._incidence_matrix(False, "csc").T
+            else:
+                matrix = self._incidence_matrix(False, "csr")
+            bound = np.diff(matrix.indptr).max(initial=0)
+            return matrix.astype(self._dtype("counts", bound))
+
+        return self._state_dict.lookup(("count_matrix", edges), compute)
 
+    def _overlaps(self, edges=False):
+        """
+        Cached number of edges shared by each pair of nodes, or of nodes
+        shared by each pair of edges, in the count dtype and without the
+        diagonal. The s-adjacency matrices for every s are thresholded
+        from it.
+        """
+
+        def compute():
+            matrix = self._count_matrix(edges=edges)
+            overlaps = matrix @ matrix.T
+            overlaps.setdiag(0)
+            overlaps.eliminate_zeros()
+            return overlaps
+
+        return self._state_dict.lookup(("overlaps", edges), compute)
+
+    @_instrumented(lambda a: ("adjacency_matrix", a["s"]))
     def adjacency_matrix(self, s=1, index=False):
         """
         Returns the :term:`s-adjacency matrix` for the hypergraph.
@@ -983,34 +1365,23 @@ class Hypergraph:
         node indexes: np.ndarray
             an np.ndarray containing the row and column index of node_uids.
         """
-        # if the adjacency_matrix for size s is not in the state_dict, create the adjacency matrix
-        # and add it to the state_dict
-        if (
-            "adjacency_matrix" not in self._state_dict
-            or s not in self._state_dict["adjacency_matrix"]
-        ):
-            incidence_matrix = self.incidence_matrix()
-
-            # calculates the square of the incidence matrix by multiplying it with its transpose.
-            s_adj_matrix = incidence_matrix @ incidence_matrix.T
-
-            # sets the diagonal elements of s_adj_matrix to zero to remove self-loops.
-            s_adj_matrix.setdiag(0)
-
-            # sets all values in s_adj_matrix that are greater than or equal to a
-            # threshold 's' to 1, and all other values to 0.
-
-            s_adj_matrix = (s_adj_matrix >= s) * 1
-
-            self._state_dict["adjacency_matrix"][s] = s_adj_matrix
+        # if the adjacency_matrix for size s is not in the state cache, create the adjacency matrix
+        # and add it to the state cache
+        s_adj_matrix = self._state_dict.get(("adjacency_matrix", s))
+        if s_adj_matrix is None:
+            # number of edges shared by each pair of nodes, zero on the diagonal,
+            # set to 1 where it is at least s and to 0 elsewhere
+            s_adj_matrix = self._persisted(
+                ("adjacency_matrix", s, self._dtype_policy),
+                lambda: (self._overlaps() >= s).astype(self._dtype("binary")),
+            )
+            self._state_dict.put(("adjacency_matrix", s), s_adj_matrix)
 
         if index:
-            return (
-                self._state_dict["adjacency_matrix"][s],
-                self._state_dict["labels"]["nodes"],
-            )
-        return self._state_dict["adjacency_matrix"][s]
+            return s_adj_matrix, self._labels()["nodes"]
+        return s_adj_matrix
 
+    @_instrumented(lambda a: ("edge_adjacency_matrix", a["s"]))
     def edge_adjacency_matrix(self, s=1, index=False):
         """
         Returns the :term:`s-adjacency matrix` for the dual hypergraph.
@@ -1034,22 +1405,52 @@ class Hypergraph:
         This is also the adjacency matrix for the line graph.
         Two edges are s-adjacent if they share at least `s` nodes.
         """
-        if (
-            "edge_adjacency_matrix" not in self._state_dict
-            or s not in self._state_dict["edge_adjacency_matrix"]
-        ):
-            incidence_matrix = self.incidence_matrix()
-            s_adj_matrix = incidence_matrix.T @ incidence_matrix
-            s_adj_matrix.setdiag(0)
-            s_adj_matrix = (s_adj_matrix >= s) * 1
-            self._state_dict["edge_adjacency_matrix"][s] = s_adj_matrix
+        s_adj_matrix = self._state_dict.get(("edge_adjacency_matrix", s))
+        if s_adj_matrix is None:
+            s_adj_matrix = self._persisted(
+                ("edge_adjacency_matrix", s, self._dtype_policy),
+                lambda: (self._overlaps(edges=True) >= s).astype(self._dtype("binary")),
+            )
+            self._state_dict.put(("edge_adjacency_matrix", s), s_adj_matrix)
 
         if index:
-            return (
-                self._state_dict["edge_adjacency_matrix"][s],
-                self._state_dict["labels"]["edges"],
-            )
-        return self._state_dict["edge_adjacency_matrix"][s]
+            return s_adj_matrix, self._labels()["edges"]
+        return s_adj_matrix
+
+    def adjacency_matrices(self, s_values, edges=False, index=False):
+        """
+        The :term:`s-adjacency matrices <s-adjacency matrix>` of the nodes,
+        or of the edges, for several values of s. The overlaps of all
+        pairs are counted once and thresholded for each s.
+
+        Parameters
+        ----------
+        s_values : Iterable of int
+        edges : bool, optional, default=False
+            If True, the s-adjacency matrices of the edges as in
+            :meth:`edge_adjacency_matrix`, otherwise of the nodes as in
+            :meth:`adjacency_matrix`
+        index : bool, optional, default=False
+            If True, also returns the uids of the rows and columns
+
+        Returns
+        -------
+        dict
+            scipy.sparse.csr_matrix keyed by s
+        np.ndarray
+            the node or edge uids of the rows and columns, if index=True
+
+        Examples
+        --------
+            >>> H = Hypergraph({"A": [1, 2, 3], "B": [2, 3], "C": [3]})
+            >>> {s: m.nnz for s, m in H.adjacency_matrices(range(1, 4)).items()}
+            {1: 6, 2: 2, 3: 0}
+        """
+        method = self.edge_adjacency_matrix if edges else self.adjacency_matrix
+        matrices = {s: method(s=s) for s in s_values}
+        if index:
+            return matrices, self._labels()["edges" if edges else "nodes"]
+        return matrices
 
     def auxiliary_matrix(self, s=1, node=True, index=False):
         """
@@ -1158,30 +1559,37 @@ class Hypergraph:
         if inplace:
             h = self
         else:
-            h = Hypergraph()
+            h = Hypergraph(
+                dtype_policy=self._dtype_policy, cache_budget=self._state_dict.budget
+            )
 
         incidence_store = IncidenceStore(
-            pd.DataFrame(incidence_df.index.tolist(), columns=["edges", "nodes"])
+            pd.DataFrame(incidence_df.index.tolist(), columns=["edges", "nodes"]),
+            backend=self._E.incidence_store.backend,
         )
+        storage = self._E.property_store.storage
         incidence_ps = PropertyStore(
-            incidence_df, default_weight=self.incidences.default_weight
+            incidence_df, default_weight=self.incidences.default_weight, storage=storage
         )
         h._E = HypergraphView(incidence_store, 2, incidence_ps)
 
         if edge_ps is None:
             edge_ps = PropertyStore(
-                self.edges.to_dataframe, default_weight=self.edges.default_weight
+                self.edges.to_dataframe,
+                default_weight=self.edges.default_weight,
+                storage=storage,
             )
         h._edges = HypergraphView(incidence_store, 0, edge_ps)
 
         if node_ps is None:
             node_ps = PropertyStore(
-                self.nodes.to_dataframe, default_weight=self.nodes.default_weight
+                self.nodes.to_dataframe,
+                default_weight=self.nodes.default_weight,
+                storage=storage,
             )
         h._nodes = HypergraphView(incidence_store, 1, node_ps)
 
         h._set_default_state()
-        h._dataframe = h.dataframe
         if not inplace:
             h.name = name
         return h
@@ -1204,29 +1612,46 @@ class Hypergraph:
         Returns
         -------
         Hypergraph
-        """
-
-        C = self.dataframe.columns.tolist()
-
-        dsetsystem = (
-            self.dataframe[[C[1], C[0]] + C[2:]]
-            .rename(columns={"edges": "nodes", "nodes": "edges"})
-            .set_index(["edges", "nodes"])
-        )
 
+        Notes
+        -----
+        The dual is built without copying: its incidence store reads the
+        codes and compressed arrays of this hypergraph with the roles of
+        edges and nodes exchanged, and its property stores read the same
+        tables until either hypergraph sets a property. Adjacency matrices
+        and overlap counts already computed for this hypergraph are reused
+        as the edge adjacency matrices and counts of the dual and vice
+        versa.
+        """
+        incidence_store = self._E.incidence_store.transpose()
+        incidence_ps = self._E.property_store._share(swap=True)
         if share_properties:
             edge_ps = self._nodes.property_store
             node_ps = self._edges.property_store
         else:
-            edge_ps = PropertyStore(self.nodes.to_dataframe)
-            node_ps = PropertyStore(self.edges.to_dataframe)
-
-        hdual = self._construct_hyp_from_stores(
-            dsetsystem,
-            edge_ps=edge_ps,
-            node_ps=node_ps,
+            edge_ps = self._nodes.property_store._share()
+            node_ps = self._edges.property_store._share()
+
+        hdual = self._assemble(
+            incidence_store,
+            incidence_ps,
+            edge_ps,
+            node_ps,
             name=name or str(self.name) + "_dual",
+            dtype_policy=self._dtype_policy,
+            cache_budget=self._state_dict.budget,
         )
+        # cached matrices are replaced, never updated, when either
+        # hypergraph changes, so the two can hold the same matrices
+        swapped = {
+            "adjacency_matrix": "edge_adjacency_matrix",
+            "edge_adjacency_matrix": "adjacency_matrix",
+        }
+        for key, value in self._state_dict.items():
+            if isinstance(key, tuple) and key[0] in swapped:
+                hdual._state_dict.put((swapped[key[0]],) + key[1:], value)
+            elif isinstance(key, tuple) and key[0] in ["overlaps", "count_matrix"]:
+                hdual._state_dict.put((key[0], not key[1]), value)
         return hdual
 
     def equivalence_classes(self, edges=True):
@@ -1345,12 +1770,14 @@ class Hypergraph:
 
         ndf = ndf.rename(index=mapper)
         ndf = _agg_rows(ndf, ndf.index, aggregate_edges_by)
-        edge_ps = PropertyStore(ndf)
+        edge_ps = PropertyStore(ndf, storage=self._E.property_store.storage)
 
         df = df.rename(index=mapper, level=0)
         df = _agg_rows(df, ["edges", "nodes"], aggregate_cells_by)
 
-        node_ps = PropertyStore(self.nodes.to_dataframe)
+        node_ps = PropertyStore(
+            self.nodes.to_dataframe, storage=self._E.property_store.storage
+        )
         H = self._construct_hyp_from_stores(
             df, edge_ps=edge_ps, node_ps=node_ps, name=name
         )
@@ -1461,12 +1888,14 @@ class Hypergraph:
 
         ndf = ndf.rename(index=mapper)
         ndf = _agg_rows(ndf, ndf.index, aggregate_nodes_by)
-        node_ps = PropertyStore(ndf)
+        node_ps = PropertyStore(ndf, storage=self._E.property_store.storage)
 
         df = df.rename(index=mapper, level=1)
         df = _agg_rows(df, ["edges", "nodes"], aggregate_cells_by)
 
-        edge_ps = PropertyStore(self.edges.to_dataframe)
+        edge_ps = PropertyStore(
+            self.edges.to_dataframe, storage=self._E.property_store.storage
+        )
         H = self._construct_hyp_from_stores(
             df, edge_ps=edge_ps, node_ps=node_ps, name=name
         )
@@ -1607,10 +2036,13 @@ class Hypergraph:
         Returns
         -------
         Hypergraph
-        """
 
-        keys = list(set(self._state_dict["labels"]["nodes"]).difference(nodes))
-        return self._remove(keys, level=1, name=name, inplace=False)
+        Notes
+        -----
+        The new hypergraph is cut from the incidence codes of this one and
+        keeps the properties :meth:`_remove` would keep, see :meth:`_restrict`.
+        """
+        return self._restrict(nodes, level=1, name=name)
 
     def restrict_to_edges(self, edges, name=None):
         """New hypergraph gotten by restricting to edges
@@ -1622,12 +2054,111 @@ class Hypergraph:
         name : str | int, optional, default=None
             edge identifier
 
+        Returns
+        -------
+        Hypergraph
+
+        Notes
+        -----
+        The new hypergraph is cut from the incidence codes of this one and
+        keeps the properties :meth:`_remove` would keep, see :meth:`_restrict`.
+        """
+        return self._restrict(edges, level=0, name=name)
+
+    @staticmethod
+    def _assemble(
+        incidence_store,
+        incidence_ps,
+        edge_ps,
+        node_ps,
+        name=None,
+        dtype_policy="wide",
+        cache_budget=None,
+        disk_cache=None,
+    ):
+        """
+        New hypergraph over an incidence store and property stores that
+        are already built, without the table checks of the constructor.
+
+        Parameters
+        ----------
+        incidence_store : IncidenceStore
+        incidence_ps, edge_ps, node_ps : PropertyStore
+        name : str | int, optional, default=None
+        dtype_policy : str, optional, default="wide"
+        cache_budget : int, optional, default=None
+        disk_cache : str | pathlib.Path | DiskCache, optional, default=None
+
+        Returns
+        -------
+        Hypergraph
+        """
+        h = Hypergraph(
+            dtype_policy=dtype_policy, cache_budget=cache_budget, disk_cache=disk_cache
+        )
+        h._E = HypergraphView(incidence_store, 2, incidence_ps)
+        h._edges = HypergraphView(incidence_store, 0, edge_ps)
+        h._nodes = HypergraphView(incidence_store, 1, node_ps)
+        h._set_default_state()
+        h.name = name
+        return h
+
+    def _restrict(self, items, level, name=None):
+        """
+        New hypergraph of the incidence pairs whose edge (level 0) or
+        node (level 1) is in items. The incidence store is sliced from the
+        codes and compressed arrays of this hypergraph, so the cost depends
+        on the size of the restriction rather than on what is removed.
+
+        Properties are kept as by :meth:`_remove`: the property store of
+        the restricted level drops the rows of the edges or nodes left out
+        and keeps all others, including rows of uids without incidences;
+        the property store of the other level is kept whole, and the
+        incidence property store keeps the rows of the remaining pairs.
+        Row values are copied or shared until written; the
+        misc_properties dictionaries are shared until a property of the
+        item is set in either hypergraph.
+
+        Parameters
+        ----------
+        items : Iterable
+            edge or node uids to restrict to
+        level : int
+            0 for edges, 1 for nodes
+        name : str | int, optional, default=None
+
         Returns
         -------
         Hypergraph
         """
-        keys = list(set(self._state_dict["labels"]["edges"]).difference(edges))
-        return self._remove(keys, level=0, name=name, inplace=False)
+        store = self._E.incidence_store.subset(level, items)
+        edge_index, node_index = store.index(0), store.index(1)
+        edge_codes, node_codes = store.codes
+        pairs = pd.MultiIndex.from_arrays(
+            [edge_index.take(edge_codes), node_index.take(node_codes)]
+        )
+
+        ### uids of the restricted level left out of the restriction
+        index = self._E.incidence_store.index(level)
+        removed = index[store.index(level).get_indexer(index) < 0]
+        property_stores = []
+        for view in [self.edges, self.nodes]:
+            ps = view.property_store
+            if view.level == level:
+                kept = ps._data.index
+                ps = ps._subset(kept[removed.get_indexer(kept) < 0])
+            else:
+                ps = ps._share()
+            property_stores.append(ps)
+
+        return self._assemble(
+            store,
+            self.incidences.property_store._subset(pairs),
+            *property_stores,
+            name=name,
+            dtype_policy=self._dtype_policy,
+            cache_budget=self._state_dict.budget,
+        )
 
     def add_edge(self, edge_uid, inplace=True, **attr):
         """
@@ -1784,6 +2315,11 @@ class Hypergraph:
         -------
         Hypergraph
             Hypergraph with incidences added.
+
+        Notes
+        -----
+        With inplace=True, new edges and nodes are added after the existing
+        ones in the labels and matrices, see :meth:`incidence_matrix`.
         """
         newincidences = list()
         for pr in incidences:
@@ -1810,17 +2346,158 @@ class Hypergraph:
         -------
         Hypergraph
         """
+        if inplace and self._batch is not None:
+            self._batch.append(("add", level, list(items)))
+            return self
+
         df = self.incidences._property_store
         ep = self.edges._property_store
         ndp = self.nodes._property_store
-        hv = [ep, ndp, df][level]
-        for item in items:
-            uid = item[0]
-            data = item[1]
-            hv.set_properties(uid, data)
-        return self._construct_hyp_from_stores(
-            df.properties, edge_ps=ep, node_ps=ndp, name=self.name, inplace=inplace
-        )
+        if not inplace:
+            hv = [ep, ndp, df][level]
+            hv.set_properties_bulk(
+                [item[0] for item in items], [item[1] for item in items]
+            )
+            return self._construct_hyp_from_stores(
+                df.properties, edge_ps=ep, node_ps=ndp, name=self.name
+            )
+
+        ### incremental path: append the new pairs to the incidence store
+        ### and invalidate only the state they affect
+        affected = self._add_inplace(items, level)
+        if affected is None:
+            self._invalidate_state(properties=["edges", "nodes"][level])
+        else:
+            self._invalidate_state(*affected)
+        return self
+
+    def _add_inplace(self, items, level):
+        """
+        Sets the properties of the items and appends new incidence pairs
+        to the incidence store without invalidating any state.
+
+        Parameters
+        ----------
+        items : list[tuple[str | int, dict[str, Any]]]
+        level : int
+            0 for edges, 1 for nodes, 2 for incidence pairs
+
+        Returns
+        -------
+        tuple of sets | None
+            edges and nodes affected by new incidence pairs, None if
+            only properties were set
+        """
+        hv = [
+            self.edges._property_store,
+            self.nodes._property_store,
+            self.incidences._property_store,
+        ][level]
+        hv.set_properties_bulk([item[0] for item in items], [item[1] for item in items])
+        if level != 2 or len(items) == 0:
+            return None
+        edges, nodes = zip(*[item[0] for item in items])
+        added = self._E.incidence_store.add_pairs(list(edges), list(nodes))
+        return self._affected(added)
+
+    def begin(self):
+        """
+        Starts a batch of edits. Until :meth:`commit` is called, in-place
+        adds, removes and property updates made through the add_* and
+        remove_* methods are buffered instead of applied. Reads see the
+        hypergraph as it was before the batch.
+
+        Properties set directly on the views, as in
+        ``H.edges[uid].color = "red"`` or ``H.nodes.set_property``, are not
+        buffered: they are written at once and :meth:`rollback` does not
+        undo them.
+
+        See Also
+        --------
+        batch, commit, rollback
+        """
+        if self._batch is not None:
+            raise HyperNetXError("A batch of edits is already in progress.")
+        self._batch = []
+
+    def commit(self):
+        """
+        Applies the edits buffered since :meth:`begin`. Consecutive edits of
+        the same kind and level are merged and applied to the stores together,
+        and the state is invalidated once for the whole batch.
+
+        If applying an edit raises, the edits applied before it are kept,
+        all cached state is dropped and the exception is raised.
+
+        Returns
+        -------
+        Hypergraph
+        """
+        if self._batch is None:
+            raise HyperNetXError("No batch of edits is in progress.")
+        ops, self._batch = self._batch, None
+
+        edges, nodes, properties = set(), set(), set()
+        structural = False
+        completed = False
+        try:
+            for (kind, level), group in groupby(ops, key=lambda op: op[:2]):
+                uids = [uid for op in group for uid in op[2]]
+                if kind == "add":
+                    affected = self._add_inplace(uids, level)
+                else:
+                    affected = self._remove_items_inplace(uids, level)
+                if affected is None:
+                    properties.add(["edges", "nodes"][level])
+                else:
+                    structural = True
+                    edges.update(affected[0])
+                    nodes.update(affected[1])
+            completed = True
+        finally:
+            if not completed:
+                ### the stores may be partly updated
+                self._set_default_state()
+            elif structural:
+                self._invalidate_state(edges, nodes)
+            else:
+                for key in properties:
+                    self._invalidate_state(properties=key)
+        return self
+
+    def rollback(self):
+        """
+        Discards the edits buffered since :meth:`begin`. Properties set
+        directly on the views during the batch are not restored, see
+        :meth:`begin`.
+        """
+        self._batch = None
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager buffering in-place edits and committing them
+        together on exit. If an exception is raised inside the block the
+        buffered edits are discarded.
+
+        Example
+        -------
+
+            >>> H = Hypergraph({'E1': ['a', 'b']})
+            >>> with H.batch():
+            ...     H.add_incidence('E2', 'c', weight=2)
+            ...     H.add_incidences_from([('E2', 'a'), ('E3', 'b')])
+            ...     H.remove_edges('E1')
+            >>> H.incidence_dict
+            {'E2': ['c', 'a'], 'E3': ['b']}
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
 
     #### This should follow behavior of restrictions
     def remove_edges(self, edge_uids, name=None, inplace=True):
@@ -1927,22 +2604,120 @@ class Hypergraph:
         affect the user data attached to the edge and node in the pair.
         """
         if inplace:
-            df = self.incidences.properties
-            ep = self.edges.property_store
-            ndp = self.nodes.property_store
-        else:
-            df = self.incidences.to_dataframe
-            ep = self.edges.property_store.copy(deep=True)
-            ndp = self.nodes.property_store.copy(deep=True)
+            if self._batch is not None:
+                self._batch.append(("remove", level, list(uids)))
+                return self
+            self._invalidate_state(*self._remove_items_inplace(uids, level))
+            return self
+
+        df = self.incidences.to_dataframe
+        ep = self.edges.property_store.copy(deep=True)
+        ndp = self.nodes.property_store.copy(deep=True)
         if level in [0, 1]:
             hv = [ep, ndp][level]
             df = df.drop(labels=uids, level=level, errors="ignore")
-            hv._data = hv._data.drop(labels=uids, errors="ignore")
+            hv._drop(uids)
         else:
             df = df.drop(labels=uids, errors="ignore")
-        return self._construct_hyp_from_stores(
-            df, edge_ps=ep, node_ps=ndp, name=name, inplace=inplace
-        )
+        return self._construct_hyp_from_stores(df, edge_ps=ep, node_ps=ndp, name=name)
+
+    def _remove_items_inplace(self, uids, level):
+        """
+        Deletes items from the stores of this Hypergraph without rebuilding
+        them or invalidating any state.
+
+        Parameters
+        ----------
+        uids : list
+            list of uids from edges, nodes, or incidence pairs(listed as tuples)
+        level : int
+            0 for edges, 1 for nodes, 2 for incidence pairs
+
+        Returns
+        -------
+        tuple of sets
+            edges and nodes affected by the removed incidence pairs
+        """
+        incidence_ps = self.incidences.property_store
+        if level in [0, 1]:
+            hv = [self.edges.property_store, self.nodes.property_store][level]
+            hv._drop(uids)
+            incidence_ps._drop(uids, level=level)
+        else:
+            incidence_ps._drop(uids)
+
+        incidence_store = self._E.incidence_store
+        if level in [0, 1]:
+            known = [uid for uid in uids if uid in [self._edges, self._nodes][level]]
+            pairs = [
+                (uid, nbr) if level == 0 else (nbr, uid)
+                for uid in known
+                for nbr in incidence_store.neighbors(level, uid)
+            ]
+        else:
+            ### as with dataframe.drop, a single label removes all pairs of that edge
+            pairs = [uid for uid in uids if isinstance(uid, tuple) and len(uid) == 2]
+            pairs += [
+                (uid, nbr)
+                for uid in uids
+                if not isinstance(uid, tuple) and uid in self._edges
+                for nbr in incidence_store.neighbors(0, uid)
+            ]
+        pairs = pd.DataFrame(pairs, columns=["edges", "nodes"])
+        ### affected items are collected before the pairs are removed
+        affected = self._affected(pairs)
+        if level in [0, 1]:
+            incidence_store.remove_items(level, uids)
+        else:
+            incidence_store.remove_items(2, pairs.itertuples(index=False, name=None))
+        return affected
+
+    def _affected(self, pairs):
+        """
+        Edges and nodes whose s-neighborhoods change when the incidence
+        pairs are added or removed: the edges and nodes of the pairs,
+        the nodes of those edges, and the edges containing those nodes.
+
+        Parameters
+        ----------
+        pairs : pd.DataFrame
+            incidence pairs with columns "edges" and "nodes"
+
+        Returns
+        -------
+        tuple of sets
+            affected edges, affected nodes
+        """
+        store = self._E.incidence_store
+        edges = set(pairs["edges"])
+        nodes = set(pairs["nodes"])
+        affected_nodes = set(nodes)
+        for edge in edges:
+            affected_nodes.update(store.neighbors(0, edge))
+        affected_edges = set(edges)
+        for node in nodes:
+            affected_edges.update(store.neighbors(1, node))
+        return affected_edges, affected_nodes
+
+    def _invalidate_state(self, edges=None, nodes=None, properties=None):
+        """
+        Invalidates the state entries affected by a change.
+
+        Parameters
+        ----------
+        edges, nodes : set, optional, default=None
+            Edges and nodes whose incidences changed. If given, the codes,
+            labels, matrices, linegraphs and statistics are recomputed on next
+            use and cached s-neighbors are dropped only for these items.
+        properties : str, optional, default=None
+            "edges" or "nodes"; drops only the entries built from their
+            properties, used when edge or node properties change.
+        """
+        if edges is None and nodes is None:
+            if properties is not None:
+                self._state_dict.invalidate(properties)
+            return
+        self._state_dict.invalidate("incidences", edges=edges, nodes=nodes)
 
     def toplexes(self, return_hyp=False):
         """
@@ -2510,14 +3285,218 @@ class Hypergraph:
         **kwargs,
     ):
         """
-        Accepts numpy.matrix or scipy.sparse matrix
+        Accepts numpy.matrix or scipy.sparse matrix, see :meth:`from_scipy_sparse`
+        """
+        return cls.from_scipy_sparse(M, name=name, **kwargs)
+
+    @classmethod
+    def from_scipy_sparse(
+        cls,
+        M,
+        edge_labels=None,
+        node_labels=None,
+        name=None,
+        **kwargs,
+    ):
+        """
+        Create a hypergraph from an incidence matrix with rows corresponding
+        to nodes and columns to edges. Every stored entry is an incidence
+        pair with the entry as its weight.
+
+        Parameters
+        ----------
+        M : scipy.sparse matrix or array-like, 2 dimensions
+        edge_labels : array-like, optional, default=None
+            uids of the columns; if None the column indices are used
+        node_labels : array-like, optional, default=None
+            uids of the rows; if None the row indices are used
+        name : hashable, optional, default=None
+        **kwargs
+            passed to :meth:`from_coo`
+
+        Returns
+        -------
+        Hypergraph
         """
         mat = coo_matrix(M)
-        edges = mat.col
-        nodes = mat.row
-        weights = mat.data
-        df = pd.DataFrame({"edges": edges, "nodes": nodes, "weights": weights})
-        return Hypergraph(df, cell_weight_col="weights", name=name, **kwargs)
+        return cls.from_coo(
+            mat.col,
+            mat.row,
+            weights=mat.data,
+            edge_labels=edge_labels,
+            node_labels=node_labels,
+            name=name,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_coo(
+        cls,
+        edge_idx,
+        node_idx,
+        weights=None,
+        edge_labels=None,
+        node_labels=None,
+        name=None,
+        default_cell_weight=1,
+        aggregate_by="first",
+        edge_properties=None,
+        node_properties=None,
+        default_edge_weight=1,
+        default_node_weight=1,
+        incidence_backend="pandas",
+        property_storage="dict",
+        properties=None,
+        misc_properties_col=None,
+        weight_prop_col="weight",
+        default_weight=1,
+        misc_edge_properties_col=None,
+        edge_weight_prop_col="weight",
+        misc_node_properties_col=None,
+        node_weight_prop_col="weight",
+        dtype_policy="wide",
+        cache_budget=None,
+        disk_cache=None,
+        **kwargs,
+    ):
+        """
+        Create a hypergraph from integer indices of the edge and node of
+        each incidence pair. The index arrays are adopted as the codes of
+        the incidence store, so no pair or uid is handled in python.
+
+        Parameters
+        ----------
+        edge_idx, node_idx : array-like of int
+            edge and node index of each incidence pair
+        weights : array-like, optional, default=None
+            weight of each incidence pair
+        edge_labels : array-like, optional, default=None
+            uids of the edges by index; if None the indices are the uids
+        node_labels : array-like, optional, default=None
+            uids of the nodes by index; if None the indices are the uids
+        name : hashable, optional, default=None
+        default_cell_weight : int | float, optional, default=1
+            weight of the pairs if weights is None
+        aggregate_by : str | dict, optional, default="first"
+            aggregation method for the weights of repeated pairs, see
+            :class:`Hypergraph`
+        edge_properties, node_properties : pd.DataFrame | dict, optional, default=None
+            properties keyed by uid, as for :class:`Hypergraph`
+        default_edge_weight, default_node_weight : int | float, optional, default=1
+        incidence_backend : str, optional, default="pandas"
+        property_storage : str, optional, default="dict"
+        properties, misc_properties_col, weight_prop_col, default_weight : optional
+        misc_edge_properties_col, edge_weight_prop_col : optional
+        misc_node_properties_col, node_weight_prop_col : optional
+        dtype_policy, cache_budget, disk_cache : optional
+            as for :class:`Hypergraph`
+        **kwargs
+            other arguments of :class:`Hypergraph` do not apply to an
+            incidence matrix and raise a TypeError
+
+        Returns
+        -------
+        Hypergraph
+
+        Notes
+        -----
+        Labels without incidences do not become edges or nodes. Edges and
+        nodes keep the order of their labels in the incidence matrix.
+
+            >>> import numpy as np
+            >>> H = Hypergraph.from_coo(
+            ...     np.array([0, 0, 1]), np.array([0, 1, 1]),
+            ...     edge_labels=["A", "B"], node_labels=["x", "y", "z"],
+            ... )
+            >>> H.incidence_dict
+            {'A': ['x', 'y'], 'B': ['y']}
+        """
+        if kwargs:
+            raise TypeError(
+                f"from_coo() got unexpected keyword arguments {sorted(kwargs)}"
+            )
+        codes, lookups = [], []
+        for idx, labels, kind in [
+            (edge_idx, edge_labels, "edge"),
+            (node_idx, node_labels, "node"),
+        ]:
+            idx = np.asarray(idx)
+            if idx.ndim != 1 or (len(idx) > 0 and idx.dtype.kind not in "iu"):
+                raise HyperNetXError(
+                    f"{kind}_idx must be a 1 dimensional integer array"
+                )
+            size = int(idx.max()) + 1 if len(idx) > 0 else 0
+            if labels is None:
+                labels = pd.RangeIndex(size)
+            else:
+                labels = pd.Index(labels, tupleize_cols=False)
+            if len(idx) > 0 and (idx.min() < 0 or size > len(labels)):
+                raise HyperNetXError(f"{kind}_idx out of range of the {kind} labels")
+            codes.append(idx.astype(np.int32, copy=False))
+            lookups.append(labels)
+        if len(codes[0]) != len(codes[1]):
+            raise HyperNetXError("edge_idx and node_idx must have the same length")
+
+        cells = None
+        if weights is not None:
+            cells = pd.DataFrame({"weight": np.asarray(weights)})
+            if len(cells) != len(codes[0]):
+                raise HyperNetXError("weights must have one entry per incidence pair")
+
+        tables = []
+        for table, level, weight, weight_col, misc_col in [
+            (
+                edge_properties,
+                0,
+                default_edge_weight,
+                edge_weight_prop_col,
+                misc_edge_properties_col,
+            ),
+            (
+                node_properties,
+                1,
+                default_node_weight,
+                node_weight_prop_col,
+                misc_node_properties_col,
+            ),
+            (properties, 0, default_weight, weight_prop_col, misc_properties_col),
+        ]:
+            if table is not None:
+                factory = (
+                    dict_factory_method
+                    if isinstance(table, dict)
+                    else dataframe_factory_method
+                )
+                table = factory(
+                    table,
+                    level,
+                    weight_col=weight_col,
+                    default_weight=weight,
+                    misc_properties_col=misc_col,
+                )
+            tables.append(table)
+
+        return cls._from_codes(
+            codes[0],
+            codes[1],
+            lookups[0],
+            lookups[1],
+            cell_properties=cells,
+            edge_properties=tables[0],
+            node_properties=tables[1],
+            default_cell_weight=default_cell_weight,
+            default_edge_weight=default_edge_weight,
+            default_node_weight=default_node_weight,
+            aggregate_by=aggregate_by,
+            name=name,
+            incidence_backend=incidence_backend,
+            property_storage=property_storage,
+            properties=tables[2],
+            default_weight=default_weight,
+            dtype_policy=dtype_policy,
+            cache_budget=cache_budget,
+            disk_cache=disk_cache,
+        )
 
     @classmethod
     def from_numpy_array(
@@ -2593,8 +3572,11 @@ class Hypergraph:
         else:
             edgenames = np.array([f"e{jdx}" for jdx in range(M.shape[1])])
 
-        df = pd.DataFrame(M, columns=edgenames, index=nodenames)
-        return Hypergraph.from_incidence_dataframe(df, name=name)
+        if M.dtype.kind == "f":
+            M = np.where(np.isnan(M), 0, M)
+        return cls.from_scipy_sparse(
+            M * 1, edge_labels=edgenames, node_labels=nodenames, name=name
+        )
 
     @classmethod
     def from_incidence_dataframe(
@@ -2665,6 +3647,509 @@ class Hypergraph:
         else:
             return Hypergraph(dfnew, cell_weight_col="weight", name=name, **kwargs)
 
+    @classmethod
+    def _from_codes(
+        cls,
+        edge_codes,
+        node_codes,
+        edge_index,
+        node_index,
+        cell_properties=None,
+        edge_properties=None,
+        node_properties=None,
+        default_cell_weight=1,
+        default_edge_weight=1,
+        default_node_weight=1,
+        aggregate_by="first",
+        name=None,
+        incidence_backend="pandas",
+        property_storage="dict",
+        properties=None,
+        default_weight=1,
+        dtype_policy="wide",
+        cache_budget=None,
+        disk_cache=None,
+    ):
+        """
+        Hypergraph built directly from integer coded incidence pairs, for
+        readers that code uids as they go. No dataframe of uids is built
+        for the "csr" backend.
+
+        Parameters
+        ----------
+        edge_codes, node_codes : array-like of int
+            codes of the edge and node of each incidence pair; a pair
+            given more than once is aggregated by aggregate_by
+        edge_index, node_index : pandas.Index
+            uids of the codes; uids without incidences are dropped
+        cell_properties : pandas.DataFrame, optional, default=None
+            properties of the pairs in row order; "weight" and
+            "misc_properties" columns are used as such
+        edge_properties, node_properties : pandas.DataFrame, optional, default=None
+            property tables as returned by dataframe_factory_method
+        default_cell_weight, default_edge_weight, default_node_weight : int | float, default=1
+        aggregate_by : str | dict, optional, default="first"
+            aggregation method for the properties of repeated pairs, see
+            :class:`Hypergraph`
+        name : str | int, optional, default=None
+        incidence_backend : str, optional, default="pandas"
+        property_storage : str, optional, default="dict"
+        properties : pandas.DataFrame, optional, default=None
+            property table shared by the edges and nodes, as for
+            :class:`Hypergraph`; edge_properties and node_properties are
+            ignored if given
+        default_weight : int | float, optional, default=1
+            default weight of the shared properties
+        dtype_policy : str, optional, default="wide"
+        cache_budget : int, optional, default=None
+        disk_cache : str | pathlib.Path | DiskCache, optional, default=None
+
+        Returns
+        -------
+        Hypergraph
+        """
+        edge_codes, node_codes, cell_properties = _dedupe_pairs(
+            np.asarray(edge_codes),
+            np.asarray(node_codes),
+            cell_properties,
+            aggregate_by,
+        )
+        edge_codes, edge_index = _slice_codes(edge_codes, edge_index)
+        node_codes, node_index = _slice_codes(node_codes, node_index)
+
+        store = IncidenceStore._derived(incidence_backend, True)
+        store._set_codes(edge_codes, node_codes, edge_index, node_index)
+        if incidence_backend == "pandas":
+            store._data = store._frame()
+
+        columns = {}
+        if cell_properties is not None:
+            columns = {k: v.to_numpy() for k, v in cell_properties.items()}
+        n = len(edge_codes)
+        weight = columns.pop("weight", None)
+        if weight is None:
+            weight = np.full(n, default_cell_weight)
+        else:
+            weight = pd.Series(weight).fillna(default_cell_weight).to_numpy()
+        misc = columns.pop("misc_properties", None)
+        if misc is not None:
+            columns["misc_properties"] = [mkdict(x) for x in misc]
+        elif property_storage != "columnar":
+            # columnar storage keeps no misc_properties column to fill
+            columns["misc_properties"] = [{} for _ in range(n)]
+        data = pd.DataFrame(
+            {"weight": weight, **columns},
+            index=pd.MultiIndex(
+                levels=[edge_index, node_index],
+                codes=[edge_codes, node_codes],
+                names=["edges", "nodes"],
+                verify_integrity=False,
+            ),
+        )
+
+        if properties is not None:
+            ### one store for the edges and nodes, as in the constructor
+            shared = PropertyStore(
+                properties, default_weight=default_weight, storage=property_storage
+            )
+            stores = [shared, shared]
+        else:
+            stores = [
+                PropertyStore(df, default_weight=weight, storage=property_storage)
+                for df, weight in [
+                    (edge_properties, default_edge_weight),
+                    (node_properties, default_node_weight),
+                ]
+            ]
+        return cls._assemble(
+            store,
+            PropertyStore(
+                data, default_weight=default_cell_weight, storage=property_storage
+            ),
+            *stores,
+            name=name,
+            dtype_policy=dtype_policy,
+            cache_budget=cache_budget,
+            disk_cache=disk_cache,
+        )
+
+    @classmethod
+    def from_parquet(
+        cls,
+        path,
+        edge_col="edges",
+        node_col="nodes",
+        columns=None,
+        edges=None,
+        nodes=None,
+        batch_size=None,
+        edge_properties=None,
+        node_properties=None,
+        uid_col="uid",
+        cell_weight_col="weight",
+        default_cell_weight=1,
+        default_edge_weight=1,
+        default_node_weight=1,
+        name=None,
+        incidence_backend="csr",
+        property_storage="dict",
+    ):
+        """
+        Reads a hypergraph from Parquet files with pyarrow.
+
+        The incidence table is scanned in record batches. Edge and node
+        columns are read dictionary encoded, so each batch only codes the
+        distinct uids of its dictionary and the row indices become the
+        incidence codes; the uid columns are never materialized as
+        python objects.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path
+            Parquet file or dataset directory of the incidence table, or a
+            directory written by :meth:`to_parquet`
+        edge_col, node_col : str, optional, default="edges", "nodes"
+            columns of the incidence table holding edge and node uids
+        columns : list of str, optional, default=None
+            property columns to read from each table; the uid columns are
+            always read. If None all columns are read.
+        edges, nodes : Iterable, optional, default=None
+            If given, only incidences of these edges and nodes are read.
+            The filters are pushed down to the scan, so row groups whose
+            statistics exclude them are skipped.
+        batch_size : int, optional, default=None
+            maximum number of rows per record batch, pyarrow's default if None
+        edge_properties, node_properties : str | pathlib.Path, optional, default=None
+            Parquet files of edge and node properties with uids in ``uid_col``;
+            for a directory written by :meth:`to_parquet` its edge and node
+            tables are used
+        uid_col : str, optional, default="uid"
+        cell_weight_col : str, optional, default="weight"
+            column of the incidence table used as incidence weight
+        default_cell_weight, default_edge_weight, default_node_weight : int | float, default=1
+        name : str | int, optional, default=None
+        incidence_backend : str, optional, default="csr"
+            see :class:`Hypergraph`; the default keeps only the codes
+        property_storage : str, optional, default="dict"
+
+        Returns
+        -------
+        Hypergraph
+
+        See Also
+        --------
+        to_parquet
+        """
+        pa, pc, ds = _import_pyarrow()
+        path = Path(path)
+        if (path / "incidences.parquet").is_file():
+            if edge_properties is None and (path / "edges.parquet").is_file():
+                edge_properties = path / "edges.parquet"
+            if node_properties is None and (path / "nodes.parquet").is_file():
+                node_properties = path / "nodes.parquet"
+            path = path / "incidences.parquet"
+
+        uid_cols = [edge_col, node_col]
+        dataset = ds.dataset(
+            path,
+            format=ds.ParquetFileFormat(read_options={"dictionary_columns": uid_cols}),
+        )
+        projection = [
+            c
+            for c in dataset.schema.names
+            if c not in uid_cols and (columns is None or c in columns)
+        ]
+        predicate = ds.field(edge_col).is_valid() & ds.field(node_col).is_valid()
+        for col, uids in zip(uid_cols, [edges, nodes]):
+            if uids is not None:
+                predicate &= ds.field(col).isin(list(uids))
+
+        interners = [_Interner(), _Interner()]
+        mappings = [[None, None], [None, None]]
+        codes, frames = [[], []], []
+        scan = {} if batch_size is None else {"batch_size": batch_size}
+        for batch in dataset.to_batches(
+            columns=uid_cols + projection, filter=predicate, **scan
+        ):
+            for i, col in enumerate(uid_cols):
+                values = batch.column(col)
+                if not pa.types.is_dictionary(values.type):
+                    values = pc.dictionary_encode(values)
+                dictionary, mapping = mappings[i]
+                if dictionary is None or not dictionary.equals(values.dictionary):
+                    mapping = interners[i](values.dictionary.to_pylist())
+                    mappings[i] = [values.dictionary, mapping]
+                codes[i].append(mapping[values.indices.to_numpy()])
+            frames.append(batch.select(projection).to_pandas())
+
+        cells = pd.concat(frames, ignore_index=True) if frames else None
+        if cells is not None and cell_weight_col != "weight":
+            cells = cells.drop(columns="weight", errors="ignore")
+            cells = cells.rename(columns={cell_weight_col: "weight"})
+        edge_index, node_index = interners[0].index, interners[1].index
+
+        tables = []
+        for level, (table, uids, default_weight) in enumerate(
+            [
+                (edge_properties, edge_index, default_edge_weight),
+                (node_properties, node_index, default_node_weight),
+            ]
+        ):
+            if table is not None:
+                table = ds.dataset(table, format="parquet")
+                names = [
+                    c
+                    for c in table.schema.names
+                    if c == uid_col or columns is None or c in columns
+                ]
+                table = dataframe_factory_method(
+                    table.to_table(
+                        columns=names,
+                        filter=ds.field(uid_col).isin(pa.array(uids.tolist())),
+                    ).to_pandas(),
+                    level,
+                    uid_cols=[uid_col],
+                    default_weight=default_weight,
+                )
+            tables.append(table)
+
+        return cls._from_codes(
+            np.concatenate(codes[0]) if codes[0] else np.array([], dtype=np.int32),
+            np.concatenate(codes[1]) if codes[1] else np.array([], dtype=np.int32),
+            edge_index,
+            node_index,
+            cell_properties=cells,
+            edge_properties=tables[0],
+            node_properties=tables[1],
+            default_cell_weight=default_cell_weight,
+            default_edge_weight=default_edge_weight,
+            default_node_weight=default_node_weight,
+            name=name,
+            incidence_backend=incidence_backend,
+            property_storage=property_storage,
+        )
+
+    def to_parquet(self, path, row_group_size=None):
+        """
+        Writes the hypergraph to a directory of Parquet files with pyarrow:
+        ``incidences.parquet`` with "edges" and "nodes" columns followed by
+        the incidence properties, and ``edges.parquet`` and ``nodes.parquet``
+        with a "uid" column followed by the edge and node properties.
+
+        Uid columns are dictionary encoded with the lookup tables of the
+        incidence store as dictionaries, so the stored indices are the
+        incidence codes. misc_properties are written as JSON strings.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path
+            directory to write to; created if needed
+        row_group_size : int, optional, default=None
+            maximum number of rows per row group, pyarrow's default if None
+
+        See Also
+        --------
+        from_parquet
+        """
+        pa, _, _ = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        store = self._E.incidence_store
+        lookups = [store.index(0), store.index(1)]
+        tables = {
+            "incidences": (self._E, ["edges", "nodes"], [0, 1]),
+            "edges": (self._edges, ["uid"], [0]),
+            "nodes": (self._nodes, ["uid"], [1]),
+        }
+        for file, (view, names, levels) in tables.items():
+            df = view.property_store.properties
+            table = pa.Table.from_pandas(
+                df.assign(misc_properties=df["misc_properties"].map(_to_json)),
+                preserve_index=False,
+            )
+            for i, (col, level) in enumerate(zip(names, levels)):
+                uids = df.index.get_level_values(i)
+                table = table.add_column(
+                    i, col, _dictionary_array(pa, uids, lookups[level])
+                )
+            pq.write_table(
+                table, path / f"{file}.parquet", row_group_size=row_group_size
+            )
+
+    @classmethod
+    def from_dataframe_chunks(
+        cls,
+        chunks,
+        edge_col=0,
+        node_col=1,
+        cell_weight_col="weight",
+        default_cell_weight=1,
+        misc_cell_properties_col=None,
+        aggregate_by="first",
+        name=None,
+        incidence_backend="csr",
+        property_storage="dict",
+    ):
+        """
+        Builds a hypergraph from an iterable of dataframes of incidence
+        pairs, such as the chunks of a large file, without holding all the
+        rows in memory.
+
+        The edge and node uids of each chunk are coded against tables that
+        grow as new uids appear, so only the integer codes of the pairs and
+        their property columns are kept. Repeated pairs are aggregated as
+        the chunks arrive: "first", "last", "sum", "min", "max" and the
+        merging of misc properties combine over chunks directly, "count"
+        and "mean" are kept as partial sums and counts. Other methods keep
+        every row until the end.
+
+        Parameters
+        ----------
+        chunks : iterable of pandas.DataFrame
+            dataframes with the same columns
+        edge_col, node_col : str | int, optional, default=0, 1
+            column name (or index) of the edge and node uids
+        cell_weight_col : str | int, optional, default="weight"
+            column used for incidence weights if present
+        default_cell_weight : int | float, optional, default=1
+            weight of pairs without one
+        misc_cell_properties_col : str | int, optional, default=None
+            column of dictionaries (or their string form) of properties
+        aggregate_by : str | dict, optional, default="first"
+            aggregation method for the properties of repeated pairs, see
+            :class:`Hypergraph`
+        name : str | int, optional, default=None
+        incidence_backend : str, optional, default="csr"
+            see :class:`Hypergraph`; the default keeps only the codes
+        property_storage : str, optional, default="dict"
+
+        Returns
+        -------
+        Hypergraph
+
+        See Also
+        --------
+        from_csv_chunks
+        """
+        interners = [_Interner(), _Interner()]
+        aggregator = _ChunkAggregator(aggregate_by)
+        for chunk in chunks:
+            uid_cols = [
+                c if c in chunk.columns else chunk.columns[c]
+                for c in [edge_col, node_col]
+            ]
+            codes = []
+            for interner, col in zip(interners, uid_cols):
+                local, uniques = pd.factorize(chunk[col])
+                chunk_codes = np.full(len(local), -1, dtype=np.int32)
+                present = local >= 0
+                chunk_codes[present] = interner(uniques)[local[present]]
+                codes.append(chunk_codes)
+            valid = (codes[0] >= 0) & (codes[1] >= 0)
+
+            cells = chunk.drop(columns=uid_cols).rename(
+                columns={
+                    cell_weight_col: "weight",
+                    misc_cell_properties_col: "misc_properties",
+                }
+            )
+            if "weight" in cells.columns:
+                cells["weight"] = cells["weight"].fillna(default_cell_weight)
+            cells = cells[valid].reset_index(drop=True)
+            aggregator.add(codes[0][valid], codes[1][valid], cells)
+
+        edge_codes, node_codes, cells = aggregator.result()
+        return cls._from_codes(
+            edge_codes,
+            node_codes,
+            interners[0].index,
+            interners[1].index,
+            cell_properties=cells,
+            default_cell_weight=default_cell_weight,
+            aggregate_by=aggregate_by,
+            name=name,
+            incidence_backend=incidence_backend,
+            property_storage=property_storage,
+        )
+
+    @classmethod
+    def from_csv_chunks(
+        cls,
+        path,
+        chunksize=1_000_000,
+        edge_col=0,
+        node_col=1,
+        cell_weight_col="weight",
+        default_cell_weight=1,
+        misc_cell_properties_col=None,
+        aggregate_by="first",
+        name=None,
+        incidence_backend="csr",
+        property_storage="dict",
+        **kwargs,
+    ):
+        """
+        Reads a hypergraph from a large CSV/TSV file of incidence pairs
+        without holding the table in memory.
+
+        The file is read ``chunksize`` rows at a time and passed to
+        :meth:`from_dataframe_chunks`, which codes the uids and aggregates
+        repeated pairs chunk by chunk.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path | file-like
+            passed to pandas.read_csv
+        chunksize : int, optional, default=1_000_000
+            number of rows read at a time
+        edge_col, node_col : str | int, optional, default=0, 1
+            column name (or index) of the edge and node uids
+        cell_weight_col : str | int, optional, default="weight"
+            column used for incidence weights if present
+        default_cell_weight : int | float, optional, default=1
+            weight of pairs without one
+        misc_cell_properties_col : str | int, optional, default=None
+            column of dictionaries (or their string form) of properties
+        aggregate_by : str | dict, optional, default="first"
+            aggregation method for the properties of repeated pairs, see
+            :class:`Hypergraph`
+        name : str | int, optional, default=None
+        incidence_backend : str, optional, default="csr"
+            see :class:`Hypergraph`; the default keeps only the codes
+        property_storage : str, optional, default="dict"
+        **kwargs
+            passed to pandas.read_csv, e.g. ``sep="\\t"`` for TSV files
+            or ``usecols`` to read only some property columns
+
+        Returns
+        -------
+        Hypergraph
+
+        Examples
+        --------
+            >>> import io
+            >>> csv = io.StringIO("e,n,w\\nA,1,1\\nA,2,1\\nB,1,2\\nA,1,3\\n")
+            >>> H = Hypergraph.from_csv_chunks(
+            ...     csv, chunksize=2, cell_weight_col="w", aggregate_by={"weight": "sum"}
+            ... )
+            >>> H.incidence_dict, H.incidences[("A", 1)].weight
+            ({'A': [1, 2], 'B': [1]}, 4)
+        """
+        return cls.from_dataframe_chunks(
+            pd.read_csv(path, chunksize=chunksize, **kwargs),
+            edge_col=edge_col,
+            node_col=node_col,
+            cell_weight_col=cell_weight_col,
+            default_cell_weight=default_cell_weight,
+            misc_cell_properties_col=misc_cell_properties_col,
+            aggregate_by=aggregate_by,
+            name=name,
+            incidence_backend=incidence_backend,
+            property_storage=property_storage,
+        )
+
     def __add__(self, other):
         """
         Concatenate incidences from two hypergraphs, removing duplicates and
@@ -2723,8 +4208,8 @@ class Hypergraph:
 
         return self._construct_hyp_from_stores(
             incidence_df,
-            edge_ps=PropertyStore(edges_data),
-            node_ps=PropertyStore(nodes_data),
+            edge_ps=PropertyStore(edges_data, storage=self._E.property_store.storage),
+            node_ps=PropertyStore(nodes_data, storage=self._E.property_store.storage),
             name=name,
         )
 
@@ -2808,3 +4293,36 @@ def _agg_rows(df, groupby, rule_dict=None):
         if k in default_agg:
             default_agg[k] = v
     return df.reset_index().groupby(groupby).agg(default_agg)
+
+
+def _import_pyarrow():
+    """pyarrow and its compute and dataset modules, which are optional"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+    except ModuleNotFoundError as e:
+        raise Exception(
+            f" {e}. Reading and writing Parquet requires pyarrow, please install it by running the "
+            f"following command: pip install pyarrow"
+        ) from e
+    return pa, pc, ds
+
+
+def _dictionary_array(pa, uids, lookup):
+    """
+    Uids as an arrow dictionary array over the lookup table, so the
+    indices equal the incidence codes; uids missing from the table are
+    encoded on their own.
+    """
+    codes = lookup.get_indexer(uids)
+    if len(uids) > 0 and (codes < 0).any():
+        return pa.array(pd.Categorical(uids))
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, type=pa.int32()), pa.array(lookup.tolist())
+    )
+
+
+def _to_json(cell):
+    """misc_properties dictionary as a JSON string"""
+    return json.dumps(cell if isinstance(cell, dict) else {}, default=str)
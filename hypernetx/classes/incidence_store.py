@@ -2,6 +2,8 @@
 # All rights reserved.
 from __future__ import annotations
 
+import sys
+
 import pandas as pd
 from scipy.sparse import csr_matrix
 from collections import defaultdict
@@ -9,6 +11,8 @@ import numpy as np
 
 __all__ = ["IncidenceStore"]
 
+BACKENDS = ("pandas", "csr")
+
 
 class IncidenceStore:
     """
@@ -17,30 +21,305 @@ class IncidenceStore:
     Parameters
     ----------
     data : Two column pandas dataframe of edges and nodes, respectively.
+    backend : str, optional, default="pandas"
+        Storage used for the incidence pairs.
+        "pandas" keeps the dataframe and python dictionaries of elements and memberships.
+        "csr" keeps only int32 edge and node codes in paired CSR (edge -> nodes)
+        and CSC (node -> edges) arrays together with the uid lookup tables;
+        dictionaries and dataframes are produced on request.
     """
 
-    def __init__(self, data):
+    def __init__(self, data, backend="pandas"):
         """
         Initiate data in self as the two column pandas dataframe provided through factory method.
+        Dictionaries, unique uid lists and codes are computed on first access
+        and cached, see :attr:`built`.
+
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend provided. Must be one of {BACKENDS}.")
+        self._backend = backend
+        # incidence pairs are read and iterated in the column order of the data,
+        # the csr backend always iterates (edge, node)
+        self._edges_first = backend == "csr" or list(data.columns[:2]) != [
+            "nodes",
+            "edges",
+        ]
+        self._reset()
+
+        if backend == "pandas":
+            # initiate self with data (pandas dataframe) with duplicate incidence pairs removed.
+            self._data = data
+        else:
+            self._data = None
+            self._encode(data["edges"], data["nodes"])
+
+    def _reset(self):
+        """Drops every derived structure so it is rebuilt on next access."""
+        self._codes = None
+        self._elements = None
+        self._memberships = None
+        self._uids = [None, None]
 
+    def _encode(self, edges, nodes):
         """
-        # initiate self with data (pandas dataframe) with duplicate incidence pairs removed.
-        self._data = data
-        self._elements = data.groupby("edges").agg(list).to_dict()["nodes"]
-        self._memberships = data.groupby("nodes").agg(list).to_dict()["edges"]
+        Codes the edge and node columns as categoricals.
+
+        Parameters
+        ----------
+        edges, nodes : array-like
+            Edge and node uids of the incidence pairs in row order.
+        """
+        edges = pd.Categorical(edges)
+        nodes = pd.Categorical(nodes)
+        self._set_codes(
+            edges.codes.astype(np.int32),
+            nodes.codes.astype(np.int32),
+            edges.categories,
+            nodes.categories,
+        )
+
+    def _set_codes(self, edge_codes, node_codes, edge_index, node_index):
+        """
+        Stores incidence codes and their uid lookup tables. The compressed
+        edge -> nodes (CSR) and node -> edges (CSC) arrays are added on
+        first use.
+        """
+        self._codes = {
+            "edges": edge_codes,
+            "nodes": node_codes,
+            "edge_index": edge_index,
+            "node_index": node_index,
+        }
+
+    def _coded(self):
+        """
+        Incidence codes and lookup tables, encoding the dataframe
+        on first use for the pandas backend.
+        """
+        if self._codes is None:
+            self._encode(self._data["edges"], self._data["nodes"])
+        return self._codes
+
+    def _compressed(self, name):
+        """
+        CSR ("csr") or CSC ("csc") arrays of the codes, built on first use.
+        Within an edge (node) the incidence order of the rows is kept.
+        """
+        codes = self._coded()
+        if name not in codes:
+            if name == "csr":
+                keys, values = codes["edges"], codes["nodes"]
+                n_keys = len(codes["edge_index"])
+            else:
+                keys, values = codes["nodes"], codes["edges"]
+                n_keys = len(codes["node_index"])
+            codes[name] = _compress(keys, values, n_keys)
+        return codes[name]
+
+    def _frame(self):
+        """The incidence pairs as a two column dataframe without copying if possible."""
+        if self._data is not None:
+            return self._data
+        codes = self._codes
+        return pd.DataFrame(
+            {
+                "edges": codes["edge_index"].take(codes["edges"]),
+                "nodes": codes["node_index"].take(codes["nodes"]),
+            }
+        )
+
+    @property
+    def backend(self):
+        """
+        Name of the storage backend, "pandas" or "csr"
+
+        Returns
+        -------
+        str
+        """
+        return self._backend
+
+    @property
+    def built(self):
+        """
+        Reports which of the lazily computed structures have been built.
+
+        Returns
+        -------
+        dict
+            Keyed by "codes", "csr", "csc", "pair_index", "elements",
+            "memberships", "edges" and "nodes" with boolean values.
+        """
+        codes = self._codes or {}
+        return {
+            "codes": self._codes is not None,
+            "csr": "csr" in codes,
+            "csc": "csc" in codes,
+            "pair_index": "pair_keys" in codes,
+            "elements": self._elements is not None,
+            "memberships": self._memberships is not None,
+            "edges": self._uids[0] is not None,
+            "nodes": self._uids[1] is not None,
+        }
+
+    def memory_usage(self, deep=False):
+        """
+        Bytes held by the incidence pairs and by the structures built from
+        them so far, see :attr:`built`. Python lists and dictionaries are
+        counted without the uids they hold.
+
+        Parameters
+        ----------
+        deep : bool, optional, default=False
+            If True, also count the uid objects of the dataframe and of the
+            lookup tables, see pandas.DataFrame.memory_usage
+
+        Returns
+        -------
+        int
+        """
+        total = 0
+        if self._data is not None:
+            total += self._data.memory_usage(index=True, deep=deep).sum()
+        for value in (self._codes or {}).values():
+            for array in value if isinstance(value, tuple) else [value]:
+                if isinstance(array, pd.Index):
+                    total += array.memory_usage(deep=deep)
+                else:
+                    total += array.nbytes
+        for groups in [self._elements, self._memberships, *self._uids]:
+            if groups is not None:
+                total += sys.getsizeof(groups)
+                if isinstance(groups, dict):
+                    total += sum(map(sys.getsizeof, groups.values()))
+        return int(total)
 
     @property
     def data(self):
-        return self._data.copy(deep=True)
+        return self._frame().copy(deep=True)
+
+    @property
+    def codes(self):
+        """
+        Integer codes of the incidence pairs in row order.
+        Codes index the arrays returned by :attr:`labels`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            int32 arrays of edge codes and node codes
+        """
+        codes = self._coded()
+        return codes["edges"], codes["nodes"]
+
+    @property
+    def labels(self):
+        """
+        Uids of the edges and nodes in code order.
+
+        Returns
+        -------
+        dict
+            {"edges": np.ndarray, "nodes": np.ndarray}
+        """
+        codes = self._coded()
+        return {
+            "edges": np.array(codes["edge_index"]),
+            "nodes": np.array(codes["node_index"]),
+        }
+
+    def index(self, level):
+        """
+        Hashed lookup table of the edge or node uids in code order.
+        ``index(level).get_loc(uid)`` returns the code of the uid.
+
+        Parameters
+        ----------
+        level : int
+            0 for edges, 1 for nodes
+
+        Returns
+        -------
+        pd.Index
+        """
+        if level == 0:
+            return self._coded()["edge_index"]
+        elif level == 1:
+            return self._coded()["node_index"]
+        else:
+            raise ValueError("Invalid level provided. Must be 0 or 1.")
+
+    @property
+    def csr(self):
+        """
+        Compressed edge to node arrays. The node codes of the edge with
+        code i are indices[indptr[i]:indptr[i + 1]].
+
+        Returns
+        -------
+        tuple of np.ndarray
+            indptr, indices
+        """
+        return self._compressed("csr")
+
+    @property
+    def csc(self):
+        """
+        Compressed node to edge arrays. The edge codes of the node with
+        code j are indices[indptr[j]:indptr[j + 1]].
+
+        Returns
+        -------
+        tuple of np.ndarray
+            indptr, indices
+        """
+        return self._compressed("csc")
+
+    def incidence_matrix(self):
+        """
+        Node by edge incidence matrix built directly from the codes.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        codes = self._coded()
+        shape = (len(codes["node_index"]), len(codes["edge_index"]))
+        indptr, indices = self._compressed("csc")
+        data = np.ones(len(indices), dtype=int)
+        return csr_matrix((data, indices, indptr), shape=shape)
 
     @property
     def elements(self):
+        if self._elements is None:
+            if self._backend == "pandas":
+                self._elements = (
+                    self._data.groupby("edges").agg(list).to_dict()["nodes"]
+                )
+            else:
+                self._elements = self._grouped("csr", "edge_index", "node_index")
         return self._elements
 
     @property
     def memberships(self):
+        if self._memberships is None:
+            if self._backend == "pandas":
+                self._memberships = (
+                    self._data.groupby("nodes").agg(list).to_dict()["edges"]
+                )
+            else:
+                self._memberships = self._grouped("csc", "node_index", "edge_index")
         return self._memberships
 
+    def _grouped(self, compressed, key_index, value_index):
+        """Dictionary of uid to list of incident uids from compressed arrays"""
+        codes = self._codes
+        indptr, indices = self._compressed(compressed)
+        keys = codes[key_index].tolist()
+        values = codes[value_index].take(indices).tolist()
+        return {key: values[indptr[i] : indptr[i + 1]] for i, key in enumerate(keys)}
+
     @property
     def dimensions(self):
         """
@@ -51,7 +330,7 @@ class IncidenceStore:
         tuple of ints
              Tuple of size two of (number of unique edges, number of unique nodes).
         """
-        return (len(self._elements), len(self._memberships))
+        return (len(self.index(0)), len(self.index(1)))
 
     @property
     def edges(self):
@@ -63,7 +342,7 @@ class IncidenceStore:
         array
              Returns an array of edge names
         """
-        return list(self._data["edges"].unique())
+        return list(self._unique(0))
 
     @property
     def nodes(self):
@@ -75,7 +354,22 @@ class IncidenceStore:
         array
              Returns an array of node names
         """
-        return list(self._data["nodes"].unique())
+        return list(self._unique(1))
+
+    def _unique(self, level):
+        """
+        Cached uids of edges (level 0) or nodes (level 1) in order of
+        first appearance in the incidence pairs
+        """
+        if self._uids[level] is None:
+            column = ["edges", "nodes"][level]
+            if self._backend == "pandas":
+                self._uids[level] = list(self._data[column].unique())
+            else:
+                codes = self._codes
+                index = codes[["edge_index", "node_index"][level]]
+                self._uids[level] = list(index.take(pd.unique(codes[column])))
+        return self._uids[level]
 
     def __iter__(self):
         """
@@ -89,7 +383,7 @@ class IncidenceStore:
         # itertuples provides iterator over rows in a dataframe
         # with index as false to not return index
         # and name as None to return a standard tuple.
-        return self._data.itertuples(index=False, name=None)
+        return self._frame().itertuples(index=False, name=None)
 
     def __len__(self):
         """
@@ -100,14 +394,17 @@ class IncidenceStore:
         int
             Number of incidence pairs in the hypergraph.
         """
-
-        return len(self._data)
+        if self._data is not None:
+            return len(self._data)
+        return len(self._codes["edges"])
 
     def __contains__(self, incidence_pair):
         """
         Checks if an incidence pair exists in the incidence pairs dataframe.
         First, this checks if the incidence pair is of length two.
-        Then, it checks if it exists in the incidence pairs.
+        Then, it checks if it exists in the incidence pairs by binary search
+        on a sorted array of packed pair codes, which is built on the first
+        query and reused afterwards.
 
         Parameters
         ----------
@@ -119,23 +416,202 @@ class IncidenceStore:
         bool
             True if incidence pair exists in incidence store.
         """
-        # df = self._data
+        try:
+            first, second = incidence_pair
+        except (TypeError, ValueError):
+            return False
+        codes = self._coded()
+        if not self._edges_first:
+            first, second = second, first
+        try:
+            edge = codes["edge_index"].get_loc(first)
+            node = codes["node_index"].get_loc(second)
+        except (KeyError, TypeError, pd.errors.InvalidIndexError):
+            return False
+        keys = self._pair_keys()
+        key = _pack(np.int64(edge), np.int64(node))
+        pos = np.searchsorted(keys, key)
+        return bool(pos < len(keys) and keys[pos] == key)
+
+    def contains_many(self, pairs):
+        """
+        Vectorized membership test for a batch of incidence pairs.
 
-        # #verify the incidence pair is of length two. Otherwise, pair does not exist.
-        # if len(incidence_pair) == 2:
-        #     node, edge = incidence_pair[0], incidence_pair[1]
-        #     # check if first element in pair (node) exists in 'nodes' column anywhere
-        #     # and check if second element of pair (edge) exists in 'edges' column anywhere.
-        #     does_contain = ((df['nodes'] == node) & (df['edges'] == edge)).any()
-        #     return does_contain
-        # else:
-        #     return False
+        Parameters
+        ----------
+        pairs : list of tuples | np.ndarray | pd.DataFrame
+            Incidence pairs ordered as in the incidence store, given as an
+            iterable of pairs, an (N, 2) array, or a two column dataframe.
 
-        # Numpy's __contains__ method does not work on non-scalars
-        # see https://github.com/numpy/numpy/issues/3016
-        # This implementation is workaround on numpy's __contains__ issue until it is resolved
-        store = [tuple(pair) for pair in self._data.values.tolist()]
-        return any(incidence_pair == pair for pair in store)
+        Returns
+        -------
+        np.ndarray
+            Boolean array, True where the pair exists in the incidence store.
+        """
+        if not isinstance(pairs, pd.DataFrame):
+            if not isinstance(pairs, np.ndarray):
+                pairs = list(pairs)
+            pairs = pd.DataFrame(pairs)
+        if len(pairs) == 0:
+            return np.zeros(0, dtype=bool)
+        first, second = pairs.iloc[:, 0], pairs.iloc[:, 1]
+        if not self._edges_first:
+            first, second = second, first
+        return self._contains_uids(first, second)
+
+    def _contains_uids(self, edges, nodes):
+        """Boolean array marking the (edge, node) pairs found in the store"""
+        codes = self._coded()
+        edges = codes["edge_index"].get_indexer(edges)
+        nodes = codes["node_index"].get_indexer(nodes)
+        valid = (edges >= 0) & (nodes >= 0)
+        query = _pack(edges, nodes)
+
+        keys = self._pair_keys()
+        pos = np.searchsorted(keys, query)
+        found = np.zeros(len(query), dtype=bool)
+        inbounds = pos < len(keys)
+        found[inbounds] = keys[pos[inbounds]] == query[inbounds]
+        return found & valid
+
+    def _pair_keys(self):
+        """
+        Sorted int64 keys packing each coded incidence pair as
+        edge_code << 32 | node_code. Built on the first membership query
+        and kept with the codes.
+        """
+        codes = self._coded()
+        if "pair_keys" not in codes:
+            keys = _pack(codes["edges"], codes["nodes"])
+            keys.sort()
+            codes["pair_keys"] = keys
+        return codes["pair_keys"]
+
+    def add_pairs(self, edges, nodes):
+        """
+        Appends incidence pairs in place. Pairs already in the store are
+        skipped. Codes, the pair index, the unique uid lists and the
+        elements and memberships dictionaries are updated by the delta
+        when they have been built; the compressed arrays are rebuilt on
+        next use.
+
+        Parameters
+        ----------
+        edges, nodes : array-like
+            Edge and node uids of the pairs to add
+
+        Returns
+        -------
+        pd.DataFrame
+            The pairs that were added, with columns "edges" and "nodes"
+        """
+        new = pd.DataFrame({"edges": edges, "nodes": nodes})
+        if len(new) == 0:
+            return new
+        new = new[~new.duplicated()]
+        new = new[~self._contains_uids(new["edges"], new["nodes"])]
+        new = new.reset_index(drop=True)
+        if len(new) == 0:
+            return new
+
+        codes = self._codes
+        edge_codes, new_edges = _extend_index(codes, "edge_index", new["edges"])
+        node_codes, new_nodes = _extend_index(codes, "node_index", new["nodes"])
+        codes["edges"] = np.concatenate([codes["edges"], edge_codes])
+        codes["nodes"] = np.concatenate([codes["nodes"], node_codes])
+        for name in ["csr", "csc", "edge_rows", "node_rows"]:
+            codes.pop(name, None)
+        if "pair_keys" in codes:
+            keys = codes["pair_keys"]
+            added = np.sort(_pack(edge_codes, node_codes))
+            codes["pair_keys"] = np.insert(keys, np.searchsorted(keys, added), added)
+
+        if self._data is not None:
+            self._data = pd.concat([self._data, new], ignore_index=True)
+        if self._uids[0] is not None:
+            self._uids[0].extend(new_edges)
+        if self._uids[1] is not None:
+            self._uids[1].extend(new_nodes)
+        for edge, node in zip(new["edges"], new["nodes"]):
+            if self._elements is not None:
+                self._elements.setdefault(edge, []).append(node)
+            if self._memberships is not None:
+                self._memberships.setdefault(node, []).append(edge)
+        return new
+
+    def remove_items(self, level, uids):
+        """
+        Deletes incidence pairs in place. Edges and nodes left without
+        incidences are dropped from the codes; the remaining codes are
+        renumbered in their existing order. Derived structures are updated
+        by the delta when they have been built.
+
+        Parameters
+        ----------
+        level : int
+            0 removes all pairs of the edges in uids,
+            1 removes all pairs of the nodes in uids,
+            2 removes the (edge, node) pairs in uids
+        uids : list
+
+        Returns
+        -------
+        pd.DataFrame
+            The pairs that were removed, with columns "edges" and "nodes"
+        """
+        codes = self._coded()
+        if level in [0, 1]:
+            column = ["edges", "nodes"][level]
+            index = codes[["edge_index", "node_index"][level]]
+            targets = index.get_indexer(pd.Index(list(uids)).unique())
+            drop = np.isin(codes[column], targets[targets >= 0])
+        elif level == 2:
+            pairs = pd.DataFrame(list(uids), columns=["edges", "nodes"])
+            targets = _pack(
+                codes["edge_index"].get_indexer(pairs["edges"]),
+                codes["node_index"].get_indexer(pairs["nodes"]),
+            )
+            drop = np.isin(_pack(codes["edges"], codes["nodes"]), targets)
+        else:
+            raise ValueError("Invalid level provided. Must be 0, 1, or 2.")
+
+        removed = pd.DataFrame(
+            {
+                "edges": codes["edge_index"].take(codes["edges"][drop]),
+                "nodes": codes["node_index"].take(codes["nodes"][drop]),
+            }
+        )
+        if len(removed) == 0:
+            return removed
+
+        keep = ~drop
+        edge_map, dropped_edges = _compact(codes, "edge_index", codes["edges"][keep])
+        node_map, dropped_nodes = _compact(codes, "node_index", codes["nodes"][keep])
+        if "pair_keys" in codes:
+            keys = codes["pair_keys"]
+            keys = keys[
+                ~np.isin(keys, _pack(codes["edges"][drop], codes["nodes"][drop]))
+            ]
+            # renumbering keeps the code order, so the keys stay sorted
+            codes["pair_keys"] = _pack(edge_map[keys >> 32], node_map[keys & _LOW])
+        codes["edges"] = edge_map[codes["edges"][keep]]
+        codes["nodes"] = node_map[codes["nodes"][keep]]
+        for name in ["csr", "csc", "edge_rows", "node_rows"]:
+            codes.pop(name, None)
+
+        if self._data is not None:
+            self._data = self._data[keep]
+        for level, dropped in enumerate([dropped_edges, dropped_nodes]):
+            if self._uids[level] is not None and len(dropped) > 0:
+                self._uids[level] = [
+                    uid for uid in self._uids[level] if uid not in dropped
+                ]
+        for edge, node in zip(removed["edges"], removed["nodes"]):
+            if self._elements is not None:
+                _discard(self._elements, edge, node)
+            if self._memberships is not None:
+                _discard(self._memberships, node, edge)
+        return removed
 
     def neighbors(self, level, key):
         """
@@ -157,12 +633,28 @@ class IncidenceStore:
         """
 
         if level == 0:
-            return self._elements.get(key, [])
+            if self._backend == "pandas":
+                return self.elements.get(key, [])
+            return self._lookup("csr", "edge_index", "node_index", key)
         elif level == 1:
-            return self._memberships.get(key, [])
+            if self._backend == "pandas":
+                return self.memberships.get(key, [])
+            return self._lookup("csc", "node_index", "edge_index", key)
         else:
             return []
 
+    def _lookup(self, compressed, key_index, value_index, key):
+        """List of uids incident to key read from compressed arrays"""
+        codes = self._codes
+        try:
+            code = codes[key_index].get_loc(key)
+        except (KeyError, TypeError):
+            return []
+        indptr, indices = self._compressed(compressed)
+        return (
+            codes[value_index].take(indices[indptr[code] : indptr[code + 1]]).tolist()
+        )
+
     def restrict_to(self, level, items, inplace=False):
         ### TODO if inplace == True the constructor's attributes need to be
         ### adjusted.
@@ -195,21 +687,123 @@ class IncidenceStore:
         else:
             raise ValueError("Invalid level provided. Must be 0 or 1.")
 
+        if self._backend == "csr":
+            codes = self._codes
+            index = codes["edge_index" if level == 0 else "node_index"]
+            keep = np.isin(codes[column], index.get_indexer(list(items)))
+            edges = codes["edge_index"].take(codes["edges"][keep])
+            nodes = codes["node_index"].take(codes["nodes"][keep])
+            if inplace:
+                self._reset()
+                self._encode(edges, nodes)
+            return pd.DataFrame({"edges": edges, "nodes": nodes})
+
         if inplace:
             self._data.drop(
                 self._data[~self._data[column].isin(items)].index, inplace=True
             )
+            self._reset()
             return self._data
 
         else:  # return a subset without editing the original dataframe.
             df = self._data
             return df[df[column].isin(items)]
 
+    def subset(self, level, items):
+        """
+        New IncidenceStore of the pairs whose edge (level 0) or node
+        (level 1) is in items. It is cut from the codes of this store: the
+        pairs of each item are read from the compressed arrays and the
+        uid tables are sliced, so the cost depends on the size of the
+        subset and no uid is encoded again.
+
+        Parameters
+        ----------
+        level : int
+            0 to keep the pairs of the edges in items,
+            1 to keep the pairs of the nodes in items
+        items : Iterable
+            uids to keep; uids not in the store are ignored
+
+        Returns
+        -------
+        IncidenceStore
+            with the same backend; pairs keep their order
+        """
+        if level not in [0, 1]:
+            raise ValueError("Invalid level provided. Must be 0 or 1.")
+        codes = self._coded()
+        index = codes[["edge_index", "node_index"][level]]
+        targets = index.get_indexer(pd.Index(list(items), tupleize_cols=False))
+        targets = np.unique(targets[targets >= 0])
+        rows = np.sort(_gather(*self._rows(level), targets))
+
+        edge_codes, edge_index = _slice_codes(codes["edges"][rows], codes["edge_index"])
+        node_codes, node_index = _slice_codes(codes["nodes"][rows], codes["node_index"])
+        data = None
+        if self._data is not None:
+            data = self._data.iloc[rows].reset_index(drop=True)
+        store = self._derived(self._backend, self._edges_first, data)
+        store._set_codes(edge_codes, node_codes, edge_index, node_index)
+        return store
+
+    def transpose(self):
+        """
+        New IncidenceStore with the roles of edges and nodes exchanged,
+        as used by the dual of a hypergraph. The code arrays, uid lookup
+        tables and compressed arrays of this store are shared, not copied:
+        the CSR arrays of one store are the CSC arrays of the other.
+        Code arrays are never written in place, so later edits of either
+        store do not reach the other.
+
+        Returns
+        -------
+        IncidenceStore
+            with the "csr" backend, which reads the incidences from the
+            codes alone
+        """
+        codes = self._coded()
+        store = self._derived("csr", True)
+        store._set_codes(
+            codes["nodes"], codes["edges"], codes["node_index"], codes["edge_index"]
+        )
+        for name, other in [("csr", "csc"), ("edge_rows", "node_rows")]:
+            if other in codes:
+                store._codes[name] = codes[other]
+            if name in codes:
+                store._codes[other] = codes[name]
+        return store
+
+    @staticmethod
+    def _derived(backend, edges_first, data=None):
+        """Empty store to be filled with codes cut or taken from another store."""
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend provided. Must be one of {BACKENDS}.")
+        store = IncidenceStore.__new__(IncidenceStore)
+        store._backend = backend
+        store._edges_first = edges_first
+        store._reset()
+        store._data = data
+        return store
+
+    def _rows(self, level):
+        """
+        Row positions of the pairs grouped by edge code (level 0) or node
+        code (level 1) as compressed (indptr, rows) arrays, built on first use.
+        """
+        codes = self._coded()
+        name = ["edge_rows", "node_rows"][level]
+        if name not in codes:
+            keys = codes[["edges", "nodes"][level]]
+            n_keys = len(codes[["edge_index", "node_index"][level]])
+            codes[name] = _compress(keys, np.arange(len(keys)), n_keys)
+        return codes[name]
+
     def equivalence_classes(self, level=0):
         if level == 0:
-            old_dict = self._elements
+            old_dict = self.elements
         elif level == 1:
-            old_dict = self._memberships
+            old_dict = self.memberships
         else:
             return None
 
@@ -239,5 +833,126 @@ class IncidenceStore:
                     k = ec[0]
                 ec.remove(k)
                 edict[k] = [k] + ec
-        df = self._data.loc[self._data[col].isin(edict.keys())]
+        df = self._frame()
+        df = df.loc[df[col].isin(edict.keys())]
         return df, edict
+
+
+def _compress(keys, values, n_keys):
+    """
+    Groups values by integer keys into compressed (indptr, indices) arrays,
+    keeping the row order of the values within each key.
+    """
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=indptr[1:])
+    return indptr, values[order]
+
+
+_LOW = np.int64(0xFFFFFFFF)
+
+
+def _pack(edge_codes, node_codes):
+    """Packs pairs of int32 codes into int64 keys edge_code << 32 | node_code"""
+    return (np.asarray(edge_codes, dtype=np.int64) << 32) | (
+        np.asarray(node_codes, dtype=np.int64) & _LOW
+    )
+
+
+def _gather(indptr, values, keys):
+    """Concatenation of the compressed values of the given keys"""
+    starts = indptr[keys]
+    counts = indptr[keys + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    positions = np.arange(counts.sum()) + np.repeat(starts - offsets, counts)
+    return values[positions]
+
+
+def _slice_codes(kept_codes, index):
+    """
+    Renumbers the codes of a subset of pairs to the uids they use,
+    keeping the code order of the lookup table.
+
+    Returns
+    -------
+    tuple
+        int32 codes and the sliced lookup table
+    """
+    if len(kept_codes) >= len(index):
+        # a bincount over the table is cheaper than sorting the codes
+        used = np.bincount(kept_codes, minlength=len(index)) > 0
+        mapping = (np.cumsum(used) - 1).astype(np.int32)
+        return mapping[kept_codes], index[used]
+    used = np.unique(kept_codes)
+    return np.searchsorted(used, kept_codes).astype(np.int32), index.take(used)
+
+
+def _extend_index(codes, index_name, uids):
+    """
+    Codes uids against a lookup table, appending unseen uids to the table
+    in order of first appearance.
+
+    Returns
+    -------
+    tuple
+        int32 codes of the uids and the list of uids added to the table
+    """
+    index = codes[index_name]
+    new_codes = index.get_indexer(uids)
+    added = pd.unique(pd.Series(uids)[new_codes < 0])
+    if len(added) > 0:
+        index = index.append(pd.Index(added))
+        codes[index_name] = index
+        new_codes = index.get_indexer(uids)
+    return new_codes.astype(np.int32), list(added)
+
+
+def _compact(codes, index_name, kept_codes):
+    """
+    Drops uids without remaining incidences from a lookup table.
+
+    Returns
+    -------
+    tuple
+        array mapping old codes to new codes and the set of dropped uids
+    """
+    index = codes[index_name]
+    used = np.bincount(kept_codes, minlength=len(index)) > 0
+    mapping = (np.cumsum(used) - 1).astype(np.int32)
+    dropped = set(index[~used])
+    if dropped:
+        codes[index_name] = index[used]
+    return mapping, dropped
+
+
+def _discard(groups, key, value):
+    """Removes value from the list groups[key], dropping the key once empty"""
+    members = groups.get(key)
+    if members is not None and value in members:
+        members.remove(value)
+        if not members:
+            del groups[key]
+
+
+class _Interner:
+    """
+    Assigns int32 codes to uids in order of first appearance, for inputs
+    read in chunks. Only the distinct uids of a chunk are looked up.
+    """
+
+    def __init__(self):
+        self._codes = {}
+
+    def __call__(self, uids):
+        """Codes of distinct uids, adding unseen uids to the table"""
+        codes = self._codes
+        return np.fromiter(
+            (codes.setdefault(uid, len(codes)) for uid in uids),
+            dtype=np.int32,
+            count=len(uids),
+        )
+
+    @property
+    def index(self):
+        """Lookup table of the uids, position equal to code"""
+        return pd.Index(list(self._codes), tupleize_cols=False)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+
+import pandas as pd
+
+from hypernetx.classes.state_cache import _nbytes
+
+__all__ = ["Instrumentation"]
+
+STATS_COLUMNS = ["calls", "hits", "misses", "seconds", "bytes"]
+
+
+class Instrumentation:
+    """
+    Records the calls of the instrumented Hypergraph methods: per method
+    and value of s, the number of calls, how many were answered from the
+    state cache (hits) or computed (misses), their wall time and the bytes
+    of the values computed. See :meth:`Hypergraph.instrument`.
+
+    Parameters
+    ----------
+    logger : logging.Logger | str, optional, default=None
+        logger, or name of a logger made by
+        :func:`hypernetx.utils.log.get_logger`, that each call is logged to
+    callback : callable, optional, default=None
+        called with a dictionary of the method, s, hit, seconds and bytes
+        of each call
+    """
+
+    def __init__(self, logger=None, callback=None):
+        if isinstance(logger, str):
+            from hypernetx.utils.log import get_logger
+
+            logger = get_logger(logger)
+        self.logger = logger
+        self.callback = callback
+        self._records = {}
+
+    def record(self, method, s, hit, seconds, nbytes):
+        """Adds one call of method"""
+        row = self._records.setdefault((method, s), [0, 0, 0, 0.0, 0])
+        row[0] += 1
+        row[1 if hit else 2] += 1
+        row[3] += seconds
+        row[4] += nbytes
+        if self.logger is not None:
+            self.logger.log(
+                logging.INFO,
+                "%s s=%s %s %.6fs %d bytes",
+                method,
+                s,
+                "hit" if hit else "miss",
+                seconds,
+                nbytes,
+            )
+        if self.callback is not None:
+            self.callback(
+                {
+                    "method": method,
+                    "s": s,
+                    "hit": hit,
+                    "seconds": seconds,
+                    "bytes": nbytes,
+                }
+            )
+
+    def to_dataframe(self):
+        """
+        Recorded calls
+
+        Returns
+        -------
+        pandas.DataFrame
+            indexed by method and s with columns calls, hits, misses,
+            seconds and bytes
+        """
+        keys = list(self._records)
+        index = pd.MultiIndex.from_arrays(
+            [[key[0] for key in keys], [key[1] for key in keys]], names=["method", "s"]
+        )
+        return pd.DataFrame(
+            list(self._records.values()), index=index, columns=STATS_COLUMNS
+        )
+
+    def reset(self):
+        """Forgets the recorded calls"""
+        self._records = {}
+
+
+def _instrumented(key=None):
+    """
+    Records the calls of a Hypergraph method while its instrumentation is
+    on. Nested instrumented calls are recorded as well, their time is
+    included in the time of the caller.
+
+    Parameters
+    ----------
+    key : callable, optional, default=None
+        called with the arguments of the method by name, returns the key
+        of the state cache entry holding its value. A call is a hit if
+        the entry is cached when it starts; without a key every call is
+        a miss. The bytes are those of the values returned by misses.
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = getattr(self, "_instrumentation", None)
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            hit = key is not None and key(arguments) in self._state_dict
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            seconds = time.perf_counter() - start
+            nbytes = 0 if hit else _nbytes(result, deep=True)
+            instrumentation.record(
+                method.__name__, arguments.get("s"), hit, seconds, nbytes
+            )
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,12 +1,21 @@
+import sys
 from typing import Any
+from collections.abc import Mapping
 from copy import deepcopy
-from pandas import DataFrame
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
 
 
 UID = "uid"
 WEIGHT = "weight"
 MISC_PROPERTIES = "misc_properties"
 DEFAULT_PROPERTIES = [WEIGHT, MISC_PROPERTIES]
+STORAGE_MODES = ("dict", "columnar")
+# fraction of items that must share a misc property before columnar storage
+# keeps it in its own column instead of the side table
+PROMOTE_FRACTION = 0.5
 
 
 class PropertyStore:
@@ -16,7 +25,7 @@ class PropertyStore:
 
     """
 
-    def __init__(self, data=None, default_weight=1):
+    def __init__(self, data=None, default_weight=1, storage="dict"):
         """
         Parameters
         ----------
@@ -43,7 +52,19 @@ class PropertyStore:
 
         default_weight: int | float
             optional parameter that holds the specified default weight of the weight property
+
+        storage: str, optional, default="dict"
+            How the misc_properties are stored. "dict" keeps one dictionary
+            per item in the misc_properties column. "columnar" keeps misc
+            properties shared by at least ``PROMOTE_FRACTION`` of the items
+            in typed columns of their own and all other misc properties in
+            a side table keyed by uid; the dictionaries are only rebuilt
+            when :attr:`properties` or misc_properties is requested.
         """
+        if storage not in STORAGE_MODES:
+            raise ValueError(
+                f"Unknown property storage {storage}, expected one of {STORAGE_MODES}"
+            )
         # If no dataframe is provided, create an empty dataframe
         if data is None:
             self._data: DataFrame = DataFrame(columns=[UID, WEIGHT, MISC_PROPERTIES])
@@ -56,6 +77,43 @@ class PropertyStore:
         self._defaults = {col: None for col in self._columns}
         self._defaults.update({WEIGHT: self._default_weight, MISC_PROPERTIES: {}})
 
+        # row positions of uids and numpy arrays of columns for fast reads,
+        # built on demand and cleared by _invalidate on writes
+        self._rows = None
+        self._arrays = {}
+        # number of writes, see version
+        self._version = 0
+        # set when the data table is shared with another store, see _share
+        self._shared = False
+
+        self._storage = storage
+        # columnar storage: misc properties kept in columns and the side table
+        self._promoted = []
+        self._sparse = {}
+        if storage == "columnar":
+            self._columnarize()
+
+    @property
+    def storage(self) -> str:
+        """How misc_properties are stored, "dict" or "columnar"
+
+        Returns
+        -------
+        str
+        """
+        return self._storage
+
+    @property
+    def version(self) -> int:
+        """Number of writes to the store, used to tell whether values
+        computed from its properties are still current
+
+        Returns
+        -------
+        int
+        """
+        return self._version
+
     @property
     def properties(self) -> DataFrame:
         """Properties assigned to all items in the underlying data table
@@ -68,6 +126,8 @@ class PropertyStore:
                 or
                 level, id, weight, properties, <optional props>
         """
+        if self._storage == "columnar":
+            return self._materialize()
         return self._data
 
     @property
@@ -105,9 +165,13 @@ class PropertyStore:
         get_property, set_property
         """
         # if the item is not in the data table, return defaults for properties
-        if uid not in self._data.index:
+        pos = self._row(uid)
+        if pos is None:
             return self.default_properties
-        return flatten(self._data.loc[uid].to_dict())
+        props = self._row_dict(pos, self._stored_columns)
+        if self._storage == "columnar":
+            props[MISC_PROPERTIES] = self._misc(uid, props)
+        return flatten(props)
 
     def get_property(self, uid, prop_name) -> Any:
         """Get a property of an item
@@ -132,11 +196,157 @@ class PropertyStore:
         --------
         get_properties, set_property
         """
+        pos = self._row(uid)
+        if pos is None:
+            return deepcopy(self._defaults.get(prop_name, None))
         # if the item is in the data table and the property is 'misc_properties'
         # return 'misc_properties'
-        if uid in self._data.index and prop_name == MISC_PROPERTIES:
-            return self._data.loc[uid][MISC_PROPERTIES]
-        return self.get_properties(uid).get(prop_name, None)
+        if prop_name == MISC_PROPERTIES:
+            if self._storage == "columnar":
+                return self._misc(uid, self._row_dict(pos, self._promoted))
+            return self._value(MISC_PROPERTIES, pos)
+
+        # named properties and top level misc properties are read from the
+        # cached columns; nested misc properties need the flattened dictionary
+        if prop_name in self._columns:
+            value = self._value(prop_name, pos)
+        elif self._storage == "columnar":
+            if prop_name in self._promoted:
+                value = self._value(prop_name, pos)
+            else:
+                value = self._sparse.get(uid, {}).get(prop_name, None)
+        else:
+            misc = self._value(MISC_PROPERTIES, pos)
+            value = misc.get(prop_name, None) if isinstance(misc, dict) else None
+        if _isna(value) or isinstance(value, dict):
+            return self.get_properties(uid).get(prop_name, None)
+        return value
+
+    def get_property_array(self, uids, prop_name) -> np.ndarray:
+        """Get a property of many items as an array
+
+        Parameters
+        ----------
+        uids : Iterable[Hashable]
+            uids of the items, in the order of the returned values
+        prop_name : str | int
+            name of the property to get
+
+        Returns
+        -------
+        numpy.ndarray
+            values of the property aligned with `uids`; items not in the
+            data table have the default value of the property. Numeric
+            properties give numeric arrays, all others object arrays.
+
+        See Also
+        --------
+        get_property, set_property_column
+        """
+        uids = list(uids)
+        stored = prop_name in self._columns[:-1] or prop_name in self._promoted
+        if not stored:
+            values = np.empty(len(uids), dtype=object)
+            values[:] = [self.get_property(uid, prop_name) for uid in uids]
+            return values
+
+        column = self._array(prop_name)
+        positions = self._positions(uids) if uids else np.empty(0, dtype=int)
+        missing = positions < 0
+        if prop_name in self._promoted and len(column):
+            # unset misc properties are missing in the column
+            missing |= pd.isna(column[np.where(missing, 0, positions)])
+        if not missing.any():
+            return column[positions]
+
+        return self._fill_missing(column, positions, missing, uids, prop_name)
+
+    def get_property_array_codes(
+        self, edge_uids, node_uids, edge_codes, node_codes, prop_name
+    ) -> np.ndarray:
+        """Get a property of many incidence pairs given by integer codes
+
+        The rows of the data table are matched to the pairs by their codes
+        with vectorized lookups, without building a tuple per pair.
+
+        Parameters
+        ----------
+        edge_uids, node_uids : pandas.Index
+            uids of the edges and nodes, position equal to code, as
+            returned by :meth:`IncidenceStore.index`
+        edge_codes, node_codes : numpy.ndarray
+            codes of the incidence pairs, in the order of the returned values
+        prop_name : str | int
+            name of the property to get
+
+        Returns
+        -------
+        numpy.ndarray
+            as returned by :meth:`get_property_array` for the uids of the pairs
+
+        See Also
+        --------
+        get_property_array
+        """
+        edge_codes = np.asarray(edge_codes, dtype=np.int64)
+        node_codes = np.asarray(node_codes, dtype=np.int64)
+        positions = self._pair_positions(edge_uids, node_uids, edge_codes, node_codes)
+        stored = prop_name in self._columns[:-1] or prop_name in self._promoted
+        column = self._array(prop_name) if stored else None
+        missing = positions < 0
+        if not stored:
+            missing[:] = True
+        elif prop_name in self._promoted and len(column):
+            missing |= pd.isna(column[np.where(missing, 0, positions)])
+        if not missing.any():
+            return column[positions]
+
+        rows = np.flatnonzero(missing)
+        uids = list(zip(edge_uids[edge_codes[rows]], node_uids[node_codes[rows]]))
+        if not stored:
+            return self.get_property_array(uids, prop_name)
+        uids = dict(zip(rows, uids))
+        return self._fill_missing(column, positions, missing, uids, prop_name)
+
+    def _pair_positions(self, edge_uids, node_uids, edge_codes, node_codes):
+        """
+        Row positions of coded incidence pairs in a data table indexed by
+        (edge, node), -1 for pairs without a row
+        """
+        index = self._data.index
+        positions = np.full(len(edge_codes), -1, dtype=np.int64)
+        if not isinstance(index, pd.MultiIndex) or len(index) == 0:
+            return positions
+        # codes of the uids of each row, -1 for uids not in the hypergraph
+        row_codes = []
+        for level, uids in enumerate([edge_uids, node_uids]):
+            level_codes = np.append(uids.get_indexer(index.levels[level]), -1)
+            row_codes.append(level_codes[index.codes[level]])
+        known = (row_codes[0] >= 0) & (row_codes[1] >= 0)
+        rows = np.flatnonzero(known)
+        keys = (row_codes[0][rows] << 32) | row_codes[1][rows]
+        order = np.argsort(keys, kind="stable")
+        keys, rows = keys[order], rows[order]
+
+        query = (edge_codes << 32) | node_codes
+        pos = np.minimum(np.searchsorted(keys, query), max(len(keys) - 1, 0))
+        found = (keys[pos] == query) if len(keys) else np.zeros(len(query), bool)
+        positions[found] = rows[pos[found]]
+        return positions
+
+    def _fill_missing(self, column, positions, missing, uids, prop_name):
+        """
+        Values of a column at row positions, with the values of the missing
+        items, uids[i] for position i, read one by one
+        """
+        fill = [self.get_property(uids[i], prop_name) for i in np.flatnonzero(missing)]
+        dtype = Series(fill).dtype
+        if column.dtype.kind not in "biuf" or dtype.kind not in "biuf":
+            dtype = object
+        values = np.empty(len(uids), dtype=np.result_type(column.dtype, dtype))
+        values[~missing] = column[positions[~missing]]
+        values[missing] = fill
+        return values
 
     def set_properties(self, uid, props) -> None:
         """
@@ -155,7 +365,7 @@ class PropertyStore:
         get_property, get_properties, set_property
         """
         if uid not in self._data.index:
-            self._data.loc[uid, :] = self.default_properties
+            self._add_defaults(uid)
 
         for prop_name, prop_val in props.items():
             self._set_property(uid, prop_name, prop_val)
@@ -182,9 +392,17 @@ class PropertyStore:
         """
         # if the uid is not present, add the uid with default properties to the dataframe
         if uid not in self._data.index:
-            self._data.loc[uid, :] = self.default_properties
+            self._add_defaults(uid)
         self._set_property(uid, prop_name, prop_val)
 
+    def _add_defaults(self, uid) -> None:
+        """Adds an item with default properties to the data table"""
+        if self._storage == "columnar":
+            self._append_defaults([uid])
+        else:
+            self._data.loc[uid, :] = self.default_properties
+            self._invalidate()
+
     def _set_property(self, uid, prop_name, prop_val):
         """Updates a property of an item in the underlying data table
 
@@ -205,13 +423,222 @@ class PropertyStore:
         # Holds the logic on how new properties are added to the dataframe for existing items
         # Currently supports updating existing properties and adding a property to the misc_properties
         # A potential feature is adding a common property to a subset of items
-        if prop_name in self._columns:
+        if prop_name in self._columns and (
+            self._storage == "dict" or prop_name != MISC_PROPERTIES
+        ):
             # overwrite the current property with the updated property
+            self._own()
             self._data.at[uid, prop_name] = prop_val
+            self._invalidate([prop_name])
+        elif self._storage == "columnar":
+            if prop_name == MISC_PROPERTIES:
+                self._set_misc([uid], [dict(prop_val)], replace=True)
+            else:
+                self._set_misc([uid], [{prop_name: prop_val}])
         else:
             # if the property to be added is not one of existing properties,
             # add the unique property to 'misc_properties'
-            self._data.at[uid, MISC_PROPERTIES].update({prop_name: prop_val})
+            # the dictionary is replaced rather than updated in place since
+            # it may be shared with a restricted copy of this store
+            misc = self._data.at[uid, MISC_PROPERTIES]
+            self._own()
+            self._data.at[uid, MISC_PROPERTIES] = {**misc, prop_name: prop_val}
+            self._invalidate([MISC_PROPERTIES])
+
+    def set_properties_bulk(self, uids, props) -> None:
+        """
+        Set properties of many items with one update of the underlying
+        data table. The result is the same as calling
+        :meth:`set_properties` for each uid in order.
+
+        Parameters
+        ----------
+        uids : Iterable[Hashable] | None
+            uids of the items to update; if `props` is a DataFrame and
+            uids is None, the index of `props` is used
+        props : dict | Sequence[dict] | DataFrame
+            a dictionary of properties given to every uid, a sequence of
+            dictionaries aligned with `uids`, or a DataFrame indexed by uid
+            with one column per property. Properties that are not columns
+            of the data table are added to 'misc_properties'; missing
+            (NaN) DataFrame entries are not added to 'misc_properties'.
+
+        Returns
+        -------
+        None
+
+        See Also
+        --------
+        set_properties, set_property_column
+        """
+        if isinstance(props, DataFrame):
+            if uids is not None:
+                props = props.loc[list(uids)]
+            uids = list(props.index)
+            columns = {
+                name: (uids, props[name].tolist())
+                for name in props.columns
+                if name in self._columns
+            }
+            misc = [
+                (uid, {k: v for k, v in record.items() if not _isna(v)})
+                for uid, record in zip(
+                    uids,
+                    props[[c for c in props.columns if c not in self._columns]].to_dict(
+                        orient="records"
+                    ),
+                )
+            ]
+        elif isinstance(props, Mapping):
+            uids = list(uids)
+            columns = {
+                name: (uids, [val] * len(uids))
+                for name, val in props.items()
+                if name in self._columns
+            }
+            extra = {k: v for k, v in props.items() if k not in self._columns}
+            misc = [(uid, extra) for uid in uids] if extra else []
+        else:
+            uids = list(uids)
+            props = list(props)
+            if len(props) != len(uids):
+                raise ValueError("props must have one dictionary per uid")
+            columns, misc = {}, []
+            for uid, record in zip(uids, props):
+                extra = {}
+                for name, val in record.items():
+                    if name in self._columns:
+                        column = columns.setdefault(name, ([], []))
+                        column[0].append(uid)
+                        column[1].append(val)
+                    else:
+                        extra[name] = val
+                if extra:
+                    misc.append((uid, extra))
+
+        self._append_defaults(uids)
+        misc = [item for item in misc if item[1]]
+        if self._storage == "columnar":
+            replaced = columns.pop(MISC_PROPERTIES, None)
+            if replaced is not None:
+                self._set_misc(*replaced, replace=True)
+        for name, (keys, values) in columns.items():
+            self._write_column(name, self._positions(keys), values)
+        if misc and self._storage == "columnar":
+            self._set_misc([uid for uid, _ in misc], [extra for _, extra in misc])
+        elif misc:
+            cells = self._data[MISC_PROPERTIES].to_numpy(copy=True)
+            positions = self._positions([uid for uid, _ in misc])
+            for pos, (_, extra) in zip(positions, misc):
+                cells[pos] = {**cells[pos], **extra}
+            self._data[MISC_PROPERTIES] = cells
+            self._invalidate([MISC_PROPERTIES])
+
+    def set_property_column(self, prop_name, values, uids=None) -> None:
+        """
+        Set one property for many items with one update of the underlying
+        data table.
+
+        Parameters
+        ----------
+        prop_name : str | int
+            name of the property to set; if it is not a column of the data
+            table the values are added to 'misc_properties'
+        values : Series | dict | array-like
+            values keyed by uid, or an array-like aligned with `uids`
+        uids : Iterable[Hashable], optional, default=None
+            uids of an array-like of values; if None the values are
+            aligned with the rows of :attr:`properties`
+
+        Returns
+        -------
+        None
+
+        See Also
+        --------
+        set_property, set_properties_bulk
+        """
+        if uids is None and isinstance(values, Series):
+            uids = list(values.index)
+            values = values.tolist()
+        elif uids is None and isinstance(values, Mapping):
+            uids = list(values.keys())
+            values = list(values.values())
+        else:
+            uids = list(self._data.index if uids is None else uids)
+            values = list(values)
+            if len(values) != len(uids):
+                raise ValueError(
+                    f"Expected {len(uids)} values for property {prop_name}, got {len(values)}"
+                )
+
+        self._append_defaults(uids)
+        if prop_name in self._columns:
+            if self._storage == "columnar" and prop_name == MISC_PROPERTIES:
+                self._set_misc(uids, values, replace=True)
+            else:
+                self._write_column(prop_name, self._positions(uids), values)
+        elif self._storage == "columnar":
+            self._set_misc_column(prop_name, uids, values)
+        elif uids:
+            cells = self._data[MISC_PROPERTIES].to_numpy(copy=True)
+            for pos, val in zip(self._positions(uids), values):
+                cells[pos] = {**cells[pos], prop_name: val}
+            self._data[MISC_PROPERTIES] = cells
+            self._invalidate([MISC_PROPERTIES])
+
+    def _as_index(self, uids):
+        """Builds an index of uids of the same kind as the data table index"""
+        if isinstance(self._data.index, pd.MultiIndex):
+            return pd.MultiIndex.from_tuples(list(uids), names=self._data.index.names)
+        return pd.Index(list(uids), tupleize_cols=False, name=self._data.index.name)
+
+    def _positions(self, uids) -> np.ndarray:
+        """Row positions of uids already in the data table"""
+        return self._data.index.get_indexer(self._as_index(uids))
+
+    def _append_defaults(self, uids) -> None:
+        """Adds rows of default properties for the uids not in the data table"""
+        new = self._as_index(uids).unique()
+        new = new[~new.isin(self._data.index)]
+        if len(new) == 0:
+            return
+        rows = DataFrame(
+            {
+                col: [deepcopy(self._defaults.get(col)) for _ in range(len(new))]
+                for col in self._data.columns
+            },
+            index=new,
+        )
+        for col, dtype in self._data.dtypes.items():
+            if rows[col].isna().all():
+                # keep missing defaults from changing the dtype of the column
+                rows[col] = rows[col].astype(dtype if dtype.kind in "fO" else object)
+        if len(self._data) == 0:
+            self._data = rows
+        else:
+            self._data = pd.concat([self._data, rows])
+        self._invalidate()
+
+    def _write_column(self, name, positions, values) -> None:
+        """Writes values into a column at the given row positions"""
+        self._invalidate([name])
+        values = Series(values, dtype=object)
+        keep = ~pd.Index(positions).duplicated(keep="last")
+        positions, values = positions[keep], values[keep].infer_objects()
+        column = self._data[name].to_numpy(copy=True)
+        if column.dtype.kind == "f" and values.isna().all():
+            column[positions] = np.nan
+            self._data[name] = column
+        elif column.dtype.kind == values.dtype.kind or (
+            column.dtype.kind == "f" and values.dtype.kind in "iu"
+        ):
+            column[positions] = values.to_numpy()
+            self._data[name] = column
+        else:
+            column = column.astype(object)
+            column[positions] = values.to_numpy(dtype=object)
+            self._data[name] = Series(column, index=self._data.index).infer_objects()
 
     def set_defaults(self, defaults) -> None:
         """
@@ -230,6 +657,17 @@ class PropertyStore:
         for k, v in defaults.items():
             if k in self._columns:
                 self._data.fillna({k: v})
+            elif self._storage == "columnar":
+                values = self._misc_values(k, v)
+                if k in self._promoted:
+                    # like the dict storage, items keep the key in their
+                    # misc_properties; it moves to the side table
+                    self._promoted.remove(k)
+                    column = self._data.pop(k)
+                    for uid, val in column[column.notna()].items():
+                        self._sparse.setdefault(uid, {})[k] = val
+                self._data[k] = values
+                new_cols.append(k)
             else:
 
                 def grabprop(cell):
@@ -238,8 +676,9 @@ class PropertyStore:
                 self._data[k] = self._data["misc_properties"].map(grabprop)
                 new_cols.append(k)
         self._columns = list(self._columns[:-1]) + new_cols + ["misc_properties"]
-        self._data = self._data[self._columns]
+        self._data = self._data[self._stored_columns]
         self._default_weight = self._defaults["weight"]
+        self._invalidate()
 
     def __getitem__(self, uid) -> dict:
         """Gets all the properties of an item
@@ -279,11 +718,350 @@ class PropertyStore:
         PropertyStore
         """
         data = self._data.copy(deep=deep)
+        if self._storage == "columnar":
+            ps = PropertyStore(default_weight=self._default_weight, storage="columnar")
+            ps._data = data
+            ps._columns = list(self._columns)
+            ps._defaults = deepcopy(self._defaults)
+            ps._promoted = list(self._promoted)
+            ps._sparse = deepcopy(self._sparse) if deep else self._sparse
+            return ps
         if deep:
             temp = [deepcopy(d) for d in data.misc_properties.values]
             data["misc_properties"] = temp
         return PropertyStore(data, default_weight=self._default_weight)
 
+    def to_dataframe(self) -> DataFrame:
+        """
+        Copy of the properties table that shares no misc_properties
+        dictionaries with the PropertyStore
+
+        Returns
+        -------
+        pandas.DataFrame
+        """
+        if self._storage == "columnar":
+            return self._materialize()
+        df = self._data.copy(deep=True)
+        df[MISC_PROPERTIES] = [deepcopy(d) for d in df[MISC_PROPERTIES].values]
+        return df
+
+    def memory_usage(self, deep=False) -> int:
+        """
+        Bytes held by the properties table, the side table of misc
+        properties and the arrays cached for reads
+
+        Parameters
+        ----------
+        deep : bool, optional, default=False
+            If True, also count the objects of object columns such as the
+            misc_properties dictionaries, see pandas.DataFrame.memory_usage
+
+        Returns
+        -------
+        int
+        """
+        total = self._data.memory_usage(index=True, deep=deep).sum()
+        total += sum(values.nbytes for values in self._arrays.values())
+        if self._rows is not None:
+            total += sys.getsizeof(self._rows)
+        if self._sparse:
+            total += sys.getsizeof(self._sparse)
+            if deep:
+                total += sum(map(sys.getsizeof, self._sparse.values()))
+        return int(total)
+
+    def _subset(self, uids):
+        """
+        PropertyStore holding the rows of the given uids. Rows are copied,
+        the misc_properties dictionaries are shared with this store; writes
+        to either store replace dictionaries instead of updating them.
+
+        Parameters
+        ----------
+        uids : pd.Index
+            uids to keep; uids not in the data table are ignored
+
+        Returns
+        -------
+        PropertyStore
+        """
+        positions = self._data.index.get_indexer(uids)
+        ps = PropertyStore(
+            self._data.take(positions[positions >= 0]),
+            default_weight=self._default_weight,
+            storage=self._storage,
+        )
+        ps._columns = list(self._columns)
+        ps._defaults = deepcopy(self._defaults)
+        ps._promoted = list(self._promoted)
+        if self._sparse:
+            ps._sparse = {
+                uid: dict(self._sparse[uid])
+                for uid in ps._data.index
+                if uid in self._sparse
+            }
+        return ps
+
+    def _share(self, swap=False):
+        """
+        PropertyStore reading the same data table as this store without
+        copying it. Columns are only ever written in place by single item
+        writes, so both stores are marked as shared and the first such
+        write in either store copies the table, see _own.
+
+        Parameters
+        ----------
+        swap : bool, default=False
+            If True, the two levels of an incidence pair index are
+            exchanged, as for the incidences of the dual; the level
+            names stay in place
+
+        Returns
+        -------
+        PropertyStore
+        """
+        data = self._data.copy(deep=False)
+        if swap:
+            data.index = data.index.swaplevel(0, 1).set_names(data.index.names)
+        ps = PropertyStore(default_weight=self._default_weight, storage=self._storage)
+        ps._data = data
+        ps._columns = list(self._columns)
+        ps._defaults = deepcopy(self._defaults)
+        ps._promoted = list(self._promoted)
+        ps._sparse = {
+            (uid[::-1] if swap else uid): dict(extra)
+            for uid, extra in self._sparse.items()
+        }
+        ps._shared = self._shared = True
+        return ps
+
+    def _own(self) -> None:
+        """Copies a data table shared by _share before writing into it"""
+        if self._shared:
+            self._data = self._data.copy()
+            self._shared = False
+
+    def _drop(self, uids, level=None) -> None:
+        """
+        Removes items from the data table
+
+        Parameters
+        ----------
+        uids : list
+            uids to remove; uids not in the data table are ignored
+        level : int, optional
+            index level the uids belong to, for stores indexed by
+            incidence pairs
+        """
+        self._data = self._data.drop(labels=uids, level=level, errors="ignore")
+        self._invalidate()
+        if self._sparse:
+            dropped = set(uids)
+            for key in list(self._sparse):
+                if (key if level is None else key[level]) in dropped:
+                    del self._sparse[key]
+
+    def _invalidate(self, columns=None) -> None:
+        """
+        Clears the cached read path after a write to the data table
+
+        Parameters
+        ----------
+        columns : list, optional
+            If given, only these columns changed and the row positions are
+            still valid; otherwise rows were added, removed or reordered
+        """
+        self._version += 1
+        if columns is None:
+            self._rows = None
+            self._arrays = {}
+        else:
+            for name in columns:
+                self._arrays.pop(name, None)
+
+    def _row(self, uid):
+        """Row position of uid in the data table, None if it is not there"""
+        if self._rows is None:
+            self._rows = dict(zip(self._data.index, range(len(self._data))))
+        return self._rows.get(uid)
+
+    def _array(self, name) -> np.ndarray:
+        """Cached numpy array of a column; non-numeric columns are boxed as objects"""
+        values = self._arrays.get(name)
+        if values is None:
+            column = self._data[name]
+            if column.dtype.kind in "biuf":
+                values = column.to_numpy()
+            else:
+                values = column.to_numpy(dtype=object)
+            self._arrays[name] = values
+        return values
+
+    def _value(self, name, pos) -> Any:
+        """Value of a column at a row position, read from a cached array"""
+        value = self._array(name)[pos]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _row_dict(self, pos, columns) -> dict:
+        """Values of the columns at a row position"""
+        return {name: self._value(name, pos) for name in columns}
+
+    @property
+    def _stored_columns(self) -> list:
+        """Columns of the underlying data table"""
+        if self._storage == "columnar":
+            return self._columns[:-1] + self._promoted
+        return self._columns
+
+    def _columnarize(self) -> None:
+        """
+        Moves the misc_properties dictionaries into promoted columns and
+        the side table
+        """
+        if MISC_PROPERTIES not in self._data.columns:
+            self._columns.append(MISC_PROPERTIES)
+            return
+        cells = self._data[MISC_PROPERTIES].tolist()
+        self._data = self._data.drop(columns=MISC_PROPERTIES)
+        self._columns = [c for c in self._columns if c != MISC_PROPERTIES] + [
+            MISC_PROPERTIES
+        ]
+        uids = list(self._data.index)
+        keep = [i for i, cell in enumerate(cells) if isinstance(cell, dict) and cell]
+        self._set_misc([uids[i] for i in keep], [cells[i] for i in keep])
+
+    def _materialize(self) -> DataFrame:
+        """Rebuilds the properties table with a misc_properties column"""
+        df = self._data[self._columns[:-1]].copy()
+        cells = [{} for _ in range(len(df))]
+        for key in self._promoted:
+            values = self._data[key]
+            for pos in np.flatnonzero(values.notna().to_numpy()):
+                cells[pos][key] = values.iat[pos]
+        if self._sparse:
+            keys = list(self._sparse)
+            for pos, key in zip(self._positions(keys), keys):
+                cells[pos].update(deepcopy(self._sparse[key]))
+        df[MISC_PROPERTIES] = cells
+        return df
+
+    def _misc(self, uid, row) -> dict:
+        """
+        misc_properties of an item in columnar storage; `row` is the item's
+        row of the data table as a dictionary, promoted keys are removed from it
+        """
+        misc = {}
+        for key in self._promoted:
+            val = row.pop(key)
+            if not _isna(val):
+                misc[key] = val
+        misc.update(self._sparse.get(uid, {}))
+        return misc
+
+    def _misc_values(self, key, default) -> list:
+        """Values of a misc property for every row, `default` where it is not set"""
+        if key in self._promoted:
+            values = [
+                default if _isna(val) else val for val in self._data[key].tolist()
+            ]
+        else:
+            values = [default] * len(self._data)
+        for uid, extra in self._sparse.items():
+            if key in extra:
+                values[self._data.index.get_loc(uid)] = extra[key]
+        return values
+
+    def _set_misc(self, uids, updates, replace=False, promote=True) -> None:
+        """
+        Writes misc properties in columnar storage
+
+        Parameters
+        ----------
+        uids : list
+            uids already in the data table; may repeat
+        updates : list[dict]
+            misc properties to set for each uid
+        replace : bool, default=False
+            If True, the updates replace all misc properties of the items
+        promote : bool, default=True
+            If True, keys set for at least ``PROMOTE_FRACTION`` of the items
+            are moved into columns
+        """
+        if replace:
+            for key in self._promoted:
+                self._write_column(key, self._positions(uids), [None] * len(uids))
+            for uid in uids:
+                self._sparse.pop(uid, None)
+
+        columns = {}
+        for uid, extra in zip(uids, updates):
+            for key, val in extra.items():
+                column = columns.setdefault(key, ([], []))
+                column[0].append(uid)
+                column[1].append(val)
+        for key, (keys, values) in columns.items():
+            self._set_misc_column(key, keys, values, promote=promote)
+
+    def _set_misc_column(self, key, uids, values, promote=True) -> None:
+        """
+        Writes one misc property of many items in columnar storage
+
+        Parameters
+        ----------
+        key : str | int
+            name of the misc property
+        uids : list
+            uids already in the data table; may repeat
+        values : list
+            values aligned with uids
+        promote : bool, default=True
+            If True, the key is moved into a column if it is set for at
+            least ``PROMOTE_FRACTION`` of the items, see :meth:`_set_misc`
+        """
+        missing = Series(values, dtype=object).isna().to_numpy()
+        if (
+            promote
+            and key not in self._promoted
+            and key not in self._data.columns
+            and len(set(uids)) >= PROMOTE_FRACTION * len(self._data)
+            and not missing.any()
+        ):
+            self._promote(key)
+
+        if key in self._promoted:
+            present = ~missing
+            self._write_column(
+                key,
+                self._positions(uids),
+                [val if ok else None for val, ok in zip(values, present)],
+            )
+            for pos in np.flatnonzero(~present):
+                self._sparse.setdefault(uids[pos], {})[key] = values[pos]
+            if self._sparse:
+                for pos in np.flatnonzero(present):
+                    self._sparse.get(uids[pos], {}).pop(key, None)
+        else:
+            for uid, val in zip(uids, values):
+                self._sparse.setdefault(uid, {})[key] = val
+        for uid in set(uids):
+            if uid in self._sparse and not self._sparse[uid]:
+                del self._sparse[uid]
+
+    def _promote(self, key) -> None:
+        """Moves a misc property from the side table into its own column"""
+        values = [None] * len(self._data)
+        for uid, extra in self._sparse.items():
+            if key in extra and not _isna(extra[key]):
+                values[self._data.index.get_loc(uid)] = extra.pop(key)
+        self._data[key] = Series(values, index=self._data.index).infer_objects()
+        self._promoted.append(key)
+
+
+def _isna(value) -> bool:
+    """True if value is a missing scalar (None or NaN)"""
+    return np.ndim(value) == 0 and bool(pd.isna(value))
+
 
 def flatten(my_dict):
     """
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict, namedtuple
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy.sparse import issparse
+
+__all__ = ["StateCache"]
+
+# what a cached value is computed from: the incidence pairs, or the
+# properties of the edges or of the nodes
+SOURCES = ("incidences", "edges", "nodes")
+
+_Entry = namedtuple("_Entry", ["value", "nbytes", "depends", "item"])
+_MISSING = object()
+
+
+class StateCache:
+    """
+    Values computed from a hypergraph, such as its s-adjacency matrices,
+    s-linegraphs and s-neighbors, together with their sizes and what they
+    were computed from.
+
+    Every entry depends on some of the sources "incidences", "edges" and
+    "nodes" (the properties of the edges or nodes). A change to a source
+    increments :attr:`version` and drops the entries that depend on it.
+    An entry may also belong to one edge or node, like the s-neighbors of
+    a node; it survives a change of the incidences that does not involve
+    its item. If a memory budget is set, the least recently used entries
+    are evicted until the others fit in it.
+
+    Parameters
+    ----------
+    budget : int, optional, default=None
+        bytes the entries may hold, None for no limit
+    """
+
+    def __init__(self, budget=None):
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._budget = budget
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def version(self):
+        """
+        Number of changes of the hypergraph seen by the cache
+
+        Returns
+        -------
+        int
+        """
+        return self._version
+
+    @property
+    def budget(self):
+        """
+        Bytes the entries may hold, None for no limit. Lowering it evicts
+        the least recently used entries.
+
+        Returns
+        -------
+        int | None
+        """
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget):
+        self._budget = budget
+        self._evict()
+
+    @property
+    def nbytes(self):
+        """
+        Approximate bytes held by the entries
+
+        Returns
+        -------
+        int
+        """
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        """
+        Value of the entry, marked as recently used, or default
+
+        Parameters
+        ----------
+        key : hashable
+        default : optional, default=None
+
+        Returns
+        -------
+        object
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def items(self):
+        """
+        Keys and values of the entries, least recently used first, without
+        marking them as used
+
+        Returns
+        -------
+        list of tuples
+        """
+        return [(key, entry.value) for key, entry in self._entries.items()]
+
+    def sizes(self):
+        """
+        Approximate bytes of each entry
+
+        Returns
+        -------
+        dict
+        """
+        return {key: entry.nbytes for key, entry in self._entries.items()}
+
+    def lookup(self, key, compute, depends=("incidences",), item=None):
+        """
+        Value of the entry, computed and stored if it is missing
+
+        Parameters
+        ----------
+        key : hashable
+        compute : callable
+            called without arguments to compute the value
+        depends, item :
+            see :meth:`put`
+
+        Returns
+        -------
+        object
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, compute(), depends=depends, item=item)
+        return value
+
+    def put(self, key, value, depends=("incidences",), item=None):
+        """
+        Stores a value, evicting the least recently used entries if the
+        budget is exceeded. A value larger than the budget is not stored.
+
+        Parameters
+        ----------
+        key : hashable
+        value : object
+        depends : tuple of str, optional, default=("incidences",)
+            sources the value is computed from, see :class:`StateCache`
+        item : tuple, optional, default=None
+            ("edges", uid) or ("nodes", uid) if the value belongs to one
+            edge or node
+
+        Returns
+        -------
+        object
+            value
+        """
+        self._drop(key)
+        nbytes = _nbytes(value, deep=True)
+        if self._budget is not None and nbytes > self._budget:
+            return value
+        self._entries[key] = _Entry(value, nbytes, tuple(depends), item)
+        self._nbytes += nbytes
+        self._evict()
+        return value
+
+    def invalidate(self, *sources, edges=None, nodes=None):
+        """
+        Records a change of the given sources and drops the entries that
+        depend on them. If the edges and nodes involved in a change of
+        the incidences are given, entries of other items are kept.
+
+        Parameters
+        ----------
+        *sources : str
+            "incidences", "edges" or "nodes"
+        edges, nodes : Iterable, optional, default=None
+            uids of the edges and nodes whose incidences changed
+        """
+        unknown = set(sources) - set(SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown sources {unknown}, expected some of {SOURCES}")
+        self._version += 1
+        scoped = edges is not None or nodes is not None
+        items = {("edges", uid) for uid in edges or []}
+        items.update(("nodes", uid) for uid in nodes or [])
+        for key, entry in list(self._entries.items()):
+            if not set(entry.depends).intersection(sources):
+                continue
+            if entry.item is None or not scoped or entry.item in items:
+                self._drop(key)
+
+    def clear(self):
+        """Drops every entry and records a change of all sources"""
+        self._version += 1
+        self._entries.clear()
+        self._nbytes = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def _evict(self):
+        if self._budget is None:
+            return
+        while self._entries and self._nbytes > self._budget:
+            _, entry = self._entries.popitem(last=False)
+            self._nbytes -= entry.nbytes
+            self.evictions += 1
+
+
+def _nbytes(value, deep=False):
+    """
+    Approximate bytes of a cached value: arrays, sparse matrices and
+    pandas objects by their buffers, graphs by their adjacency
+    dictionaries, python containers by their own size and that of their
+    values.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=deep).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=deep))
+    if issparse(value):
+        return sum(
+            getattr(value, attr).nbytes
+            for attr in ["data", "indices", "indptr", "row", "col"]
+            if hasattr(value, attr)
+        )
+    if isinstance(value, nx.Graph):
+        return sum(
+            sys.getsizeof(d) + sum(map(sys.getsizeof, d.values()))
+            for d in [value._adj, value._node]
+        )
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_nbytes(v, deep) for v in value.values())
+    elif isinstance(value, (list, tuple, set)) and deep:
+        size += sum(_nbytes(v, deep) for v in value)
+    return size
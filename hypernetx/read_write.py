@@ -1,7 +1,19 @@
 # Copyright © 2018 Battelle Memorial Institute
 # All rights reserved.
 
+import json
 import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from hypernetx.exception import HyperNetXError
+
+FORMAT = "hypernetx"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+LEVELS = ("edges", "nodes", "incidences")
 
 
 def to_pickle(obj, filename):
@@ -15,3 +27,253 @@ def load_from_pickle(filepath):
     with open(filepath, "rb") as f:
         temp = pickle.load(f)
     return temp
+
+
+def save(H, path):
+    """
+    Writes a hypergraph to a directory in the native binary format.
+
+    The incidences are stored as int32 edge and node codes together with
+    their compressed CSR (edge -> nodes) and CSC (node -> edges) arrays,
+    one ``.npy`` file each. Edge and node uids are stored once in a
+    vocabulary file per level and every property table refers to them by
+    code; numeric property columns are ``.npy`` files, all other columns,
+    the defaults and the misc properties are pickled. ``manifest.json``
+    lists the files and the settings of the hypergraph.
+
+    Parameters
+    ----------
+    H : Hypergraph
+    path : str | pathlib.Path
+        directory to write to; created if needed, files of an earlier
+        save are overwritten
+
+    See Also
+    --------
+    load
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    store = H.incidences.incidence_store
+    codes = store._coded()
+    stores = {
+        "edges": H.edges.property_store,
+        "nodes": H.nodes.property_store,
+        "incidences": H.incidences.property_store,
+    }
+    pairs = stores["incidences"]._data.index
+
+    # uids of the incidences come first so the incidence codes index the
+    # vocabulary directly, uids that only have properties follow
+    vocabularies = []
+    for level, key in enumerate(["edge_index", "node_index"]):
+        index = codes[key]
+        extra = [
+            uids[~uids.isin(index)]
+            for uids in [
+                stores[LEVELS[level]]._data.index,
+                pd.Index(pairs.get_level_values(level), tupleize_cols=False),
+            ]
+        ]
+        extra = [uids for uids in extra if len(uids)]
+        if extra:
+            index = index.append(extra).unique()
+        vocabularies.append(index)
+        _save_array(path, f"uids.{LEVELS[level]}", _uid_array(vocabularies[-1]))
+
+    _save_array(path, "incidences.edges", codes["edges"])
+    _save_array(path, "incidences.nodes", codes["nodes"])
+    for name in ["csr", "csc"]:
+        indptr, indices = store._compressed(name)
+        _save_array(path, f"{name}.indptr", indptr)
+        _save_array(path, f"{name}.indices", indices)
+
+    properties = {}
+    for level, ps in stores.items():
+        if level == "incidences":
+            rows = [
+                vocabularies[i].get_indexer(pairs.get_level_values(i)) for i in [0, 1]
+            ]
+        else:
+            rows = [vocabularies[LEVELS.index(level)].get_indexer(ps._data.index)]
+        properties[level] = _save_properties(path, level, ps, rows)
+
+    manifest = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "name": _jsonable(H.name),
+        "backend": store.backend,
+        "edges_first": store._edges_first,
+        "storage": stores["incidences"].storage,
+        "dtype_policy": H.dtype_policy,
+        "shape": [len(codes["edge_index"]), len(codes["node_index"])],
+        "incidences": len(codes["edges"]),
+        "properties": properties,
+    }
+    with open(path / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load(path, mmap=True):
+    """
+    Reads a hypergraph written by :func:`save`.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path
+        directory holding the hypergraph
+    mmap : bool, optional, default=True
+        If True, the incidence arrays and numeric property columns are
+        memory-mapped read-only instead of read into memory, so that
+        processes loading the same hypergraph share one copy through
+        the page cache. A property table is copied into memory the first
+        time one of its values is set.
+
+    Returns
+    -------
+    Hypergraph
+
+    Raises
+    ------
+    HyperNetXError
+        If the directory does not hold a hypergraph in this format or
+        was written by a later version
+    """
+    from hypernetx.classes import Hypergraph, IncidenceStore, PropertyStore
+
+    path = Path(path)
+    try:
+        with open(path / MANIFEST) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise HyperNetXError(f"No {MANIFEST} found in {path}")
+    if manifest.get("format") != FORMAT or manifest.get("version", 0) > FORMAT_VERSION:
+        raise HyperNetXError(f"{path} does not hold a supported hypergraph format")
+    mode = "r" if mmap else None
+
+    vocabularies = [
+        pd.Index(_load_array(path, f"uids.{level}", None), tupleize_cols=False)
+        for level in LEVELS[:2]
+    ]
+    n_edges, n_nodes = manifest["shape"]
+    store = IncidenceStore._derived(manifest["backend"], manifest["edges_first"])
+    store._set_codes(
+        _load_array(path, "incidences.edges", mode),
+        _load_array(path, "incidences.nodes", mode),
+        vocabularies[0][:n_edges],
+        vocabularies[1][:n_nodes],
+    )
+    for name in ["csr", "csc"]:
+        store._codes[name] = (
+            _load_array(path, f"{name}.indptr", mode),
+            _load_array(path, f"{name}.indices", mode),
+        )
+    if store.backend == "pandas":
+        data = store._frame()
+        store._data = data if store._edges_first else data[["nodes", "edges"]]
+
+    stores = {}
+    for level in LEVELS:
+        meta = manifest["properties"][level]
+        with open(path / meta["objects"], "rb") as f:
+            objects = pickle.load(f)
+        rows = [_load_array(path, name, None) for name in meta["rows"]]
+        if level == "incidences":
+            index = pd.MultiIndex.from_arrays(
+                [vocabularies[i].take(rows[i]) for i in [0, 1]],
+                names=objects["index_names"],
+            )
+        else:
+            index = vocabularies[LEVELS.index(level)].take(rows[0])
+            index.name = objects["index_names"][0]
+        arrays = {i: _load_array(path, file, mode) for i, file in meta["arrays"]}
+        columns = {
+            name: arrays[i] if i in arrays else objects["columns"][name]
+            for i, name in enumerate(objects["names"])
+        }
+        ps = PropertyStore(
+            default_weight=objects["default_weight"], storage=manifest["storage"]
+        )
+        ps._data = pd.DataFrame(columns, index=index, copy=False)
+        ps._columns = objects["stored"]
+        ps._defaults = objects["defaults"]
+        ps._promoted = objects["promoted"]
+        ps._sparse = objects["sparse"]
+        # memory-mapped columns are read-only, see PropertyStore._own
+        ps._shared = mmap
+        stores[level] = ps
+
+    return Hypergraph._assemble(
+        store,
+        stores["incidences"],
+        stores["edges"],
+        stores["nodes"],
+        name=manifest["name"],
+        dtype_policy=manifest.get("dtype_policy", "wide"),
+    )
+
+
+def _save_properties(path, level, ps, rows):
+    """Writes one property table; returns its entry of the manifest"""
+    data = ps._data
+    names = data.columns.tolist()
+    row_files = []
+    for i, codes in enumerate(rows):
+        row_files.append(f"properties.{level}.rows{i}")
+        _save_array(path, row_files[-1], codes.astype(np.int64))
+    arrays, objects = [], {}
+    for i, name in enumerate(names):
+        column = data.iloc[:, i]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+            arrays.append([i, f"properties.{level}.{i}"])
+            _save_array(path, arrays[-1][1], column.to_numpy())
+        else:
+            objects[name] = column.to_numpy(dtype=object)
+    with open(path / f"properties.{level}.pkl", "wb") as f:
+        pickle.dump(
+            {
+                "names": names,
+                "columns": objects,
+                "index_names": list(data.index.names),
+                "stored": ps._columns,
+                "defaults": ps._defaults,
+                "default_weight": ps._default_weight,
+                "promoted": ps._promoted,
+                "sparse": ps._sparse,
+            },
+            f,
+        )
+    return {
+        "rows": row_files,
+        "arrays": arrays,
+        "objects": f"properties.{level}.pkl",
+    }
+
+
+def _uid_array(index):
+    """Uids as a numpy array, strings as a fixed width unicode array"""
+    values = index.to_numpy()
+    if values.dtype == object and pd.api.types.infer_dtype(values) == "string":
+        values = values.astype(str)
+    return values
+
+
+def _save_array(path, name, values):
+    np.save(path / f"{name}.npy", np.asarray(values), allow_pickle=True)
+
+
+def _load_array(path, name, mmap_mode):
+    values = np.load(path / f"{name}.npy", allow_pickle=True, mmap_mode=mmap_mode)
+    if isinstance(values, np.memmap):
+        # a plain array view of the mapped file
+        values = values.view(np.ndarray)
+    return values
+
+
+def _jsonable(value):
+    """value if json can write it, otherwise its string"""
+    try:
+        json.dumps(value)
+    except TypeError:
+        return str(value)
+    return value
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+
+import hypernetx as hnx
+from hypernetx import Hypergraph
+from hypernetx.classes.disk_cache import DiskCache
+
+
+def test_fingerprint(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    assert h.fingerprint() == Hypergraph(sevenbysix.edgedict).fingerprint()
+
+    fingerprint = h.fingerprint()
+    h.incidences[(sevenbysix.edges.P, sevenbysix.nodes.C)].weight = 5
+    assert h.fingerprint() != fingerprint
+
+    fingerprint = h.fingerprint()
+    h.add_incidence(sevenbysix.edges.L, sevenbysix.nodes.T1)
+    assert h.fingerprint() != fingerprint
+
+
+def test_fingerprint_of_mixed_uids(tmp_path):
+    setsystem = {"a": [(1, 2), 3], "b": [3], (4, "x"): [1.5]}
+    h = Hypergraph(setsystem)
+    assert h.fingerprint() == Hypergraph(setsystem).fingerprint()
+    # equal string forms of different uids are told apart
+    assert (
+        Hypergraph({"a": [1], "b": ["1"]}).fingerprint()
+        != Hypergraph({"a": ["1"], "b": [1]}).fingerprint()
+    )
+    assert (
+        Hypergraph({"a": [(1, 2)]}).fingerprint()
+        != Hypergraph({"a": ["(1, 2)"]}).fingerprint()
+    )
+
+    h.disk_cache = tmp_path
+    expected = hnx.s_closeness_centrality(Hypergraph(setsystem))
+    assert hnx.s_closeness_centrality(h) == expected
+    h.adjacency_matrix()
+    # with the edge adjacency matrix computed for the centrality
+    assert len(h.disk_cache) == 3
+
+
+def test_disk_cache_reloads_results(sevenbysix, tmp_path):
+    h = Hypergraph(sevenbysix.edgedict, disk_cache=tmp_path)
+    matrix = h.adjacency_matrix(s=2)
+    centrality = hnx.s_betweenness_centrality(h, s=1)
+    betti = hnx.betti_numbers(h)
+    # with the edge adjacency matrix computed for the betweenness
+    assert len(h.disk_cache) == 4
+
+    # a new hypergraph with the same content, as in a later process
+    h2 = Hypergraph(sevenbysix.edgedict, disk_cache=DiskCache(tmp_path))
+    assert (h2.adjacency_matrix(s=2) != matrix).nnz == 0
+    assert hnx.s_betweenness_centrality(h2, s=1) == centrality
+    assert hnx.betti_numbers(h2) == betti
+    assert h2.disk_cache.hits == 3 and h2.disk_cache.misses == 0
+
+    h2.edge_adjacency_matrix(s=1)
+    assert h2.disk_cache.hits == 4
+    h2.adjacency_matrix(s=3)
+    assert h2.disk_cache.misses == 1
+    assert len(h2.disk_cache) == 5
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path)
+    for key in ["a", "b", "c"]:
+        cache.put("f", (key,), np.zeros(100))
+    size = cache.nbytes // 3
+    paths = {key: cache._path("f", (key,)) for key in ["a", "b", "c"]}
+    for age, key in enumerate(["b", "a", "c"]):
+        mtime = 1000 + age
+        os.utime(paths[key], (mtime, mtime))
+
+    cache.max_bytes = 2 * size
+    assert cache.get("f", ("b",)) is None
+    assert cache.get("f", ("a",)) is not None
+    assert cache.evictions == 1
+
+    cache.put("f", ("big",), np.zeros(1000))
+    assert cache.get("f", ("big",)) is None
+    assert cache.lookup("f", ("d",), lambda: 1) == 1
+    assert len(cache) == 2
@@ -35,6 +35,69 @@ def test_constructor_on_dict_of_edges_to_nodes(sevenbysix):
     assert hg.order() == len(sevenbysix.nodes)
 
 
+def test_constructor_on_mixed_dict_of_edges():
+    setsystem = {
+        "A": [1, 2],
+        "B": {2: {"weight": 3, "color": "red"}, 3: {}},
+        "C": (x for x in [3, 4]),
+    }
+    h = Hypergraph(setsystem)
+    assert h.incidence_dict == {"A": [1, 2], "B": [2, 3], "C": [3, 4]}
+    assert h.incidences[("B", 2)].weight == 3
+    assert h.incidences[("B", 2)].color == "red"
+    assert h.incidences[("A", 1)].weight == 1
+    assert h.incidences[("A", 1)].properties["misc_properties"] == {}
+    # the attribute dictionaries of the setsystem are left as given
+    assert setsystem["B"][2] == {"weight": 3, "color": "red"}
+    # plain iterables give float default weights, so the column is float
+    assert h.incidences.property_store.properties["weight"].dtype == np.float64
+    h.incidences[("A", 1)].weight = 0.5
+    assert h.incidences[("A", 1)].weight == 0.5
+
+
+@pytest.mark.parametrize(
+    "aggregate_by, weights",
+    [
+        ("first", [1.0, 2.0, 3.0]),
+        ({"weight": "sum"}, [5.0, 2.0, 4.0]),
+        ("count", [2, 1, 2]),
+        ("mean", [2.5, 2.0, 2.0]),
+    ],
+)
+def test_constructor_aggregates_repeated_incidences(aggregate_by, weights):
+    df = pd.DataFrame(
+        {
+            "e": ["A", "A", "B", "A", "B"],
+            "n": [1, 2, 1, 1, 1],
+            "w": [1.0, 2.0, 3.0, 4.0, None],
+            "props": [{"a": 1}, {}, {"b": 2}, {"a": 5, "c": 3}, {}],
+        }
+    )
+    h = Hypergraph(
+        df,
+        edge_col="e",
+        node_col="n",
+        cell_weight_col="w",
+        misc_cell_properties_col="props",
+        aggregate_by=aggregate_by,
+    )
+    assert h.incidence_dict == {"A": [1, 2], "B": [1]}
+    assert h.incidences.dataframe["weight"].tolist() == weights
+    merged = {"a": 1} if aggregate_by == "first" else {"a": 5, "c": 3}
+    assert h.incidences.dataframe["misc_properties"].iloc[0] == merged
+
+    chunks = [df.iloc[:2], df.iloc[2:4], df.iloc[4:]]
+    hc = Hypergraph.from_dataframe_chunks(
+        chunks,
+        edge_col="e",
+        node_col="n",
+        cell_weight_col="w",
+        misc_cell_properties_col="props",
+        aggregate_by=aggregate_by,
+    )
+    assert hc.incidences.dataframe.equals(h.incidences.dataframe)
+
+
 def test_constructor_on_dataframe(sevenbysix):
     hg = Hypergraph(sevenbysix.dataframe)
     assert len(hg.edges) == len(sevenbysix.edges)
@@ -151,6 +214,76 @@ def test_from_numpy_array_with_key():
     assert "C" not in h.edges["a"]
 
 
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_from_coo(sevenbysix, backend):
+    h = Hypergraph(sevenbysix.edgedict)
+    edges, nodes = list(h.edges), list(h.nodes)
+    edge_idx = [edges.index(e) for e, n in h.incidences]
+    node_idx = [nodes.index(n) for e, n in h.incidences]
+    weights = np.arange(len(edge_idx), dtype=float)
+
+    hc = Hypergraph.from_coo(
+        np.array(edge_idx + edge_idx[:2]),
+        np.array(node_idx + node_idx[:2]),
+        weights=np.concatenate([weights, [10.0, 20.0]]),
+        edge_labels=edges + ["unused"],
+        node_labels=nodes,
+        aggregate_by={"weight": "sum"},
+        edge_properties=pd.DataFrame({"uid": [edges[0]], "color": ["red"]}),
+        incidence_backend=backend,
+    )
+    assert hc.incidence_dict == h.incidence_dict
+    assert "unused" not in hc.edges
+    assert hc.edges[edges[0]].color == "red"
+    pairs = list(h.incidences)
+    assert hc.incidences[pairs[0]].weight == 10.0
+    assert hc.incidences[pairs[2]].weight == 2.0
+
+    with pytest.raises(HyperNetXError):
+        Hypergraph.from_coo(np.array([0, 5]), np.array([0, 1]), edge_labels=["A"])
+
+
+def test_from_scipy_sparse(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    M, node_labels, edge_labels = h.incidence_matrix(index=True)
+    hs = Hypergraph.from_scipy_sparse(
+        scipy.sparse.csc_matrix(M), edge_labels=edge_labels, node_labels=node_labels
+    )
+    assert {e: sorted(v) for e, v in hs.incidence_dict.items()} == {
+        e: sorted(v) for e, v in h.incidence_dict.items()
+    }
+    assert (hs.incidence_matrix() != M).nnz == 0
+
+
+def test_from_incidence_matrix_keeps_constructor_arguments(tmp_path):
+    M = np.array([[1, 0], [1, 1], [0, 1]])
+    h = Hypergraph.from_incidence_matrix(
+        M,
+        properties={0: {"color": "r"}, 2: {"weight": 4}},
+        dtype_policy="narrow",
+        cache_budget=1000,
+        disk_cache=tmp_path,
+    )
+    assert h.edges[0].color == "r"
+    assert h.nodes[0].color == "r"
+    assert h.nodes[2].weight == 4
+    assert h.dtype_policy == "narrow"
+    assert h.state_cache.budget == 1000
+    assert h.disk_cache.directory == tmp_path
+
+    h = Hypergraph.from_incidence_matrix(
+        M,
+        edge_properties={1: {"kind": "b"}},
+        node_properties=pd.DataFrame({"uid": [1], "w": [3]}),
+        node_weight_prop_col="w",
+    )
+    assert h.edges[1].kind == "b"
+    assert h.nodes[1].weight == 3
+
+    with pytest.raises(TypeError):
+        Hypergraph.from_incidence_matrix(M, edge_col="edges")
+
+
 def test_from_numpy_array_raises_error_incorrect_dimensions():
     with pytest.raises(HyperNetXError):
         np_data = np.array([])
@@ -1102,6 +1235,43 @@ def test_incidence_matrix(sevenbysix):
     assert edges_idx.tolist() == list(sevenbysix.edges)
 
 
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_incidence_matrix_is_cached(backend):
+    h = Hypergraph(
+        pd.DataFrame({"e": ["B", "A", "A"], "n": [1, 2, 1], "w": [3.0, 5.0, 7.0]}),
+        cell_weight_col="w",
+        incidence_backend=backend,
+    )
+    assert h.incidence_matrix() is h.incidence_matrix()
+    assert h.incidence_matrix(format="csc").format == "csc"
+
+    def weight(matrix, edge, node):
+        return matrix[h.nodes._index.get_loc(node), h.edges._index.get_loc(edge)]
+
+    matrix = h.incidence_matrix(weights=True)
+    assert h.incidence_matrix(weights=True) is matrix
+    assert [weight(matrix, "B", 1), weight(matrix, "A", 2)] == [3.0, 5.0]
+
+    h.incidences[("A", 1)].weight = 9.0
+    assert weight(h.incidence_matrix(weights=True, format="csc"), "A", 1) == 9.0
+    h.add_incidence("C", 2, weight=4.0)
+    matrix = h.incidence_matrix(weights=True)
+    assert matrix.shape == (2, 3)
+    assert [weight(matrix, "A", 1), weight(matrix, "C", 2)] == [9.0, 4.0]
+    with pytest.raises(HyperNetXError):
+        h.incidence_matrix(format="coo")
+
+    # neighbors read the count matrices cached once per orientation
+    h.neighbors(1)
+    counts = h.state_cache[("count_matrix", False)]
+    h.neighbors(2)
+    h.edge_neighbors("A")
+    assert h.state_cache[("count_matrix", False)] is counts
+    assert h.state_cache[("count_matrix", True)].shape == (3, 2)
+    h.add_incidence("C", 1)
+    assert ("count_matrix", False) not in h.state_cache
+
+
 def test_adjacency_matrix(sevenbysix):
     hg = Hypergraph(sevenbysix.edgedict)
 
@@ -1438,6 +1608,111 @@ def test_dual(sevenbysix):
     assert list(h.dataframe.columns) == list(hd.dataframe.columns)
 
 
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_dual_shares_parent_structures(sevenbysix, backend):
+    h = Hypergraph(sevenbysix.edgedict, incidence_backend=backend)
+    h.incidences[("I", "K")].weight = 3
+    adjacency = h.edge_adjacency_matrix(s=2)
+
+    hd = h.dual(share_properties=False)
+    assert hd.incidence_dict == h.nodes.memberships
+    assert hd.incidences[("K", "I")].weight == 3
+    assert hd.adjacency_matrix(s=2) is adjacency
+    assert list(hd.adjacency_matrix(s=2, index=True)[1]) == list(
+        h.edge_adjacency_matrix(s=2, index=True)[1]
+    )
+
+    # writes and edits in the dual do not reach the hypergraph
+    hd.incidences[("K", "I")].weight = 5
+    hd.nodes["I"].color = "red"
+    hd.add_incidence("I", "Z")
+    assert h.incidences[("I", "K")].weight == 3
+    assert "color" not in h.edges["I"].properties
+    assert "Z" not in h.edges
+    assert h.edge_adjacency_matrix(s=2) is adjacency
+
+
+def test_adjacency_matrices(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    matrices, labels = h.adjacency_matrices([1, 2, 3], edges=True, index=True)
+    assert list(labels) == list(h.edge_adjacency_matrix(index=True)[1])
+    expected = Hypergraph(sevenbysix.edgedict)
+    for s, matrix in matrices.items():
+        assert (matrix != expected.edge_adjacency_matrix(s=s)).nnz == 0
+    # the overlaps are counted once for all values of s
+    assert [key for key in h.state_cache if key[0] == "overlaps"] == [
+        ("overlaps", True)
+    ]
+    assert h.state_cache[("overlaps", True)].dtype == np.uint16
+
+    hd = h.dual()
+    assert ("overlaps", False) in hd.state_cache
+    assert (hd.adjacency_matrices([4])[4] != h.edge_adjacency_matrix(s=4)).nnz == 0
+
+
+def test_dtype_policy(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict, dtype_policy="narrow")
+    wide = Hypergraph(sevenbysix.edgedict)
+    assert wide.dtype_policy == "wide"
+    assert h.incidence_matrix().dtype == np.int8
+    assert wide.incidence_matrix().dtype == np.int64
+    for s in [1, 2]:
+        assert h.adjacency_matrix(s=s).dtype == np.int8
+        assert wide.adjacency_matrix(s=s).dtype == np.int64
+        assert (h.adjacency_matrix(s=s) != wide.adjacency_matrix(s=s)).nnz == 0
+        assert (
+            h.edge_adjacency_matrix(s=s) != wide.edge_adjacency_matrix(s=s)
+        ).nnz == 0
+    assert h.dual().dtype_policy == "narrow"
+    assert h.restrict_to_edges(["I", "L"]).dtype_policy == "narrow"
+
+    h.dtype_policy = "wide"
+    assert h.adjacency_matrix().dtype == np.int64
+    with pytest.raises(HyperNetXError):
+        h.dtype_policy = "tiny"
+
+    # overlaps beyond the range of the int8 entries are counted exactly
+    for policy in ["narrow", "wide"]:
+        many = Hypergraph({i: ["A", "B", i] for i in range(300)}, dtype_policy=policy)
+        assert many.neighbors("A", s=300) == ["B"]
+        assert many.adjacency_matrix(s=300).nnz == 2
+
+
+def test_default_matrices_do_not_overflow():
+    # three edges sharing 200 nodes
+    h = Hypergraph({e: list(range(200)) for e in ["A", "B", "C"]})
+    M = h.incidence_matrix()
+    assert (M.T @ M).max() == 200
+    assert (h.adjacency_matrix() @ h.adjacency_matrix()).max() == 199
+    assert h.edge_adjacency_matrix(s=200).nnz == 6
+
+
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_memory_usage(sevenbysix, backend):
+    setsystem = sevenbysix.edgedict
+    h = Hypergraph(setsystem, incidence_backend=backend)
+    assert "setsystem" not in h.__dict__
+    assert not hasattr(h, "_dataframe")
+    assert hasattr(Hypergraph(setsystem, lean=False), "_dataframe")
+
+    usage = h.memory_usage()
+    assert list(usage.index) == [
+        "incidence_store",
+        "incidences",
+        "edges",
+        "nodes",
+        "state",
+    ]
+    assert (usage[["incidence_store", "incidences"]] > 0).all()
+    assert (h.memory_usage(deep=True) >= usage).all()
+    h.adjacency_matrix()
+    assert h.memory_usage()["state"] > usage["state"]
+
+    shared = Hypergraph(setsystem, properties={"A": {"color": "red"}})
+    assert shared.memory_usage()["edges"] > 0
+    assert shared.memory_usage()["nodes"] == 0
+
+
 @pytest.mark.filterwarnings("ignore:No 3-path between ME and FN")
 def test_distance(lesmis):
     h = Hypergraph(lesmis.edgedict)
@@ -1847,3 +2122,262 @@ def test_properties(sevenbysix):
     df_differences = props.compare(sevenbysix.properties)
 
     assert df_differences.empty
+
+
+def test_csr_incidence_backend(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    hc = Hypergraph(sevenbysix.edgedict, incidence_backend="csr")
+    assert hc.incidences.incidence_store.backend == "csr"
+    assert hc.shape == h.shape
+    assert hc.incidence_dict == h.incidence_dict
+    assert (hc.incidence_matrix() != h.incidence_matrix()).nnz == 0
+    assert set(hc.neighbors(sevenbysix.nodes.A)) == set(h.neighbors(sevenbysix.nodes.A))
+    hr = hc.restrict_to_edges([sevenbysix.edges.P, sevenbysix.edges.I])
+    assert hr.incidences.incidence_store.backend == "csr"
+    assert (
+        hr.shape == h.restrict_to_edges([sevenbysix.edges.P, sevenbysix.edges.I]).shape
+    )
+
+
+def test_incremental_mutation_keeps_unaffected_state(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    store = h.incidences.incidence_store
+    nodes = sevenbysix.nodes
+    h.neighbors(nodes.V)
+    h.neighbors(nodes.C)
+    h.adjacency_matrix()
+
+    h.add_incidence(sevenbysix.edges.L, nodes.T1)
+    assert h.incidences.incidence_store is store
+    # V does not share an edge with L or T1, so its cached neighbors survive
+    assert ("neighbors", 1, nodes.V) in h.state_cache
+    assert ("neighbors", 1, nodes.C) not in h.state_cache
+    assert ("adjacency_matrix", 1) not in h.state_cache
+    assert nodes.T1 in h.neighbors(nodes.C)
+
+    rebuilt = Hypergraph(h.incidences.to_dataframe.reset_index())
+    assert h.shape == rebuilt.shape
+    for node in h.nodes:
+        assert set(h.neighbors(node)) == set(rebuilt.neighbors(node))
+
+    h.remove_nodes([nodes.T1])
+    assert nodes.T1 not in h.nodes
+    assert nodes.T1 not in h.neighbors(nodes.C)
+    assert h.shape == (6, 6)
+
+
+def test_inplace_additions_append_labels():
+    h = Hypergraph({"A": [1, 2], "B": [2, 3]})
+    copy = h.add_incidence("C", 0, inplace=False)
+    h.add_incidence("C", 0)
+
+    matrix, nodes, edges = h.incidence_matrix(index=True)
+    other, other_nodes, other_edges = copy.incidence_matrix(index=True)
+    # new uids come last in place, the rebuilt hypergraph orders them anew
+    assert list(nodes) == [1, 2, 3, 0]
+    assert list(other_nodes) == [0, 1, 2, 3]
+    assert list(h.adjacency_matrix(index=True)[1]) == list(nodes)
+
+    # the matrices agree once rows and columns are matched by label
+    rows = [list(nodes).index(n) for n in other_nodes]
+    cols = [list(edges).index(e) for e in other_edges]
+    assert (matrix[rows][:, cols] != other).nnz == 0
+
+
+def test_batch_matches_sequential_edits(sevenbysix):
+    nodes = sevenbysix.nodes
+    edges = sevenbysix.edges
+    sequential = Hypergraph(sevenbysix.edgedict)
+    batched = Hypergraph(sevenbysix.edgedict)
+
+    for h in (sequential, batched):
+        h.neighbors(nodes.V)
+    with batched.batch():
+        batched.add_incidence(edges.L, nodes.T1, weight=3)
+        batched.add_incidences_from([(edges.I, nodes.V), ("X", nodes.A)])
+        batched.add_node("Z", color="red")
+        batched.remove_edges([edges.O])
+        # reads see the state from before the batch
+        assert edges.O in batched.edges
+    sequential.add_incidence(edges.L, nodes.T1, weight=3)
+    sequential.add_incidences_from([(edges.I, nodes.V), ("X", nodes.A)])
+    sequential.add_node("Z", color="red")
+    sequential.remove_edges([edges.O])
+
+    assert batched.shape == sequential.shape
+    assert batched.incidence_dict == sequential.incidence_dict
+    assert batched.nodes.property_store.get_property("Z", "color") == "red"
+    assert (
+        batched.incidences.property_store.get_property((edges.L, nodes.T1), "weight")
+        == 3
+    )
+    for node in sequential.nodes:
+        assert set(batched.neighbors(node)) == set(sequential.neighbors(node))
+
+
+def test_batch_rollback(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    with pytest.raises(ValueError):
+        with h.batch():
+            h.add_incidence("X", "Y")
+            h.remove_nodes([sevenbysix.nodes.A])
+            raise ValueError
+    assert h.shape == (7, 6)
+    assert "X" not in h.edges
+
+    h.begin()
+    with pytest.raises(HyperNetXError):
+        h.begin()
+    h.add_incidence("X", "Y")
+    h.rollback()
+    with pytest.raises(HyperNetXError):
+        h.commit()
+    assert "X" not in h.edges
+
+    # properties set on the views are written at once, not buffered
+    with pytest.raises(ValueError):
+        with h.batch():
+            h.edges[sevenbysix.edges.P].color = "red"
+            raise ValueError
+    assert h.edges[sevenbysix.edges.P].color == "red"
+
+
+def test_batch_commit_failure_drops_state(sevenbysix, monkeypatch):
+    h = Hypergraph(sevenbysix.edgedict)
+    h.adjacency_matrix()
+    h.neighbors(sevenbysix.nodes.V)
+
+    def fail(uids, level):
+        raise RuntimeError("store failure")
+
+    h.begin()
+    h.add_incidence(sevenbysix.edges.L, "Z")
+    h.remove_edges([sevenbysix.edges.O])
+    monkeypatch.setattr(h, "_remove_items_inplace", fail)
+    with pytest.raises(RuntimeError):
+        h.commit()
+
+    # the add was applied before the failure and nothing stale is served
+    assert ("adjacency_matrix", 1) not in h.state_cache
+    assert ("neighbors", 1, sevenbysix.nodes.V) not in h.state_cache
+    assert h.adjacency_matrix().shape == (8, 8)
+    assert h._batch is None
+
+
+def test_columnar_property_storage(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    hc = Hypergraph(sevenbysix.edgedict, property_storage="columnar")
+    for hyp in (h, hc):
+        hyp.add_incidence("X", sevenbysix.nodes.A, color="red")
+        hyp.edges.property_store.set_property_column("rank", {"X": 1})
+    assert hc.restrict_to_edges(["X"]).edges.property_store.storage == "columnar"
+    pd.testing.assert_frame_equal(hc.incidences.dataframe, h.incidences.dataframe)
+    pd.testing.assert_frame_equal(hc.edges.dataframe, h.edges.dataframe)
+
+
+def test_restrict_shares_properties_until_written(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    edges, nodes = sevenbysix.edges, sevenbysix.nodes
+    h.edges[edges.P].color = "red"
+    h.incidences[(edges.P, nodes.A)].strength = 2
+
+    keys = list(set(h.edges).difference([edges.P, edges.S]))
+    expected = h._remove(keys, level=0, inplace=False)
+    restricted = h.restrict_to_edges([edges.P, edges.S])
+    assert restricted.incidence_dict == expected.incidence_dict
+    pd.testing.assert_frame_equal(
+        restricted.incidences.dataframe.sort_index(),
+        expected.incidences.dataframe.sort_index(),
+    )
+    assert restricted.edges[edges.P].color == "red"
+    assert restricted.incidences[(edges.P, nodes.A)].strength == 2
+
+    restricted.edges[edges.P].color = "blue"
+    restricted.edges[edges.S].weight = 5
+    assert h.edges[edges.P].color == "red"
+    assert h.edges[edges.S].weight == 1
+    h.edges[edges.P].size = 3
+    assert restricted.edges[edges.P].size is None
+
+    restricted = h.restrict_to_nodes([nodes.A, nodes.C])
+    assert {e: set(v) for e, v in restricted.incidence_dict.items()} == {
+        edges.L: {nodes.C},
+        edges.P: {nodes.A, nodes.C},
+        edges.R: {nodes.A},
+        edges.S: {nodes.A},
+    }
+
+
+@pytest.mark.parametrize("storage", ["dict", "columnar"])
+def test_restrict_keeps_properties_of_kept_items(sevenbysix, storage):
+    edges, nodes = sevenbysix.edges, sevenbysix.nodes
+    h = Hypergraph(sevenbysix.edgedict, property_storage=storage)
+    # rows for every item, so that properties of single items are rare
+    for view in [h.edges, h.nodes, h.incidences]:
+        view.set_property_array("rank", range(len(view)))
+    h.edges[edges.P].weight = 4
+    h.edges[edges.P].color = "red"
+    h.edges[edges.L].color = "blue"
+    h.nodes[nodes.A].label = "a"
+    h.nodes[nodes.T1].label = "t"
+    h.incidences[(edges.P, nodes.A)].weight = 3
+    h.incidences[(edges.P, nodes.A)].strength = 2
+    h.incidences[(edges.L, nodes.C)].strength = 5
+
+    for restricted in [
+        h.restrict_to_edges([edges.P, edges.S]),
+        h.restrict_to_nodes([nodes.A, nodes.K]),
+    ]:
+        assert restricted.edges.property_store.storage == storage
+        assert restricted.edges[edges.P].weight == 4
+        assert restricted.edges[edges.P].color == "red"
+        assert restricted.nodes[nodes.A].label == "a"
+        assert restricted.incidences[(edges.P, nodes.A)].weight == 3
+        assert restricted.incidences[(edges.P, nodes.A)].strength == 2
+        assert restricted.edges[edges.P].misc_properties == (
+            h.edges[edges.P].misc_properties
+        )
+        if storage == "columnar":
+            # misc properties set on single items live in the side table
+            assert restricted.edges.property_store._sparse[edges.P] == {"color": "red"}
+            assert restricted.incidences.property_store._sparse[(edges.P, nodes.A)] == {
+                "strength": 2
+            }
+        assert restricted.edges[edges.S].rank == h.edges[edges.S].rank
+        assert (edges.L, nodes.C) not in restricted.incidences.property_store
+
+    # the level restricted drops the items left out, the other is kept whole
+    by_edges = h.restrict_to_edges([edges.P, edges.S])
+    assert edges.L not in by_edges.edges.property_store
+    assert by_edges.nodes.property_store.get_property(nodes.T1, "label") == "t"
+    by_nodes = h.restrict_to_nodes([nodes.A, nodes.K])
+    assert nodes.T1 not in by_nodes.nodes.property_store
+    assert by_nodes.edges.property_store.get_property(edges.L, "color") == "blue"
+
+
+def test_restrict_keeps_properties_as_remove():
+    h = Hypergraph(
+        {"A": [1, 2], "B": [2, 3]},
+        edge_properties={"A": {"c": 1}, "B": {"c": 2}, "Q": {"c": 3}},
+        node_properties={1: {"c": 4}, 3: {"c": 5}, 9: {"c": 6}},
+    )
+
+    def uids(hyp):
+        return [
+            sorted(hyp.edges.property_store.properties.index),
+            sorted(hyp.nodes.property_store.properties.index),
+        ]
+
+    restricted = h.restrict_to_edges(["A"])
+    assert uids(restricted) == [["A", "Q"], [1, 3, 9]]
+    assert uids(restricted) == uids(h._remove(["B"], level=0))
+    assert restricted.nodes.property_store.get_property(9, "c") == 6
+
+    restricted = h.restrict_to_nodes([1, 2])
+    assert uids(restricted) == [["A", "B", "Q"], [1, 9]]
+    assert uids(restricted) == uids(h._remove([3], level=1))
+    assert restricted.edges.property_store.get_property("Q", "c") == 3
+
+    # writes to the kept stores do not reach the original
+    restricted.edges["A"].c = 10
+    assert h.edges["A"].c == 1
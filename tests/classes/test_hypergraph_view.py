@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 from hypernetx.classes.hyp_view import HypergraphView
 from hypernetx.classes.incidence_store import IncidenceStore
@@ -52,6 +53,97 @@ def test_to_dataframe_with_user_defined_properties():
     assert len(hyp_view.properties) == len(incidence_store.edges)
 
 
+def test_membership_and_lookup_use_hashed_index():
+    incidence_store = IncidenceStore(
+        pd.DataFrame(incidences(), columns=["edges", "nodes"])
+    )
+    edges = HypergraphView(incidence_store, level=0, property_store=PropertyStore())
+    nodes = HypergraphView(incidence_store, level=1, property_store=PropertyStore())
+
+    # iteration keeps the order of first appearance in the incidence store
+    assert list(edges) == incidence_store.edges
+    assert list(nodes) == incidence_store.nodes
+
+    assert 3 in edges
+    assert 8 not in edges
+    assert "G" in nodes
+    assert "Z" not in nodes
+    assert ["A"] not in nodes
+
+    assert sorted(edges[3]) == ["A", "D", "E", "F"]
+    assert sorted(nodes["B"]) == [0, 2, 6, 7]
+    assert nodes["Z"] is None
+
+
+def test_property_array():
+    incidence_store = IncidenceStore(
+        pd.DataFrame(incidences(), columns=["edges", "nodes"])
+    )
+    ps_df = pd.DataFrame(
+        index=[3, 0], data={"weight": [42.0, 2.0], "misc_properties": [{"c": 1}, {}]}
+    )
+    edges = HypergraphView(
+        incidence_store, level=0, property_store=PropertyStore(ps_df)
+    )
+    nodes = HypergraphView(incidence_store, level=1, property_store=PropertyStore())
+
+    expected = [edges[e].weight for e in edges._items]
+    assert edges.property_array("weight").tolist() == expected
+    assert edges.property_array("weight", order=[3, 1]).tolist() == [42.0, 1.0]
+    assert edges.property_array("c", order=[3, 1]).tolist() == [1, None]
+
+    labels = list(incidence_store.index(1))
+    nodes.set_property_array("weight", range(len(labels)), order="matrix")
+    assert nodes.property_array("weight", order="matrix").tolist() == list(
+        range(len(labels))
+    )
+    assert [nodes[n].weight for n in labels] == list(range(len(labels)))
+    with pytest.raises(ValueError):
+        nodes.set_property_array("weight", [1, 2])
+
+
+@pytest.mark.parametrize("storage", ["dict", "columnar"])
+def test_set_property_array_writes_columns(storage):
+    incidence_store = IncidenceStore(
+        pd.DataFrame(incidences(), columns=["edges", "nodes"])
+    )
+    cells = HypergraphView(
+        incidence_store, level=2, property_store=PropertyStore(storage=storage)
+    )
+    pairs = list(incidence_store)
+
+    cells.set_property_array("rank", range(len(pairs)))
+    cells.set_property_array("weight", [2.0, 3.0], order=pairs[:2])
+    assert cells.property_array("rank").tolist() == list(range(len(pairs)))
+    assert cells.property_array("weight").tolist()[:3] == [2.0, 3.0, 1]
+    assert cells[pairs[1]].rank == 1
+    if storage == "columnar":
+        assert "rank" in cells.property_store._data.columns
+    with pytest.raises(ValueError):
+        cells.set_property_array("rank", [1], order=pairs[:2])
+
+
+@pytest.mark.parametrize("storage", ["dict", "columnar"])
+def test_incidence_property_array_in_code_order(storage):
+    incidence_store = IncidenceStore(
+        pd.DataFrame(incidences(), columns=["edges", "nodes"])
+    )
+    pairs = list(incidence_store)
+    ps = PropertyStore(default_weight=1.0, storage=storage)
+    ps.set_properties_bulk(
+        [pairs[4], pairs[0], ("Z", "Z")],
+        [{"weight": 5.0}, {"weight": 3.0, "color": "red"}, {"weight": 9.0}],
+    )
+    cells = HypergraphView(incidence_store, level=2, property_store=ps)
+
+    expected = ps.get_property_array(pairs, "weight")
+    assert cells.property_array("weight", order="matrix").tolist() == list(expected)
+    assert cells.property_array("weight", order="matrix")[[0, 4]].tolist() == [3, 5]
+    colors = cells.property_array("color", order="matrix")
+    assert colors.tolist() == list(ps.get_property_array(pairs, "color"))
+    assert colors[0] == "red"
+
+
 def incidences():
     node_groups = [
         {"A", "B"},
@@ -96,3 +96,195 @@ def test_restrict_to():
     store = IncidenceStore(data)
     restricted_df = store.restrict_to(0, [5], inplace=False)
     assert restricted_df.empty  # Empty dataframe as no pairs with item 5
+
+
+def test_csr_backend_matches_pandas_backend():
+    data = pd.DataFrame(
+        {"edges": [1, 1, 2, 3, 3, 3], "nodes": ["a", "b", "b", "c", "a", "b"]}
+    )
+    pandas_store = IncidenceStore(data)
+    csr_store = IncidenceStore(data, backend="csr")
+
+    assert csr_store.backend == "csr"
+    assert csr_store._data is None
+    assert csr_store.elements == pandas_store.elements
+    assert csr_store.memberships == pandas_store.memberships
+    assert csr_store.dimensions == pandas_store.dimensions
+    assert csr_store.edges == pandas_store.edges
+    assert csr_store.nodes == pandas_store.nodes
+    assert list(csr_store) == list(pandas_store)
+    assert len(csr_store) == len(pandas_store)
+    assert csr_store.neighbors(0, 3) == ["c", "a", "b"]
+    assert csr_store.neighbors(1, "b") == [1, 2, 3]
+    assert csr_store.neighbors(0, 5) == []
+    assert csr_store.neighbors(3, 1) == []
+
+
+def test_csr_backend_codes():
+    data = pd.DataFrame(
+        {"edges": [1, 1, 2, 3, 3, 3], "nodes": ["a", "b", "b", "c", "a", "b"]}
+    )
+    store = IncidenceStore(data, backend="csr")
+
+    edge_codes, node_codes = store.codes
+    assert edge_codes.dtype == np.int32 and node_codes.dtype == np.int32
+    assert list(store.labels["edges"]) == [1, 2, 3]
+    assert list(store.labels["nodes"]) == ["a", "b", "c"]
+
+    indptr, indices = store.csr
+    assert indptr.tolist() == [0, 2, 3, 6]
+    assert indices.tolist() == [0, 1, 1, 2, 0, 1]
+    indptr, indices = store.csc
+    assert indptr.tolist() == [0, 2, 5, 6]
+    assert indices.tolist() == [0, 2, 0, 1, 2, 2]
+
+    assert store.incidence_matrix().toarray().tolist() == [
+        [1, 0, 1],
+        [1, 1, 1],
+        [0, 0, 1],
+    ]
+
+
+def test_csr_backend_restrict_to():
+    data = pd.DataFrame({"edges": [1, 2, 3, 4], "nodes": [1, 2, 2, 3]})
+    store = IncidenceStore(data, backend="csr")
+
+    restricted_df = store.restrict_to(0, [1, 2], inplace=False)
+    assert restricted_df.equals(pd.DataFrame({"edges": [1, 2], "nodes": [1, 2]}))
+    assert store.dimensions == (4, 3)
+
+    store.restrict_to(0, [1, 2], inplace=True)
+    assert store.dimensions == (2, 2)
+    assert store.elements == {1: [1], 2: [2]}
+
+    with pytest.raises(ValueError):
+        IncidenceStore(data, backend="arrow")
+
+
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_contains_many(backend):
+    data = pd.DataFrame({"edges": [1, 1, 2, 3], "nodes": ["a", "b", "b", "c"]})
+    store = IncidenceStore(data, backend=backend)
+
+    assert (1, "a") in store
+    assert [3, "c"] in store
+    assert (2, "a") not in store
+    assert (5, "a") not in store
+    assert ([1], "a") not in store
+    assert (1, "a", "b") not in store
+
+    pairs = [(1, "a"), (2, "a"), (3, "c"), (4, "d"), (2, "b")]
+    expected = [True, False, True, False, True]
+    assert store.contains_many(pairs).tolist() == expected
+    assert store.contains_many(np.array(pairs, dtype=object)).tolist() == expected
+    assert store.contains_many(pd.DataFrame(pairs)).tolist() == expected
+    assert store.contains_many([]).tolist() == []
+
+
+def test_lazy_construction():
+    data = pd.DataFrame({"edges": [1, 1, 2, 3], "nodes": ["a", "b", "b", "c"]})
+    store = IncidenceStore(data)
+    assert not any(store.built.values())
+
+    assert store.dimensions == (3, 3)
+    assert store.built["codes"]
+    assert not store.built["elements"] and not store.built["memberships"]
+
+    assert store.neighbors(0, 1) == ["a", "b"]
+    assert store.built["elements"]
+    assert not store.built["memberships"]
+
+    store.edges
+    assert store.built["edges"] and not store.built["nodes"]
+    assert store.elements is store.elements
+
+
+def _as_sets(store):
+    elements = {k: set(v) for k, v in store.elements.items()}
+    memberships = {k: set(v) for k, v in store.memberships.items()}
+    return set(store), elements, memberships, set(store.edges), set(store.nodes)
+
+
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_add_pairs_and_remove_items_match_rebuild(backend):
+    data = pd.DataFrame({"edges": [1, 1, 2, 3, 3], "nodes": ["a", "b", "b", "c", "a"]})
+    store = IncidenceStore(data, backend=backend)
+    # build every lazy structure so they are all updated by delta
+    store.elements, store.memberships, store.edges, store.nodes
+    store.csr, store.csc, (1, "a") in store
+
+    added = store.add_pairs([1, 4, 4, 2], ["a", "d", "d", "c"])
+    assert list(added.itertuples(index=False, name=None)) == [(4, "d"), (2, "c")]
+    assert (4, "d") in store and (2, "c") in store
+    expected = pd.DataFrame(
+        {
+            "edges": [1, 1, 2, 3, 3, 4, 2],
+            "nodes": ["a", "b", "b", "c", "a", "d", "c"],
+        }
+    )
+    assert _as_sets(store) == _as_sets(IncidenceStore(expected))
+    assert store.dimensions == (4, 4)
+    assert store.neighbors(0, 4) == ["d"]
+
+    removed = store.remove_items(1, ["a"])
+    assert sorted(removed.itertuples(index=False, name=None)) == [(1, "a"), (3, "a")]
+    removed = store.remove_items(2, [(4, "d"), (9, "z")])
+    assert list(removed.itertuples(index=False, name=None)) == [(4, "d")]
+    removed = store.remove_items(0, [3])
+    expected = pd.DataFrame({"edges": [1, 2, 2], "nodes": ["b", "b", "c"]})
+    assert _as_sets(store) == _as_sets(IncidenceStore(expected))
+    assert store.dimensions == (2, 2)
+    assert (4, "d") not in store and (1, "b") in store
+    assert store.contains_many([(1, "b"), (2, "c"), (3, "c")]).tolist() == [
+        True,
+        True,
+        False,
+    ]
+    assert (
+        store.incidence_matrix() != IncidenceStore(expected).incidence_matrix()
+    ).nnz == 0
+
+
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_subset_matches_rebuild(backend):
+    data = pd.DataFrame(
+        {"edges": [1, 1, 2, 3, 3, 4], "nodes": ["a", "b", "b", "c", "a", "d"]}
+    )
+    store = IncidenceStore(data, backend=backend)
+
+    sub = store.subset(0, [3, 1, 9])
+    assert sub.backend == backend
+    assert list(sub) == [(1, "a"), (1, "b"), (3, "c"), (3, "a")]
+    rebuilt = IncidenceStore(pd.DataFrame(list(sub), columns=["edges", "nodes"]))
+    assert list(sub.index(0)) == list(rebuilt.index(0)) == [1, 3]
+    assert list(sub.index(1)) == list(rebuilt.index(1)) == ["a", "b", "c"]
+    assert [c.tolist() for c in sub.codes] == [c.tolist() for c in rebuilt.codes]
+    assert sub.neighbors(1, "a") == [1, 3]
+
+    sub = store.subset(1, ["b"])
+    assert list(sub) == [(1, "b"), (2, "b")]
+    assert (1, "a") not in sub and (2, "b") in sub
+    # the parent store is unchanged
+    assert len(store) == 6
+
+
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+def test_transpose_shares_codes(backend):
+    data = pd.DataFrame(
+        {"edges": [1, 1, 2, 3, 3, 4], "nodes": ["a", "b", "b", "c", "a", "d"]}
+    )
+    store = IncidenceStore(data, backend=backend)
+    csr = store.csr
+
+    dual = store.transpose()
+    assert list(dual) == [(n, e) for e, n in store]
+    assert dual.elements == store.memberships
+    assert dual.memberships == store.elements
+    assert dual.codes[0] is store.codes[1]
+    assert dual.csc is csr
+
+    # edits of the transposed store leave the original one unchanged
+    dual.add_pairs(["e"], [5])
+    dual.remove_items(0, ["a"])
+    assert len(store) == 6 and ("e" not in store.nodes)
+    assert store.elements[1] == ["a", "b"]
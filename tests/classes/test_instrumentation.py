@@ -0,0 +1,42 @@
+import logging
+
+from hypernetx import Hypergraph
+
+
+def test_stats_record_calls(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict)
+    h.adjacency_matrix()
+    assert h.stats().empty
+
+    events = []
+    h.instrument(callback=events.append)
+    for s in [1, 1, 2]:
+        h.edge_adjacency_matrix(s=s)
+    h.get_linegraph(s=2)
+    h.adjacency_matrix()
+
+    stats = h.stats()
+    assert stats.loc[("edge_adjacency_matrix", 1), "calls"] == 2
+    assert stats.loc[("edge_adjacency_matrix", 1), "hits"] == 1
+    assert stats.loc[("edge_adjacency_matrix", 2), "misses"] == 1
+    assert stats.loc[("edge_adjacency_matrix", 2), "bytes"] > 0
+    assert stats.loc[("get_linegraph", 2), "misses"] == 1
+    # computed before instrument was called, so answered from the cache
+    assert stats.loc[("adjacency_matrix", 1), "hits"] == 1
+    assert (stats["seconds"] >= 0).all()
+    assert stats.attrs["cache"]["entries"] == len(h.state_cache)
+    assert [e["method"] for e in events].count("edge_adjacency_matrix") == 4
+
+    assert not h.stats(reset=True).empty
+    assert h.stats().empty
+    h.instrument(enabled=False)
+    h.adjacency_matrix(s=3)
+    assert h.stats().empty
+
+
+def test_stats_logger(sevenbysix, caplog):
+    logger = logging.getLogger("hnx-stats-test")
+    h = Hypergraph(sevenbysix.edgedict).instrument(logger=logger)
+    with caplog.at_level(logging.INFO, logger="hnx-stats-test"):
+        h.adjacency_matrix(s=2)
+    assert "adjacency_matrix s=2 miss" in caplog.text
@@ -373,3 +373,159 @@ def test_contains(fixture, uid, expected, request):
 #     # check that the entities without properties have default properties
 #     assert properties_df.loc["R"].to_dict() == {WEIGHT: 1.0, MISC_PROPERTIES: {}}
 #     assert properties_df.loc["S"].to_dict() == {WEIGHT: 1.0, MISC_PROPERTIES: {}}
+
+
+def test_set_properties_bulk_matches_set_properties(edges_ps, edges_df):
+    uids = ["R", "I", "X", "R"]
+    props = [
+        {"weight": 99, "new_property": "foobar"},
+        {"weight": 2.5},
+        {"new_property": "roma", "other": 1},
+        {"other": 2},
+    ]
+    expected = PropertyStore(edges_df.copy(deep=True))
+    for uid, data in zip(uids, props):
+        expected.set_properties(uid, data)
+
+    edges_ps.set_properties_bulk(uids, props)
+
+    for uid in ["I", "L", "R", "X"]:
+        assert edges_ps.get_properties(uid) == expected.get_properties(uid)
+    assert edges_ps.get_property("R", MISC_PROPERTIES) == {
+        "new_property": "foobar",
+        "other": 2,
+    }
+
+
+def test_set_properties_bulk_dataframe(incidences_ps):
+    uids = [("I", "K"), ("S", "A")]
+    props = DataFrame(
+        {WEIGHT: [5.0, 6.0], HAIR_COLOR: ["blue", None], "mood": [None, "calm"]},
+        index=pd.MultiIndex.from_tuples(uids, names=[EDGES, NODES]),
+    )
+
+    incidences_ps.set_properties_bulk(None, props)
+
+    assert incidences_ps.get_property(("I", "K"), WEIGHT) == 5.0
+    assert incidences_ps.get_property(("I", "K"), HAIR_COLOR) == "blue"
+    assert incidences_ps.get_property(("I", "K"), "mood") is None
+    assert incidences_ps.get_property(("S", "A"), WEIGHT) == 6.0
+    assert incidences_ps.get_property(("S", "A"), MISC_PROPERTIES) == {"mood": "calm"}
+
+
+def test_set_property_column(nodes_ps, nodes):
+    nodes_ps.set_property_column(WEIGHT, range(len(nodes)))
+    assert [nodes_ps.get_property(node, WEIGHT) for node in nodes] == list(
+        range(len(nodes))
+    )
+
+    nodes_ps.set_property_column("color", {"A": "red", "Z": "blue"})
+    assert nodes_ps.get_property("A", "color") == "red"
+    assert nodes_ps.get_property("Z", "color") == "blue"
+    assert nodes_ps.get_property("Z", WEIGHT) == 42.0
+    assert nodes_ps.get_property("C", "color") is None
+
+    with pytest.raises(ValueError):
+        nodes_ps.set_property_column(WEIGHT, [1, 2])
+
+
+@pytest.mark.parametrize("storage", ["dict", "columnar"])
+def test_set_property_column_matches_bulk(nodes_ps, nodes, storage):
+    column_ps = PropertyStore(nodes_ps.properties.copy(), storage=storage)
+    bulk_ps = PropertyStore(nodes_ps.properties.copy(), storage=storage)
+    updates = [
+        (WEIGHT, {"A": 2.0, "Z": 3.0}),
+        ("rare", {"C": [1], "Y": None}),
+        ("color", pd.Series(["red"] * len(nodes) + ["blue"], index=nodes + ["A"])),
+        ("color", {"Z": None}),
+    ]
+    for name, values in updates:
+        column_ps.set_property_column(name, values)
+        items = list(values.items())
+        bulk_ps.set_properties_bulk(
+            [uid for uid, _ in items], [{name: val} for _, val in items]
+        )
+
+    assert column_ps._data.index.tolist() == bulk_ps._data.index.tolist()
+    for uid in bulk_ps._data.index:
+        assert column_ps.get_properties(uid) == bulk_ps.get_properties(uid)
+    assert column_ps.get_property("A", "color") == "blue"
+    if storage == "columnar":
+        assert "color" in column_ps._data.columns
+        assert column_ps._sparse == bulk_ps._sparse
+    # the shared dictionaries of the source table are replaced, not updated
+    assert nodes_ps.get_property("C", MISC_PROPERTIES) == {}
+
+
+def test_columnar_storage_matches_dict_storage(incidences_df, incidences):
+    # copy(deep=True) gives every item its own misc_properties dictionary
+    dict_ps = PropertyStore(incidences_df, default_weight=3.33).copy(deep=True)
+    columnar_ps = PropertyStore(
+        incidences_df.copy(deep=True), default_weight=3.33, storage="columnar"
+    )
+    assert columnar_ps.storage == "columnar"
+    assert MISC_PROPERTIES not in columnar_ps._data.columns
+    assert "status" in columnar_ps._data.columns
+
+    for ps in (dict_ps, columnar_ps):
+        ps.set_property(("I", "K"), "rare", [1, 2])
+        ps.set_properties(("S", "V"), {WEIGHT: 7, "status": "single"})
+        ps.set_properties_bulk(incidences[:2], [{"status": None}, {"mood": "ok"}])
+    assert columnar_ps._sparse[("I", "K")] == {"rare": [1, 2], "status": None}
+
+    for uid in incidences:
+        # Series.equals treats the missing strength of new items as equal
+        assert (
+            pd.Series(columnar_ps.get_properties(uid))
+            .sort_index()
+            .equals(pd.Series(dict_ps.get_properties(uid)).sort_index())
+        )
+        assert columnar_ps.get_property(uid, MISC_PROPERTIES) == dict_ps.get_property(
+            uid, MISC_PROPERTIES
+        )
+    pd.testing.assert_frame_equal(
+        columnar_ps.properties[dict_ps.properties.columns],
+        dict_ps.properties,
+        check_dtype=False,
+    )
+
+    copied = columnar_ps.copy(deep=True)
+    copied._drop([("I", "K")])
+    assert ("I", "K") not in copied
+    assert ("I", "K") in columnar_ps._sparse
+
+
+def test_columnar_storage_promotes_recurring_keys(nodes_ps, nodes):
+    ps = PropertyStore(nodes_ps.properties.copy(), storage="columnar")
+    ps.set_property("A", "color", "red")
+    assert "color" not in ps._data.columns
+
+    ps.set_property_column("color", ["blue"] * len(nodes))
+    assert "color" in ps._data.columns
+    assert not ps._sparse
+    assert ps.get_properties("A") == {"color": "blue", WEIGHT: 0.0}
+
+    ps.set_defaults({"color": "green", "size": 1})
+    assert ps.get_properties("C") == {"color": "blue", "size": 1, WEIGHT: 1.0}
+    assert ps.get_property("C", MISC_PROPERTIES) == {"color": "blue"}
+    assert ps.properties.columns.tolist() == [WEIGHT, "color", "size", MISC_PROPERTIES]
+
+
+@pytest.mark.parametrize("storage", ["dict", "columnar"])
+def test_cached_reads_follow_writes(edges_df, storage):
+    ps = PropertyStore(edges_df, storage=storage).copy(deep=True)
+    assert ps.get_property("I", WEIGHT) == 43.0
+    assert isinstance(ps.get_property("I", WEIGHT), float)
+    assert "weight" in ps._arrays
+
+    ps.set_property("I", WEIGHT, 2.0)
+    assert ps.get_property("I", WEIGHT) == 2.0
+    ps.set_property("X", "color", "red")
+    assert ps.get_property("X", "color") == "red"
+    assert ps.get_property("X", WEIGHT) == 1
+    ps.set_property_column(WEIGHT, {"L": 5.0})
+    assert ps.get_properties("L") == {WEIGHT: 5.0, MISC_PROPERTIES: {}}
+    ps._drop(["I"])
+    assert ps.get_property("I", WEIGHT) == 1
+    assert ps.get_property("O", WEIGHT) == 43.0
+    assert ps.get_property("X", "color") == "red"
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hypernetx import HyperNetXError, Hypergraph, load, save
+
+
+@pytest.mark.parametrize("backend", ["pandas", "csr"])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_roundtrip(tmp_path, sevenbysix, backend, mmap):
+    h = Hypergraph(sevenbysix.edgedict, incidence_backend=backend, name="sbs")
+    h.edges["I"].color = "red"
+    h.incidences[("I", "K")].weight = 2.5
+    h.nodes.property_store.set_properties("Z", {"weight": 4})
+
+    save(h, tmp_path)
+    loaded = load(tmp_path, mmap=mmap)
+    assert loaded.name == "sbs"
+    assert loaded.incidences.incidence_store.backend == backend
+    assert loaded.incidence_dict == h.incidence_dict
+    assert list(loaded.nodes) == list(h.nodes)
+    assert loaded.dataframe.equals(h.dataframe)
+    assert loaded.edges.to_dataframe.equals(h.edges.to_dataframe)
+    assert loaded.nodes.property_store.get_properties("Z")["weight"] == 4
+    assert (loaded.incidence_matrix() != h.incidence_matrix()).nnz == 0
+
+    # a loaded hypergraph can be edited even if its arrays are mapped read-only
+    loaded.incidences[("I", "K")].weight = 1
+    loaded.add_incidence("I", "Z")
+    assert loaded.incidences[("I", "K")].weight == 1
+    assert "Z" in loaded.incidence_dict["I"]
+    assert h.incidences[("I", "K")].weight == 2.5
+
+
+def test_load_memory_maps_arrays(tmp_path, sevenbysix):
+    save(Hypergraph(sevenbysix.edgedict, incidence_backend="csr"), tmp_path)
+    edge_codes, _ = load(tmp_path).incidences.incidence_store.codes
+    assert not edge_codes.flags.writeable
+    edge_codes, _ = load(tmp_path, mmap=False).incidences.incidence_store.codes
+    assert edge_codes.flags.writeable
+
+
+def test_load_rejects_other_directories(tmp_path):
+    with pytest.raises(HyperNetXError):
+        load(tmp_path)
+
+
+def test_parquet_roundtrip(tmp_path, sevenbysix):
+    pytest.importorskip("pyarrow")
+    h = Hypergraph(sevenbysix.edgedict)
+    h.edges["I"].color = "red"
+    h.incidences[("I", "K")].weight = 2.5
+    h.incidences[("I", "K")].tag = "t"
+
+    h.to_parquet(tmp_path, row_group_size=4)
+    loaded = Hypergraph.from_parquet(tmp_path, batch_size=3)
+    assert loaded.incidences.incidence_store.backend == "csr"
+    assert loaded.incidence_dict == h.incidence_dict
+    assert loaded.edges["I"].color == "red"
+    assert loaded.incidences[("I", "K")].weight == 2.5
+    assert loaded.incidences[("I", "K")].tag == "t"
+    # the stored dictionaries are the lookup tables of the incidence store
+    assert list(loaded.edges.incidence_store.index(0)) == list(
+        h.edges.incidence_store.index(0)
+    )
+
+
+def test_parquet_filters_and_projection(tmp_path, sevenbysix):
+    pytest.importorskip("pyarrow")
+    h = Hypergraph(sevenbysix.edgedict)
+    h.incidences[("I", "K")].weight = 2.5
+    h.edges["I"].color = "red"
+    h.to_parquet(tmp_path)
+
+    loaded = Hypergraph.from_parquet(
+        tmp_path, edges=["I", "L"], columns=["weight"], incidence_backend="pandas"
+    )
+    assert loaded.incidence_dict == {
+        e: h.incidence_dict[e] for e in ["I", "L"] if e in h.incidence_dict
+    }
+    assert loaded.incidences[("I", "K")].weight == 2.5
+    assert "color" not in loaded.edges.to_dataframe.columns
+
+    loaded = Hypergraph.from_parquet(tmp_path, nodes=["K"])
+    assert set(loaded.nodes) == {"K"}
+    assert set(loaded.edges) == set(h.nodes.memberships["K"])
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_from_csv_chunks(tmp_path, chunksize):
+    df = pd.DataFrame(
+        {
+            "edge": ["A", "A", "B", "A", "C", "B"],
+            "node": [1, 2, 1, 1, 3, 1],
+            "w": [1.0, 2.0, None, 4.0, 5.0, 6.0],
+            "tag": ["x", "y", "z", "u", "v", "w"],
+        }
+    )
+    path = tmp_path / "incidences.tsv"
+    df.to_csv(path, sep="\t", index=False)
+
+    h = Hypergraph.from_csv_chunks(
+        path, chunksize=chunksize, sep="\t", cell_weight_col="w"
+    )
+    expected = Hypergraph(df, edge_col="edge", node_col="node", cell_weight_col="w")
+    assert h.incidence_dict == expected.incidence_dict
+    assert h.dataframe.equals(expected.dataframe)
+
+    h = Hypergraph.from_csv_chunks(
+        path,
+        chunksize=chunksize,
+        sep="\t",
+        cell_weight_col="w",
+        aggregate_by={"weight": "sum"},
+        default_cell_weight=10,
+    )
+    assert h.incidences[("A", 1)].weight == 5
+    assert h.incidences[("B", 1)].weight == 16
+    assert h.incidences[("A", 1)].tag == "x"
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from hypernetx import Hypergraph
+from hypernetx.classes.state_cache import StateCache
+
+
+def test_invalidate_drops_dependents():
+    cache = StateCache()
+    cache.put("matrix", np.zeros(10))
+    cache.put("linegraph", [1, 2], depends=("incidences", "edges"))
+    cache.put("a", ["b"], item=("nodes", "a"))
+    cache.put("c", ["d"], item=("nodes", "c"))
+    assert cache.nbytes == sum(cache.sizes().values()) > 80
+
+    cache.invalidate("edges")
+    assert cache.version == 1
+    assert "linegraph" not in cache
+    assert "matrix" in cache
+
+    cache.invalidate("incidences", nodes={"a"})
+    assert list(cache) == ["c"]
+    cache.invalidate("incidences")
+    assert len(cache) == 0 and cache.nbytes == 0
+
+    with pytest.raises(ValueError):
+        cache.invalidate("colors")
+
+
+def test_budget_evicts_least_recently_used():
+    cache = StateCache(budget=2000)
+    for key in ["a", "b"]:
+        cache.put(key, np.zeros(100))
+    assert cache["a"] is not None
+    cache.put("c", np.zeros(100))
+    assert list(cache) == ["a", "c"]
+    assert cache.evictions == 1
+    assert cache.hits == 1
+
+    cache.put("big", np.zeros(1000))
+    assert "big" not in cache
+    cache.budget = 1000
+    assert list(cache) == ["c"]
+    assert cache.lookup("d", lambda: 1) == 1
+    assert cache.misses == 1
+
+
+def test_hypergraph_state_cache(sevenbysix):
+    h = Hypergraph(sevenbysix.edgedict, cache_budget=10**6)
+    for s in [1, 2, 3]:
+        h.adjacency_matrix(s=s)
+        h.get_linegraph(s=s)
+    assert ("adjacency_matrix", 3) in h.state_cache
+    assert h.memory_usage()["state"] == h.state_cache.nbytes
+
+    h.state_cache.budget = h.state_cache.sizes()[("adjacency_matrix", 3)] * 2
+    assert ("adjacency_matrix", 1) not in h.state_cache
+    assert (
+        h.adjacency_matrix(s=1) != Hypergraph(sevenbysix.edgedict).adjacency_matrix(s=1)
+    ).nnz == 0
+
+    hd = h.dual()
+    assert hd.state_cache.budget == h.state_cache.budget
+
+    version = h.state_cache.version
+    h.add_incidence(sevenbysix.edges.L, sevenbysix.nodes.T1)
+    assert h.state_cache.version > version
+    assert ("adjacency_matrix", 1) not in h.state_cache